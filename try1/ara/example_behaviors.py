@@ -23,10 +23,7 @@ async def main():
         ui_backend='textual'  # Use new Textual UI with better keystroke handling
     )
     
-    # Initialize the user modeling behavior
-    await user_modeling.initialize(agent)
-    
-    # Use context manager to handle start/stop
+    # Use context manager to handle start/stop (start also initializes behaviors)
     async with agent.session():
         print("\n🤖 ARA Agent with User Modeling Behavior")
         print("=" * 50)
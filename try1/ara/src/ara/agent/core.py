@@ -2,7 +2,10 @@
 
 import os
 import json
+import time
+import uuid
 import asyncio
+from contextvars import ContextVar
 from typing import Dict, List, Optional, Any, Union
 from pathlib import Path
 from datetime import datetime
@@ -11,17 +14,31 @@ from contextlib import asynccontextmanager
 import httpx
 from pydantic import BaseModel, Field
 
-from ..logging import get_logger, setup_logging
+from ..logging import ensure_logging, get_logger, log_session, session_logs
 
 from ..storage.markdown import MarkdownStorage
-from ..behaviors.base import Behavior, BehaviorManager
+from ..behaviors.base import (
+    DEFAULT_HOOK_TIMEOUT, DEFAULT_TURN_BUDGET, Behavior, BehaviorManager, turn_deadline
+)
 from ..behaviors.planning import PlanningBehavior
-from ..monitoring.metrics import MetricsCollector
+from ..behaviors.reloader import get_reloader
+from ..monitoring.metrics import MetricsCollector, current_metrics, llm_origin, record_llm_usage
+from ..monitoring.tracing import tracer
+from ..events import MESSAGE_APPENDED, SESSION_ENDED, SESSION_STARTED, TOOL_CALLED, event_bus
+from ..monitoring.loop_monitor import LoopLagMonitor
+from ..monitoring.timeseries import TimeSeriesStore
+from ..llm.utils import LLMClient
 from ..ui.terminal import TerminalUI
 from ..ui.live_display import LiveDisplay
 from ..ui.textual_display import TextualDisplay
 
 
+# Token usage of the agent-loop LLM calls in the current turn
+_turn_usage: ContextVar[Optional[Dict[str, int]]] = ContextVar("turn_usage", default=None)
+# Context added to the current turn's requests only (not kept in the conversation history)
+_turn_context: ContextVar[Optional[List[str]]] = ContextVar("turn_context", default=None)
+
+
 class ToolCall(BaseModel):
     """Represents a tool call from the model"""
     id: str
@@ -47,7 +64,15 @@ class A1:
         api_key: Optional[str] = None,
         behaviors: Optional[List[Behavior]] = None,
         enable_live_ui: bool = True,
-        ui_backend: str = "textual"  # "rich" or "textual"
+        ui_backend: str = "textual",  # "rich" or "textual"
+        hook_timeout: Optional[float] = DEFAULT_HOOK_TIMEOUT,
+        hook_budget: Optional[float] = DEFAULT_TURN_BUDGET,
+        hot_reload: bool = False,
+        trace: bool = False,
+        session_id: Optional[str] = None,
+        monitor_loop: bool = False,
+        metrics_history: Union[bool, TimeSeriesStore] = True,
+        headless: bool = False
     ):
         self.path = Path(path)
         self.path.mkdir(parents=True, exist_ok=True)
@@ -56,27 +81,56 @@ class A1:
         self.api_key = api_key or os.getenv("OPENROUTER_API_KEY")
         if not self.api_key:
             raise ValueError("OpenRouter API key not provided")
+        # Out-of-band requests (e.g. behavior summaries) use the agent's key and model
+        self.llm_client = LLMClient(api_key=self.api_key, default_model=self.llm)
+        
+        # Identifies this agent's logs, metrics and saved conversations
+        self.session_id = session_id or uuid.uuid4().hex
         
         # Initialize components
-        self.storage = MarkdownStorage(self.path)
+        self.storage = MarkdownStorage(self.path, session_id=self.session_id)
         self.metrics = MetricsCollector()
-        self.ui = TerminalUI()
-        self.enable_live_ui = enable_live_ui
+        self.metrics.session = self.session_id
+        # Headless agents (e.g. server sessions) write nothing to the terminal
+        self.ui = TerminalUI(headless=headless)
+        self.enable_live_ui = enable_live_ui and not headless
         self.ui_backend = ui_backend
+        self.hot_reload = hot_reload
         self._live_display: Optional[Union[LiveDisplay, TextualDisplay]] = None
         
-        # Setup logging with file output in agent's data directory
-        setup_logging(log_dir=self.path / "logs", enable_file_logging=True)
-        self.logger = get_logger(__name__, context="agent")
+        # Span tracing is process-wide (also enabled by ARA_TRACE=1); see monitoring.tracing
+        if trace:
+            tracer.enable()
+        self.last_trace_id: Optional[str] = None
+        
+        # Opt-in event-loop lag and blocking-call detection, recorded in self.metrics
+        self.loop_monitor = LoopLagMonitor(metrics=self.metrics) if monitor_loop else None
+        
+        # Downsampled metric history persisted in the agent's data directory, or
+        # a store shared by the sessions of a process (owned by the caller)
+        self._owns_timeseries = metrics_history is True
+        if isinstance(metrics_history, TimeSeriesStore):
+            self.metrics.timeseries = metrics_history
+        elif metrics_history:
+            self.metrics.timeseries = TimeSeriesStore(self.path / "metrics" / "timeseries.sqlite")
+        
+        # Logging is configured once per process; this session's records
+        # (tagged with its id) also go to files in the agent's data directory
+        ensure_logging()
+        session_logs.add(self.session_id, self.path / "logs")
+        self.logger = get_logger(__name__, context="agent").bind(session=self.session_id)
         
-        # Initialize behavior manager
-        self.behavior_manager = BehaviorManager()
+        # Initialize behavior manager; hook_timeout bounds each behavior hook and
+        # hook_budget bounds the total hook time of a turn (seconds, None = unbounded)
+        self.behavior_manager = BehaviorManager(
+            default_hook_timeout=hook_timeout,
+            turn_budget=hook_budget
+        )
+        self.behavior_manager.metrics = self.metrics
+        # Behaviors are initialized in start() (or before the first turn)
         if behaviors:
             for behavior in behaviors:
                 self.behavior_manager.register(behavior)
-                # Initialize behavior if it has an initialize method
-                if hasattr(behavior, 'initialize'):
-                    asyncio.create_task(behavior.initialize(self))
         else:
             # Default behaviors
             self.behavior_manager.register(PlanningBehavior())
@@ -92,11 +146,18 @@ class A1:
         
         self.logger.info(f"Agent initialized with storage at {self.path}")
     
+    def bind_context(self) -> None:
+        """Attribute LLM usage and log records of the current task to this agent
+        
+        For long-lived tasks the agent owns (periodic behaviors, initializers);
+        turns set and restore the same context around ago().
+        """
+        current_metrics.set(self.metrics)
+        log_session.set(self.session_id)
+    
     def add_behavior(self, behavior: Behavior) -> None:
-        """Add a behavior to the agent"""
+        """Add a behavior to the agent (initialized on start, or immediately if already started)"""
         self.behavior_manager.register(behavior)
-        if hasattr(behavior, 'initialize'):
-            asyncio.create_task(behavior.initialize(self))
 
     def has_behavior(self, requirement: str) -> bool:
         """Check if agent has a behavior (convenience method)"""
@@ -107,8 +168,20 @@ class A1:
         return self.behavior_manager.get_behavior(name)
     
     async def start(self) -> None:
-        """Start the agent and all periodic behaviors"""
+        """Start the agent: initialize behaviors, then start periodic behaviors"""
+        if self.loop_monitor:
+            self.loop_monitor.start()
+        if self.metrics.timeseries and self._owns_timeseries:
+            # The store only opens its SQLite file now, off the event loop
+            await asyncio.to_thread(self.metrics.timeseries.open)
+            self.metrics.timeseries.start()
+        await self.behavior_manager.initialize_all(self)
         await self.behavior_manager.start_all_periodic_tasks(self)
+        event_bus.publish(SESSION_STARTED, session_id=self.session_id)
+        
+        # Swap in edited behavior modules without restarting the agent
+        if self.hot_reload:
+            get_reloader().attach(self)
         
         # Start live UI if enabled
         if self.enable_live_ui and not self._live_display:
@@ -120,12 +193,27 @@ class A1:
     
     async def stop(self) -> None:
         """Stop the agent and all periodic behaviors"""
+        if self.hot_reload:
+            get_reloader().detach(self)
         await self.behavior_manager.stop_all_periodic_tasks()
+        await self.behavior_manager.cancel_background_hooks()
+        await self.behavior_manager.shutdown_all(self)
+        if self.loop_monitor:
+            await self.loop_monitor.stop()
+        if self.metrics.timeseries and self._owns_timeseries:
+            await self.metrics.timeseries.stop()
+            await asyncio.to_thread(self.metrics.timeseries.close)
+            self.metrics.timeseries = None
+        elif self.metrics.timeseries:
+            await self.metrics.timeseries.flush()
+        session_logs.remove(self.session_id)
+        event_bus.publish(SESSION_ENDED, session_id=self.session_id)
         
         # Stop live UI
         if self._live_display:
             await self._live_display.stop()
             self._live_display = None
+        await asyncio.to_thread(self.ui.close)
     
     @asynccontextmanager
     async def session(self):
@@ -211,20 +299,44 @@ class A1:
             "model": self.llm,
             "messages": messages,
             "tools": self.tools,
-            "tool_choice": "auto"
+            "tool_choice": "auto",
+            # Ask OpenRouter to report cost alongside token counts
+            "usage": {"include": True}
         }
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(url, json=data, headers=headers)
-            response.raise_for_status()
-            return response.json()
+        start = time.perf_counter()
+        with tracer.span("llm.request", model=self.llm, origin=llm_origin.get()) as span:
+            try:
+                async with httpx.AsyncClient() as client:
+                    response = await client.post(url, json=data, headers=headers)
+                    response.raise_for_status()
+                    result = response.json()
+            except Exception:
+                record_llm_usage(self.llm, None, time.perf_counter() - start, success=False)
+                raise
+            
+            usage = result.get("usage") or {}
+            record_llm_usage(result.get("model", self.llm), usage, time.perf_counter() - start)
+            if span:
+                span.set_attributes(**usage)
+        
+        turn = _turn_usage.get()
+        if turn is not None:
+            turn["prompt_tokens"] += usage.get("prompt_tokens") or 0
+            turn["completion_tokens"] += usage.get("completion_tokens") or 0
+        return result
     
     async def _execute_tool(self, tool_call: ToolCall) -> str:
         """Execute a tool call and return the result"""
+        with tracer.span(f"tool.{tool_call.function['name']}"):
+            return await self._run_tool(tool_call)
+    
+    async def _run_tool(self, tool_call: ToolCall) -> str:
         function_name = tool_call.function["name"]
         arguments = json.loads(tool_call.function["arguments"])
         
         self.ui.log_tool_call(function_name, arguments)
+        event_bus.publish(TOOL_CALLED, tool=function_name)
         start_time = datetime.now()
         
         try:
@@ -271,6 +383,32 @@ class A1:
             
             return f"Error: {str(e)}"
     
+    def add_turn_context(self, text: str) -> None:
+        """Prefix the current turn's prompt with text in LLM requests of this turn only
+        
+        Unlike a pre_process rewrite, the text is not stored in the
+        conversation history, so it is not resent on later turns.
+        """
+        context = _turn_context.get()
+        if context is not None:
+            context.append(text)
+    
+    def _request_messages(self) -> List[Dict[str, Any]]:
+        """Conversation history in API format, with the turn context applied"""
+        messages = [msg.model_dump(exclude_none=True) for msg in self.messages]
+        context = _turn_context.get()
+        if context:
+            for message in reversed(messages):
+                if message["role"] == "user":
+                    message["content"] = "\n\n".join([*context, message.get("content") or ""])
+                    break
+        return messages
+    
+    def _add_message(self, message: Message) -> None:
+        """Append to the conversation history and notify subscribed UIs"""
+        self.messages.append(message)
+        event_bus.publish(MESSAGE_APPENDED, role=message.role)
+    
     async def _process_response(self, response: Dict[str, Any]) -> Optional[str]:
         """Process the OpenRouter response"""
         choice = response["choices"][0]
@@ -282,7 +420,7 @@ class A1:
             content=message.get("content"),
             tool_calls=[ToolCall(**tc) for tc in message.get("tool_calls", [])]
         )
-        self.messages.append(assistant_msg)
+        self._add_message(assistant_msg)
         
         # Handle tool calls if present
         if assistant_msg.tool_calls:
@@ -297,10 +435,10 @@ class A1:
             
             # Add tool results to messages
             for result in tool_results:
-                self.messages.append(Message(**result))
+                self._add_message(Message(**result))
             
             # Get another response after tool execution
-            messages_dict = [msg.model_dump(exclude_none=True) for msg in self.messages]
+            messages_dict = self._request_messages()
             response = await self._call_openrouter(messages_dict)
             return await self._process_response(response)
         
@@ -308,12 +446,39 @@ class A1:
     
     def go(self, prompt: str) -> str:
         """Execute a task with the given prompt"""
-        return asyncio.run(self.ago(prompt))
+        result = asyncio.run(self.ago(prompt))
+        # Console output is rendered in the background; show it before returning
+        self.ui.flush()
+        return result
     
     async def ago(self, prompt: str) -> str:
         """Async version of go()"""
+        attribution = current_metrics.set(self.metrics)
+        session = log_session.set(self.session_id)
+        usage = _turn_usage.set({"prompt_tokens": 0, "completion_tokens": 0})
+        context = _turn_context.set([])
+        deadline = turn_deadline.set(None)
+        try:
+            with tracer.span("agent.turn", model=self.llm, path=str(self.path)) as span:
+                if span:
+                    self.last_trace_id = span.trace_id
+                return await self._run_turn(prompt)
+        finally:
+            turn_deadline.reset(deadline)
+            _turn_context.reset(context)
+            _turn_usage.reset(usage)
+            log_session.reset(session)
+            current_metrics.reset(attribution)
+    
+    async def _run_turn(self, prompt: str) -> str:
+        """One conversation turn, with LLM usage attributed to this agent"""
+        started = time.perf_counter()
         self.ui.log_user_input(prompt)
         
+        # Readiness barrier: no hook runs before every behavior is initialized
+        await self.behavior_manager.initialize_all(self)
+        self.behavior_manager.begin_turn()
+        
         # Notify behaviors of user message
         await self.behavior_manager.on_user_message(prompt, self)
         
@@ -321,10 +486,10 @@ class A1:
         processed_prompt = await self.behavior_manager.pre_process(prompt, self)
         
         # Add user message
-        self.messages.append(Message(role="user", content=processed_prompt))
+        self._add_message(Message(role="user", content=processed_prompt))
         
         # Convert messages to dict format
-        messages_dict = [msg.model_dump(exclude_none=True) for msg in self.messages]
+        messages_dict = self._request_messages()
         
         # Make API call
         try:
@@ -336,6 +501,13 @@ class A1:
             
             self.ui.log_assistant_response(result)
             
+            turn = _turn_usage.get()
+            self.metrics.record_conversation_turn(
+                turn["prompt_tokens"],
+                turn["completion_tokens"],
+                time.perf_counter() - started
+            )
+            
             # Save conversation to storage
             await self.storage.save_conversation(self.messages)
             
@@ -1,8 +1,9 @@
 """Example anxiety behavior that runs periodically"""
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, List
 from datetime import datetime
 from .base import Behavior
+from .scanner import PatternScanner, PatternMatch
 
 if TYPE_CHECKING:
     from ..agent.core import A1
@@ -11,11 +12,21 @@ if TYPE_CHECKING:
 class AnxietyBehavior(Behavior):
     """A behavior that models anxiety by periodically checking for concerning patterns"""
     
+    state_fields = ("anxiety_level", "triggers")
+    
     def __init__(self, check_interval: float = 10.0):
         super().__init__("anxiety", version="0.1.0")
         self.set_interval(check_interval)  # Check every 10 seconds by default
         self.anxiety_level = 0.5  # 0-1 scale
         self.triggers = []
+        self.depends_on = ["user-modeling"]  # Reads the shared user model
+    
+    def register_patterns(self, scanner: PatternScanner) -> None:
+        """Register anxiety and emergency keywords with the shared scanner"""
+        scanner.register(self.name, "trigger", keywords=[
+            "worry", "stress", "anxious", "nervous", "fear", "panic"
+        ])
+        scanner.register(self.name, "emergency", keywords=["panic", "emergency", "help"])
     
     async def periodic_task(self, agent: "A1") -> None:
         """Periodically check for anxiety triggers"""
@@ -24,26 +35,25 @@ class AnxietyBehavior(Behavior):
         try:
             activity.log("Checking for anxiety triggers...")
             
-            # Check recent topics for triggers
-            context = await agent.storage.load_yaml("user_model", "contextual_state")
-            if context and "recent_topics" in context:
-                recent_messages = [t["message"] for t in context["recent_topics"][-5:]]
+            # Check recent topics for triggers, read from the in-memory user model
+            user_modeling = agent.get_behavior("user-modeling")
+            store = getattr(user_modeling, "store", None)
+            if store and store.loaded:
+                recent_messages = [t.message for t in store.model.contextual_state.recent_topics[-5:]]
                 
-                # Simple trigger detection
-                anxiety_keywords = ["worry", "stress", "anxious", "nervous", "fear", "panic"]
+                # Simple trigger detection using the shared scanner
+                scanner = agent.behavior_manager.scanner
                 trigger_count = sum(
-                    1 for msg in recent_messages 
-                    for keyword in anxiety_keywords 
-                    if keyword in msg.lower()
+                    scanner.count(msg, self.name, "trigger") for msg in recent_messages
                 )
                 
                 if trigger_count > 0:
                     self.anxiety_level = min(1.0, self.anxiety_level + 0.1 * trigger_count)
-                    activity.log(f"Found {trigger_count} anxiety triggers, level now: {self.anxiety_level:.2f}")
+                    activity.log("Found {} anxiety triggers, level now: {:.2f}", trigger_count, self.anxiety_level)
                 else:
                     # Decay anxiety over time
                     self.anxiety_level = max(0.0, self.anxiety_level - 0.05)
-                    activity.log(f"No triggers found, anxiety decaying to: {self.anxiety_level:.2f}")
+                    activity.log("No triggers found, anxiety decaying to: {:.2f}", self.anxiety_level)
             
             # Store anxiety state
             await agent.storage.save_yaml("behaviors", "anxiety_state", {
@@ -72,11 +82,10 @@ class AnxietyBehavior(Behavior):
             pass
         return response
     
-    async def on_user_message(self, message: str, agent: "A1") -> None:
-        """React to user messages"""
-        # Quick check for immediate anxiety triggers
-        if any(word in message.lower() for word in ["panic", "emergency", "help"]):
+    async def on_pattern_match(self, matches: List[PatternMatch], message: str, agent: "A1") -> None:
+        """React to emergency keywords in user messages"""
+        if any(m.group == "emergency" for m in matches):
             self.anxiety_level = min(1.0, self.anxiety_level + 0.3)
             activity = await self.create_activity("emergency_response")
-            activity.log(f"Emergency keywords detected! Anxiety level: {self.anxiety_level}")
+            activity.log("Emergency keywords detected! Anxiety level: {}", self.anxiety_level)
             await self.complete_activity(activity)
\ No newline at end of file
@@ -1,17 +1,43 @@
 """Base behavior system for agent plugins"""
 
 import asyncio
+import time
+from contextvars import ContextVar
 from abc import ABC, abstractmethod
-from typing import Any, List, Optional, TYPE_CHECKING, Dict, Callable, Set
+from typing import Any, Deque, List, Optional, TYPE_CHECKING, Dict, Callable, Set, Tuple, Awaitable
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
+from collections import deque
 from enum import Enum
 import uuid
-from ..logging import get_logger
+from ..logging import get_logger, level_enabled
+from ..events import ACTIVITY_FINISHED, ACTIVITY_LOGGED, ACTIVITY_STARTED, BEHAVIOR_CHANGED, event_bus
+from .scanner import PatternScanner, PatternMatch
+from ..monitoring.metrics import llm_origin
+from ..monitoring.tracing import tracer
 from packaging import version
 
 if TYPE_CHECKING:
     from ..agent.core import A1
+    from ..monitoring.metrics import MetricsCollector
+
+
+# Notification hooks have no return value, so when they run over their
+# timeout they are left to finish in the background instead of cancelled
+DEFERRABLE_HOOKS = frozenset(["on_user_message", "on_pattern_match", "on_tool_call", "on_error"])
+
+# Default latency bounds (seconds, None = unbounded). Bounds are opt-in: a
+# transforming hook (pre_process, post_process, ...) that runs over is
+# cancelled wherever it is, which can leave a behavior that persists state in
+# that hook half-written. Set them (A1(hook_timeout=..., hook_budget=...), or
+# Behavior.set_hook_timeout) only for behaviors whose hooks tolerate that.
+DEFAULT_HOOK_TIMEOUT: Optional[float] = None
+DEFAULT_TURN_BUDGET: Optional[float] = None
+
+# Hook budget deadline of the current turn; a context variable so a nested
+# turn (agent.ago() called from a hook) gets its own budget and the outer
+# turn's deadline is restored afterwards
+turn_deadline: ContextVar[Optional[float]] = ContextVar("turn_deadline", default=None)
 
 
 class ActivityStatus(Enum):
@@ -22,6 +48,25 @@ class ActivityStatus(Enum):
     FAILED = "failed"
 
 
+# Log lines kept per activity; older lines are dropped
+MAX_ACTIVITY_LOGS = 200
+
+
+@dataclass(slots=True)
+class ActivityLogEntry:
+    """One activity log line; the message is formatted only when displayed"""
+    time: datetime
+    message: str
+    args: Tuple[Any, ...] = ()
+    
+    @property
+    def text(self) -> str:
+        return self.message.format(*self.args) if self.args else self.message
+    
+    def __str__(self) -> str:
+        return f"[{self.time.isoformat()}] {self.text}"
+
+
 @dataclass
 class Activity:
     """Represents a short-running process within a behavior"""
@@ -33,14 +78,18 @@ class Activity:
     end_time: Optional[datetime] = None
     result: Any = None
     error: Optional[str] = None
-    logs: List[str] = field(default_factory=list)
+    logs: Deque[ActivityLogEntry] = field(default_factory=lambda: deque(maxlen=MAX_ACTIVITY_LOGS))
     
-    def log(self, message: str) -> None:
-        """Add a log message to this activity"""
-        timestamp = datetime.now().isoformat()
-        self.logs.append(f"[{timestamp}] {message}")
-        logger = get_logger(__name__, behavior=self.behavior_name, activity=self.name)
-        logger.debug(message)
+    def log(self, message: str, *args: Any) -> None:
+        """Add a log message to this activity
+        
+        Pass values as args with "{}" placeholders instead of an f-string so
+        formatting happens only if the line is displayed or logged.
+        """
+        self.logs.append(ActivityLogEntry(datetime.now(), message, args))
+        event_bus.publish(ACTIVITY_LOGGED, behavior=self.behavior_name, activity=self.id)
+        if level_enabled("DEBUG"):
+            get_logger(__name__, behavior=self.behavior_name, activity=self.name).debug(message, *args)
     
     @property
     def duration(self) -> Optional[timedelta]:
@@ -62,6 +111,12 @@ class Behavior(ABC):
         self.activities: Dict[str, Activity] = {}
         self._periodic_task: Optional[asyncio.Task] = None
         self.logger = get_logger(__name__, behavior=name)
+        # Seconds a hook may run before it is cancelled or deferred (None = manager default)
+        self.hook_timeout: Optional[float] = None
+        self.hook_timeouts: Dict[str, float] = {}
+        # Behaviors (names or has_behavior requirements) that must initialize first
+        self.depends_on: List[str] = []
+        self.initialized = False
     
     @property
     def full_name(self) -> str:
@@ -77,7 +132,8 @@ class Behavior(ABC):
             start_time=datetime.now()
         )
         self.activities[activity.id] = activity
-        activity.log(f"Started activity: {name}")
+        activity.log("Started activity: {}", name)
+        event_bus.publish(ACTIVITY_STARTED, behavior=self.name, activity=activity.id)
         return activity
     
     async def complete_activity(self, activity: Activity, result: Any = None) -> None:
@@ -85,19 +141,34 @@ class Behavior(ABC):
         activity.status = ActivityStatus.COMPLETED
         activity.end_time = datetime.now()
         activity.result = result
-        activity.log(f"Completed activity (duration: {activity.duration})")
+        activity.log("Completed activity (duration: {})", activity.duration)
+        event_bus.publish(ACTIVITY_FINISHED, behavior=self.name, activity=activity.id, status=activity.status.value)
     
     async def fail_activity(self, activity: Activity, error: str) -> None:
         """Mark an activity as failed"""
         activity.status = ActivityStatus.FAILED
         activity.end_time = datetime.now()
         activity.error = error
-        activity.log(f"Failed activity: {error}")
+        activity.log("Failed activity: {}", error)
+        event_bus.publish(ACTIVITY_FINISHED, behavior=self.name, activity=activity.id, status=activity.status.value)
     
     def set_interval(self, seconds: float) -> None:
         """Set the interval for periodic execution"""
         self.interval = seconds
     
+    def set_hook_timeout(self, seconds: Optional[float], hook: Optional[str] = None) -> None:
+        """Set the timeout for one hook (e.g. "on_user_message") or, without hook, for all hooks"""
+        if hook is None:
+            self.hook_timeout = seconds
+        elif seconds is None:
+            self.hook_timeouts.pop(hook, None)
+        else:
+            self.hook_timeouts[hook] = seconds
+    
+    def get_hook_timeout(self, hook: str) -> Optional[float]:
+        """Get the configured timeout for a hook, if any"""
+        return self.hook_timeouts.get(hook, self.hook_timeout)
+    
     async def start_periodic_execution(self, agent: "A1") -> None:
         """Start periodic execution of this behavior"""
         if self.interval and not self._periodic_task:
@@ -113,6 +184,9 @@ class Behavior(ABC):
     
     async def _periodic_loop(self, agent: "A1") -> None:
         """Internal periodic execution loop"""
+        # Runs in its own task: attribute its LLM calls and logs to this behavior's agent
+        agent.bind_context()
+        llm_origin.set(self.name)
         while True:
             try:
                 await asyncio.sleep(self.interval)
@@ -136,6 +210,71 @@ class Behavior(ABC):
         """Initialize the behavior"""
         pass
     
+    async def shutdown(self, agent: "A1") -> None:
+        """Release resources and persist state when the agent stops"""
+        pass
+    
+    # Attributes describing the instance rather than its runtime state
+    _NON_STATE_ATTRIBUTES = frozenset(["name", "version", "logger", "_periodic_task"])
+    
+    # Runtime state carried over on hot reload; subclasses list their own fields
+    state_fields: Tuple[str, ...] = ("enabled", "last_run", "activities", "initialized")
+    # Configuration (constructor arguments and settings such as the interval)
+    # carried over when the reloaded class is instantiated with default arguments
+    config_fields: Tuple[str, ...] = ("interval", "hook_timeout", "hook_timeouts")
+    
+    @classmethod
+    def _declared_fields(cls, attribute: str) -> List[str]:
+        fields: List[str] = []
+        for klass in reversed(cls.__mro__):
+            for name in vars(klass).get(attribute, ()):
+                if name not in fields:
+                    fields.append(name)
+        return fields
+    
+    @classmethod
+    def declared_state_fields(cls) -> List[str]:
+        """State fields declared by this class and its bases"""
+        return cls._declared_fields("state_fields")
+    
+    @classmethod
+    def declared_config_fields(cls) -> List[str]:
+        """Config fields declared by this class and its bases"""
+        return cls._declared_fields("config_fields")
+    
+    def apply_config(self, previous: "Behavior") -> None:
+        """Take over the configuration of the instance this one replaces on hot reload"""
+        fields = set(self.declared_config_fields())
+        for key in previous.declared_config_fields():
+            if key in fields and hasattr(previous, key):
+                value = getattr(previous, key)
+                setattr(self, key, dict(value) if isinstance(value, dict) else value)
+    
+    def export_state(self) -> Dict[str, Any]:
+        """Runtime state handed to a replacement instance on hot reload"""
+        return {
+            key: getattr(self, key) for key in self.declared_state_fields()
+            if hasattr(self, key)
+        }
+    
+    def migrate_state(self, previous: "Behavior") -> bool:
+        """Take over state from the instance this one replaces on hot reload
+        
+        The default copies the declared state fields (see state_fields) that
+        both instances declare, so everything else keeps the new defaults.
+        Override to transform state across versions. Return False to have the
+        behavior initialized from scratch instead.
+        """
+        fields = set(self.declared_state_fields())
+        for key, value in previous.export_state().items():
+            if key in fields:
+                setattr(self, key, value)
+        return True
+    
+    def register_patterns(self, scanner: PatternScanner) -> None:
+        """Register keyword/pattern triggers with the shared scanner"""
+        pass
+    
     def prompt_block(self) -> str:
         """Return a prompt block for the agent. This is added to the agent's system prompt."""
         return ""
@@ -155,26 +294,193 @@ class Behavior(ABC):
     async def on_user_message(self, message: str, agent: "A1") -> None:
         """Called when user sends a message"""
         pass
+    
+    async def on_pattern_match(self, matches: List[PatternMatch], message: str, agent: "A1") -> None:
+        """Called before on_user_message when the message matched registered patterns"""
+        pass
 
 
 class BehaviorManager:
     """Manages all behaviors for an agent with dependency checking"""
     
-    def __init__(self):
+    def __init__(
+        self,
+        default_hook_timeout: Optional[float] = DEFAULT_HOOK_TIMEOUT,
+        turn_budget: Optional[float] = DEFAULT_TURN_BUDGET
+    ):
         self.behaviors: Dict[str, Behavior] = {}
         self._running_activities: Set[Activity] = set()
         self.logger = get_logger(__name__, context="behavior_manager")
+        self.metrics: Optional["MetricsCollector"] = None
+        # Latency bounds: per-hook default and total hook time per turn
+        # (seconds, None = unbounded); the running deadline is in turn_deadline
+        self.default_hook_timeout = default_hook_timeout
+        self.turn_budget = turn_budget
+        self._background_hooks: Set[asyncio.Task] = set()
+        # Shared single-pass scanner for behavior keyword triggers
+        self.scanner = PatternScanner()
+        self.last_matches: Dict[str, List[PatternMatch]] = {}
+        # Startup: the agent being initialized for, and per-behavior init tasks
+        self._agent: Optional["A1"] = None
+        self._init_tasks: Dict[str, asyncio.Task] = {}
     
     def register(self, behavior: Behavior) -> None:
         """Register a new behavior"""
+        if behavior.name in self.behaviors:
+            self.scanner.unregister(behavior.name)
         self.behaviors[behavior.name] = behavior
+        behavior.register_patterns(self.scanner)
         self.logger.info(f"Registered behavior: {behavior.full_name}")
+        event_bus.publish(BEHAVIOR_CHANGED, behavior=behavior.name)
+        
+        # Behaviors added after startup are initialized right away
+        if self._agent is not None:
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                return  # Picked up by the next initialize_all()
+            self._schedule_initialize(behavior, self._agent)
     
     def unregister(self, behavior_name: str) -> None:
         """Unregister a behavior by name"""
         if behavior_name in self.behaviors:
             behavior = self.behaviors.pop(behavior_name)
+            self.scanner.unregister(behavior_name)
+            self._init_tasks.pop(behavior_name, None)
             asyncio.create_task(behavior.stop_periodic_execution())
+            event_bus.publish(BEHAVIOR_CHANGED, behavior=behavior_name)
+    
+    @staticmethod
+    def _requirement_name(requirement: str) -> str:
+        """Behavior name of a has_behavior requirement ("name" or "name.version>=x")"""
+        return requirement.split(".version")[0]
+    
+    def _check_dependency_cycles(self) -> None:
+        """Raise if registered behaviors depend on each other cyclically"""
+        visiting: Set[str] = set()
+        done: Set[str] = set()
+        
+        def visit(name: str, path: List[str]) -> None:
+            if name in done or name not in self.behaviors:
+                return
+            if name in visiting:
+                raise ValueError(f"Behavior dependency cycle: {' -> '.join(path + [name])}")
+            visiting.add(name)
+            for requirement in self.behaviors[name].depends_on:
+                visit(self._requirement_name(requirement), path + [name])
+            visiting.discard(name)
+            done.add(name)
+        
+        for name in self.behaviors:
+            visit(name, [])
+    
+    def _schedule_initialize(self, behavior: Behavior, agent: "A1") -> asyncio.Task:
+        task = self._init_tasks.get(behavior.name)
+        if task is None:
+            task = asyncio.create_task(self._initialize_behavior(behavior, agent))
+            self._init_tasks[behavior.name] = task
+        return task
+    
+    async def _initialize_behavior(self, behavior: Behavior, agent: "A1") -> None:
+        """Initialize one behavior once its dependencies are ready"""
+        for requirement in behavior.depends_on:
+            dependency = self.behaviors.get(self._requirement_name(requirement))
+            if dependency is None:
+                self.logger.debug(f"{behavior.name}: optional dependency {requirement} not registered")
+                continue
+            if not self.has_behavior(requirement):
+                self.logger.warning(f"{behavior.name}: dependency {requirement} not satisfied by {dependency.full_name}")
+            await self._schedule_initialize(dependency, agent)
+        
+        agent.bind_context()
+        llm_origin.set(behavior.name)
+        start = time.perf_counter()
+        success = True
+        try:
+            await behavior.initialize(agent)
+        except Exception as e:
+            success = False
+            self.logger.error(f"Error initializing {behavior.name}: {e}")
+        duration = time.perf_counter() - start
+        
+        behavior.initialized = success
+        if self.metrics:
+            self.metrics.record_behavior_init(behavior.name, duration, success)
+        self.logger.info(f"Initialized {behavior.full_name} in {duration * 1000:.1f}ms")
+    
+    async def initialize_all(self, agent: "A1") -> None:
+        """Initialize all behaviors concurrently (respecting depends_on) and wait until ready
+        
+        Idempotent: behaviors already initialized are not initialized again, so
+        this doubles as the readiness barrier before each turn.
+        """
+        self._agent = agent
+        pending = [b for b in self.behaviors.values() if b.name not in self._init_tasks]
+        if pending:
+            self._check_dependency_cycles()
+            for behavior in pending:
+                self._schedule_initialize(behavior, agent)
+        
+        waiting = [t for t in self._init_tasks.values() if not t.done()]
+        if waiting:
+            await asyncio.gather(*waiting)
+    
+    async def replace(self, behavior: Behavior, allow_downgrade: bool = False) -> Behavior:
+        """Swap in a new implementation of a registered behavior without restarting the agent
+        
+        State moves over through behavior.migrate_state(previous). Versions
+        follow has_behavior semantics: a replacement with a lower version is
+        refused unless allow_downgrade is set.
+        """
+        previous = self.behaviors.get(behavior.name)
+        if previous is None:
+            self.register(behavior)
+            return behavior
+        
+        if not allow_downgrade and version.parse(behavior.version) < version.parse(previous.version):
+            raise ValueError(
+                f"Refusing to downgrade {previous.full_name} to {behavior.full_name}"
+            )
+        
+        was_periodic = previous._periodic_task is not None
+        await previous.stop_periodic_execution()
+        
+        migrated = False
+        try:
+            migrated = behavior.migrate_state(previous)
+        except Exception as e:
+            self.logger.error(f"State migration to {behavior.full_name} failed: {e}")
+        
+        if not migrated:
+            # Initialize from scratch once registered
+            self._init_tasks.pop(behavior.name, None)
+            behavior.initialized = False
+        
+        if was_periodic and not behavior.interval:
+            # Keep running periodically at the previous rate
+            behavior.interval = previous.interval
+        
+        self.register(behavior)
+        
+        if self._agent is not None:
+            await self.initialize_all(self._agent)
+            if was_periodic:
+                await behavior.start_periodic_execution(self._agent)
+        
+        self.logger.info(f"Replaced {previous.full_name} with {behavior.full_name} (state migrated: {migrated})")
+        return behavior
+    
+    @property
+    def ready(self) -> bool:
+        """Whether every registered behavior has finished initializing"""
+        return all(
+            name in self._init_tasks and self._init_tasks[name].done()
+            for name in self.behaviors
+        )
+    
+    def matches_for(self, behavior_name: str) -> List[PatternMatch]:
+        """Pattern matches for a behavior in the current user message (cheap pre-filter)"""
+        return self.last_matches.get(behavior_name, [])
     
     def has_behavior(self, requirement: str) -> bool:
         """Check if a behavior requirement is satisfied
@@ -237,49 +543,186 @@ class BehaviorManager:
         for behavior in self.behaviors.values():
             await behavior.stop_periodic_execution()
     
+    async def shutdown_all(self, agent: "A1") -> None:
+        """Run shutdown hooks for all behaviors"""
+        for behavior in self.behaviors.values():
+            try:
+                await behavior.shutdown(agent)
+            except Exception as e:
+                self.logger.error(f"Error in {behavior.name} shutdown: {e}")
+    
+    def begin_turn(self) -> None:
+        """Start the hook time budget for a new agent turn (in the current context)"""
+        if self.turn_budget is not None:
+            turn_deadline.set(time.monotonic() + self.turn_budget)
+        else:
+            turn_deadline.set(None)
+    
+    def _hook_timeout(self, behavior: Behavior, hook: str) -> Optional[float]:
+        """Effective timeout for a hook: its own limit capped by the remaining turn budget"""
+        timeout = behavior.get_hook_timeout(hook)
+        if timeout is None:
+            timeout = self.default_hook_timeout
+        deadline = turn_deadline.get()
+        if deadline is not None:
+            remaining = max(0.0, deadline - time.monotonic())
+            timeout = remaining if timeout is None else min(timeout, remaining)
+        return timeout
+    
+    def _record_hook(self, behavior: Behavior, hook: str, duration: float, outcome: str) -> None:
+        if self.metrics:
+            self.metrics.record_hook(behavior.name, hook, duration, outcome)
+    
+    async def _run_hook(
+        self,
+        behavior: Behavior,
+        hook: str,
+        call: Callable[[], Awaitable[Any]]
+    ) -> Tuple[str, Any]:
+        """Run one behavior hook within its latency bounds
+        
+        Returns (outcome, result) where outcome is "ok", "error", "timeout"
+        (cancelled) or "deferred" (left running in the background). LLM calls
+        made by the hook, including deferred remainders, are attributed to
+        the behavior.
+        """
+        origin = llm_origin.set(behavior.name)
+        try:
+            with tracer.span(f"hook.{hook}", behavior=behavior.name) as span:
+                outcome, result = await self._run_bounded(behavior, hook, call)
+                if span:
+                    span.set_attribute("outcome", outcome)
+                return outcome, result
+        finally:
+            llm_origin.reset(origin)
+    
+    async def _run_bounded(
+        self,
+        behavior: Behavior,
+        hook: str,
+        call: Callable[[], Awaitable[Any]]
+    ) -> Tuple[str, Any]:
+        timeout = self._hook_timeout(behavior, hook)
+        deferrable = hook in DEFERRABLE_HOOKS
+        start = time.perf_counter()
+        
+        if timeout is not None and timeout <= 0 and not deferrable:
+            # Turn budget exhausted: skip transforming hooks entirely
+            self._record_hook(behavior, hook, 0.0, "skipped")
+            return "skipped", None
+        
+        if timeout is None:
+            # Unbounded: run inline without the cost of a separate task
+            try:
+                result = await call()
+            except Exception as e:
+                self.logger.error(f"Error in {behavior.name} {hook}: {e}")
+                self._record_hook(behavior, hook, time.perf_counter() - start, "error")
+                return "error", None
+            self._record_hook(behavior, hook, time.perf_counter() - start, "ok")
+            return "ok", result
+        
+        task = asyncio.ensure_future(call())
+        try:
+            done, _ = await asyncio.wait({task}, timeout=timeout)
+        except asyncio.CancelledError:
+            task.cancel()
+            raise
+        
+        if not done:
+            if deferrable:
+                self.logger.warning(f"{behavior.name} {hook} exceeded {timeout:.2f}s, continuing in background")
+                self._background_hooks.add(task)
+                task.add_done_callback(
+                    lambda t: self._finish_background_hook(t, behavior, hook, start)
+                )
+                self._record_hook(behavior, hook, time.perf_counter() - start, "deferred")
+                return "deferred", None
+            
+            task.cancel()
+            self.logger.warning(f"{behavior.name} {hook} exceeded {timeout:.2f}s, cancelled")
+            self._record_hook(behavior, hook, time.perf_counter() - start, "timeout")
+            return "timeout", None
+        
+        duration = time.perf_counter() - start
+        if task.exception() is not None:
+            self.logger.error(f"Error in {behavior.name} {hook}: {task.exception()}")
+            self._record_hook(behavior, hook, duration, "error")
+            return "error", None
+        
+        self._record_hook(behavior, hook, duration, "ok")
+        return "ok", task.result()
+    
+    def _finish_background_hook(self, task: asyncio.Task, behavior: Behavior, hook: str, start: float) -> None:
+        """Record the final outcome of a deferred hook"""
+        self._background_hooks.discard(task)
+        if task.cancelled():
+            outcome = "cancelled"
+        elif task.exception() is not None:
+            outcome = "error"
+            self.logger.error(f"Error in {behavior.name} {hook} (background): {task.exception()}")
+        else:
+            outcome = "completed_background"
+        self._record_hook(behavior, hook, time.perf_counter() - start, outcome)
+    
+    async def cancel_background_hooks(self) -> None:
+        """Cancel deferred hooks that are still running"""
+        tasks = list(self._background_hooks)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+    
     async def pre_process(self, prompt: str, agent: "A1") -> str:
         """Run all pre-process hooks"""
-        for behavior in self.behaviors.values():
+        for behavior in list(self.behaviors.values()):
             if behavior.enabled:
-                try:
-                    prompt = await behavior.pre_process(prompt, agent)
-                except Exception as e:
-                    self.logger.error(f"Error in {behavior.name} pre_process: {e}")
+                outcome, result = await self._run_hook(
+                    behavior, "pre_process", lambda: behavior.pre_process(prompt, agent)
+                )
+                if outcome == "ok":
+                    prompt = result
         return prompt
     
     async def post_process(self, response: str, agent: "A1") -> str:
         """Run all post-process hooks"""
-        for behavior in self.behaviors.values():
+        for behavior in list(self.behaviors.values()):
             if behavior.enabled:
-                try:
-                    response = await behavior.post_process(response, agent)
-                except Exception as e:
-                    self.logger.error(f"Error in {behavior.name} post_process: {e}")
+                outcome, result = await self._run_hook(
+                    behavior, "post_process", lambda: behavior.post_process(response, agent)
+                )
+                if outcome == "ok":
+                    response = result
         return response
     
     async def on_tool_call(self, tool_name: str, args: dict, result: Any, agent: "A1") -> None:
         """Notify all behaviors of a tool call"""
-        for behavior in self.behaviors.values():
+        for behavior in list(self.behaviors.values()):
             if behavior.enabled:
-                try:
-                    await behavior.on_tool_call(tool_name, args, result, agent)
-                except Exception as e:
-                    self.logger.error(f"Error in {behavior.name} on_tool_call: {e}")
+                await self._run_hook(
+                    behavior, "on_tool_call",
+                    lambda: behavior.on_tool_call(tool_name, args, result, agent)
+                )
     
     async def on_error(self, error: Exception, agent: "A1") -> None:
         """Notify all behaviors of an error"""
-        for behavior in self.behaviors.values():
+        for behavior in list(self.behaviors.values()):
             if behavior.enabled:
-                try:
-                    await behavior.on_error(error, agent)
-                except Exception as e:
-                    self.logger.error(f"Error in {behavior.name} on_error: {e}")
+                await self._run_hook(behavior, "on_error", lambda: behavior.on_error(error, agent))
     
     async def on_user_message(self, message: str, agent: "A1") -> None:
         """Notify all behaviors of a user message"""
-        for behavior in self.behaviors.values():
+        # Scan once for every behavior's registered patterns
+        self.last_matches = self.scanner.scan(message)
+        
+        for behavior in list(self.behaviors.values()):
             if behavior.enabled:
-                try:
-                    await behavior.on_user_message(message, agent)
-                except Exception as e:
-                    self.logger.error(f"Error in {behavior.name} on_user_message: {e}")
\ No newline at end of file
+                matches = self.last_matches.get(behavior.name)
+                if matches:
+                    await self._run_hook(
+                        behavior, "on_pattern_match",
+                        lambda: behavior.on_pattern_match(matches, message, agent)
+                    )
+                await self._run_hook(
+                    behavior, "on_user_message", lambda: behavior.on_user_message(message, agent)
+                )
@@ -1,21 +1,145 @@
 """Episodic memory behavior that periodically summarizes conversations"""
 
-from typing import TYPE_CHECKING, List, Dict, Any
+import asyncio
+import math
+import re
+import threading
+import time
+from collections import Counter
+from typing import TYPE_CHECKING, List, Dict, Any, Optional, Set, Tuple
 from datetime import datetime, timedelta
 from .base import Behavior
+from ..llm import utils as llm
 
 if TYPE_CHECKING:
     from ..agent.core import A1
 
 
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Common words that carry no retrieval signal
+_STOPWORDS = frozenset(
+    "a an and are as at be but by can do for from has have how i in is it its me my "
+    "of on or so that the this to was we what when where which who why will with you your".split()
+)
+
+
+def _tokenize(text: str) -> List[str]:
+    """Lowercase word tokens with stopwords removed"""
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS and len(t) > 1]
+
+
+def _estimate_tokens(text: str) -> int:
+    """Rough LLM token estimate (~4 characters per token)"""
+    return max(1, len(text) // 4)
+
+
+class EpisodicIndex:
+    """In-memory BM25 index over episodic memory summaries"""
+    
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.entries: List[Dict[str, Any]] = []
+        self._term_freqs: List[Counter] = []
+        self._doc_lengths: List[int] = []
+        self._doc_freqs: Counter = Counter()
+        self.loaded = False
+        # Searches run in worker threads while memories are added
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self.entries)
+    
+    def add(self, entry: Dict[str, Any]) -> None:
+        """Index a memory entry (as written to the episodic_memories log)"""
+        terms = Counter(_tokenize(entry.get("summary", "")))
+        with self._lock:
+            self.entries.append(entry)
+            self._term_freqs.append(terms)
+            self._doc_lengths.append(sum(terms.values()))
+            self._doc_freqs.update(terms.keys())
+    
+    def search(self, query: str, limit: int = 3) -> List[Tuple[float, Dict[str, Any]]]:
+        """Return up to limit (score, entry) pairs ranked by BM25 relevance"""
+        query_terms = set(_tokenize(query))
+        if not query_terms:
+            return []
+        with self._lock:
+            return self._search(query_terms, limit)
+    
+    def _search(self, query_terms: Set[str], limit: int) -> List[Tuple[float, Dict[str, Any]]]:
+        if not self.entries:
+            return []
+        
+        n_docs = len(self.entries)
+        avg_length = (sum(self._doc_lengths) / n_docs) or 1.0
+        idf = {
+            term: math.log(1 + (n_docs - self._doc_freqs[term] + 0.5) / (self._doc_freqs[term] + 0.5))
+            for term in query_terms if term in self._doc_freqs
+        }
+        if not idf:
+            return []
+        
+        scored = []
+        for i, terms in enumerate(self._term_freqs):
+            score = 0.0
+            norm = self.k1 * (1 - self.b + self.b * self._doc_lengths[i] / avg_length)
+            for term, weight in idf.items():
+                tf = terms.get(term)
+                if tf:
+                    score += weight * tf * (self.k1 + 1) / (tf + norm)
+            if score > 0:
+                scored.append((score, self.entries[i]))
+        
+        scored.sort(key=lambda pair: pair[0], reverse=True)
+        return scored[:limit]
+
+
 class EpisodicMemoryBehavior(Behavior):
     """Behavior that creates episodic memories by summarizing conversation chunks"""
     
-    def __init__(self, summary_interval: int = 10):
+    state_fields = ("interaction_count", "pending_interactions", "index")
+    config_fields = (
+        "summary_interval", "summary_model", "retrieval_top_k",
+        "retrieval_token_budget", "retrieval_timeout"
+    )
+    
+    def __init__(
+        self,
+        summary_interval: int = 10,
+        summary_model: Optional[str] = None,
+        retrieval_top_k: int = 3,
+        retrieval_token_budget: int = 600,
+        retrieval_timeout: float = 0.2
+    ):
         super().__init__("episodic-memory", version="0.1.0")
         self.summary_interval = summary_interval  # Summarize every N interactions
+        self.summary_model = summary_model  # Defaults to the agent's model
         self.interaction_count = 0
         self.pending_interactions: List[Dict[str, str]] = []
+        
+        # Memory retrieval settings for pre_process injection
+        self.retrieval_top_k = retrieval_top_k
+        self.retrieval_token_budget = retrieval_token_budget
+        self.retrieval_timeout = retrieval_timeout  # Seconds; inject nothing if exceeded
+        self.index = EpisodicIndex()
+    
+    async def initialize(self, agent: "A1") -> None:
+        """Load stored episodic memories into the retrieval index"""
+        await self._load_index(agent)
+    
+    async def _load_index(self, agent: "A1") -> None:
+        """Build the retrieval index from the structured episodic memory log"""
+        if self.index.loaded:
+            return
+        entries = await agent.storage.read_log("episodic_memories")
+        index = EpisodicIndex()
+        for entry in entries:
+            index.add(entry)
+        index.loaded = True
+        self.index = index
+        self.logger.debug(f"Loaded {len(index)} episodic memories into index")
     
     async def on_user_message(self, message: str, agent: "A1") -> None:
         """Track user messages for episodic summary"""
@@ -42,14 +166,22 @@ class EpisodicMemoryBehavior(Behavior):
     
     async def _create_episodic_summary(self, agent: "A1") -> None:
         """Create an episodic memory summary"""
+        if not self.pending_interactions:
+            return
+        
         activity = await self.create_activity("create_episodic_summary")
         
+        # Take ownership of the pending batch so interactions arriving while
+        # the summary is generated start a fresh batch
+        interactions = self.pending_interactions
+        self.pending_interactions = []
+        
         try:
-            activity.log(f"Creating episodic summary of {len(self.pending_interactions)} interactions")
+            activity.log("Creating episodic summary of {} interactions", len(interactions))
             
             # Build conversation text for summary
             conversation_text = ""
-            for interaction in self.pending_interactions:
+            for interaction in interactions:
                 role = interaction["role"].capitalize()
                 content = interaction["content"]
                 conversation_text += f"{role}: {content}\n\n"
@@ -72,48 +204,51 @@ Provide a structured summary with these sections:
 - Emotional Context: overall tone and mood
 """
             
-            # Get summary from LLM
+            # Get summary from LLM out of band (with the agent's credentials) so
+            # the agent's conversation history and behavior hooks are left untouched
             activity.log("Calling LLM for episodic summary")
-            summary = await agent.ago(summary_prompt)
+            summary = await llm.complete(
+                summary_prompt,
+                model=self.summary_model or agent.llm,
+                client=agent.llm_client,
+                temperature=0.3
+            )
             
             # Save episodic memory
             timestamp = datetime.now()
             memory_entry = {
                 "timestamp": timestamp.isoformat(),
-                "interaction_count": len(self.pending_interactions),
+                "interaction_count": len(interactions),
                 "summary": summary,
                 "time_span": {
-                    "start": self.pending_interactions[0]["timestamp"],
-                    "end": self.pending_interactions[-1]["timestamp"]
+                    "start": interactions[0]["timestamp"],
+                    "end": interactions[-1]["timestamp"]
                 }
             }
             
             # Append to episodic memories file
             memories_content = f"\n\n## Memory - {timestamp.strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-            memories_content += f"**Interactions:** {len(self.pending_interactions)}\n"
+            memories_content += f"**Interactions:** {len(interactions)}\n"
             memories_content += f"**Time Span:** {memory_entry['time_span']['start']} to {memory_entry['time_span']['end']}\n\n"
             memories_content += f"### Summary\n\n{summary}\n"
             memories_content += "\n---\n"
             
-            # Load existing memories
-            existing = await agent.storage.load_markdown("episodic", "memories")
-            if existing:
-                memories_content = existing + memories_content
-            else:
-                memories_content = "# Episodic Memories\n\n" + memories_content
-            
-            await agent.storage.save_markdown("episodic", "memories", memories_content)
+            await agent.storage.append_markdown(
+                "episodic", "memories", memories_content,
+                header="# Episodic Memories\n\n"
+            )
             
             # Also save structured version
             await agent.storage.append_to_log("episodic_memories", memory_entry)
+            # May wait for a search running in a worker thread
+            await asyncio.to_thread(self.index.add, memory_entry)
             
-            # Clear pending interactions
-            self.pending_interactions = []
-            
-            activity.log(f"Episodic memory created and saved")
+            activity.log("Episodic memory created and saved")
             await self.complete_activity(activity, {"summary_length": len(summary)})
             
         except Exception as e:
+            # Put the batch back so it is retried with the next summary
+            self.pending_interactions = interactions + self.pending_interactions
             await self.fail_activity(activity, str(e))
     
     async def periodic_task(self, agent: "A1") -> None:
@@ -135,6 +270,64 @@ Provide a structured summary with these sections:
             await self.fail_activity(activity, str(e))
     
     async def pre_process(self, prompt: str, agent: "A1") -> str:
-        """Could inject relevant memories into context"""
-        # For now, just pass through
-        return prompt
\ No newline at end of file
+        """Add the most relevant episodic memories to this turn's LLM requests
+        
+        Memories go in as turn context rather than a rewritten prompt, so
+        they are not stored in (and resent with) the conversation history.
+        """
+        start = time.perf_counter()
+        timed_out = False
+        memories: List[Dict[str, Any]] = []
+        
+        try:
+            memories = await asyncio.wait_for(
+                self._retrieve(prompt, agent),
+                timeout=self.retrieval_timeout
+            )
+        except asyncio.TimeoutError:
+            timed_out = True
+            self.logger.warning(
+                f"Episodic retrieval exceeded {self.retrieval_timeout}s budget, skipping injection"
+            )
+        
+        agent.metrics.record_retrieval(
+            self.name,
+            time.perf_counter() - start,
+            hits=len(memories),
+            timed_out=timed_out
+        )
+        
+        if not memories:
+            return prompt
+        
+        blocks = []
+        for memory in memories:
+            when = memory.get("timestamp", "")[:16].replace("T", " ")
+            blocks.append(f"[{when}]\n{memory['summary'].strip()}")
+        memory_text = "\n\n".join(blocks)
+        
+        agent.add_turn_context(
+            f"<episodic_memories>\n"
+            f"Relevant memories from earlier conversations:\n\n{memory_text}\n"
+            f"</episodic_memories>"
+        )
+        return prompt
+    
+    async def _retrieve(self, prompt: str, agent: "A1") -> List[Dict[str, Any]]:
+        """Rank stored memories against the prompt and fit the top-k into the token budget"""
+        # The index is loaded once in initialize(), outside the retrieval budget
+        if not self.index.loaded or not len(self.index):
+            return []
+        
+        # Scoring is CPU-bound; keep it off the event loop so the timeout can fire
+        ranked = await asyncio.to_thread(self.index.search, prompt, self.retrieval_top_k)
+        
+        selected = []
+        budget = self.retrieval_token_budget
+        for _score, entry in ranked:
+            cost = _estimate_tokens(entry.get("summary", ""))
+            if cost > budget:
+                continue
+            selected.append(entry)
+            budget -= cost
+        return selected
\ No newline at end of file
@@ -7,12 +7,14 @@ about people, projects, and concepts mentioned by the user.
 
 import json
 import re
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
-from typing import TYPE_CHECKING, Dict, List, Any, Optional
+from typing import TYPE_CHECKING, Dict, List, Any, Optional, Tuple
 
 from .base import Behavior, Activity
 from ..llm import utils as llm
+from ..storage.entity_registry import EntityRegistry, EntityRecord, ENTITY_CATEGORIES
 
 if TYPE_CHECKING:
     from ..agent.core import A1
@@ -26,11 +28,40 @@ class KnowledgeManagementBehavior(Behavior):
     
     name = "knowledge-management"
     version = "0.1.0"
+    state_fields = (
+        "storage_path", "pending_extractions", "registry",
+        "_dossiers", "_dirty", "_unlogged_mentions", "_registry_loaded"
+    )
+    config_fields = ("max_recent_mentions", "max_summary_contexts", "max_cached_dossiers")
     
-    def __init__(self, storage_path: Optional[Path] = None):
+    def __init__(
+        self,
+        storage_path: Optional[Path] = None,
+        similarity_threshold: float = 0.7,
+        max_recent_mentions: int = 20,
+        max_summary_contexts: int = 10,
+        max_cached_dossiers: int = 256,
+        consolidation_interval: float = 300.0
+    ):
         super().__init__("knowledge-management")
+        # Merge duplicates and refresh rolling summaries every 5 minutes by default
+        self.set_interval(consolidation_interval)
         self.storage_path = storage_path
         self.pending_extractions = []
+        # Compaction policy: raw mentions kept in the dossier, and rolled-off
+        # contexts held for the next rolling summary refresh
+        self.max_recent_mentions = max_recent_mentions
+        self.max_summary_contexts = max_summary_contexts
+        self.registry = EntityRegistry(similarity_threshold=similarity_threshold)
+        # Recently used dossiers, keyed by (type, slug), least recent first; dirty
+        # ones are flushed per batch, after which the cache is trimmed to
+        # max_cached_dossiers
+        self.max_cached_dossiers = max_cached_dossiers
+        self._dossiers: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+        self._dirty: set = set()
+        # Mentions not yet appended to each entity's history log
+        self._unlogged_mentions: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        self._registry_loaded = False
         
     async def initialize(self, agent: "A1") -> None:
         """Initialize the behavior with agent context."""
@@ -39,6 +70,35 @@ class KnowledgeManagementBehavior(Behavior):
         # Use agent's storage path if not specified
         if not self.storage_path and agent.storage.base_path:
             self.storage_path = Path(agent.storage.base_path)
+        
+        await self._load_registry(agent.storage)
+    
+    async def _load_registry(self, storage) -> None:
+        """Load the entity registry, rebuilding it from dossiers if no index exists."""
+        if self._registry_loaded:
+            return
+        
+        data = await storage.load_yaml("dossiers", "registry")
+        if data:
+            self.registry = EntityRegistry.from_dict(
+                data, similarity_threshold=self.registry.similarity_threshold
+            )
+        else:
+            # First run (or index lost): scan existing dossiers once
+            for entity_type, category in ENTITY_CATEGORIES.items():
+                for path in await storage.list_files(category, "*.yaml"):
+                    dossier = await storage.load_yaml(category, path.stem) or {}
+                    record = EntityRecord(
+                        entity_type=entity_type,
+                        slug=path.stem,
+                        name=dossier.get("name", path.stem)
+                    )
+                    self.registry.records[(entity_type, record.slug)] = record
+                    for alias in [record.name] + dossier.get("aliases", []):
+                        self.registry.add_alias(record, alias)
+        
+        self._registry_loaded = True
+        self.logger.info(f"Loaded entity registry with {len(self.registry)} entities")
             
     async def on_user_message(self, message: str, agent: "A1") -> None:
         """Extract entities when user sends a message."""
@@ -46,11 +106,11 @@ class KnowledgeManagementBehavior(Behavior):
         
         try:
             # Extract entities from the message
-            activity.log(f"Extracting entities from message: {message}")
+            activity.log("Extracting entities from message: {:.200}", message)
             entities = await self._extract_entities_from_message(message, agent)
             
             if entities:
-                activity.log(f"Extracted {len(entities)} entities from message")
+                activity.log("Extracted {} entities from message", len(entities))
                 
                 # Queue for processing (could be done async)
                 self.pending_extractions.extend(entities)
@@ -80,7 +140,7 @@ class KnowledgeManagementBehavior(Behavior):
         """Use LLM to extract entities from a message."""
         try:
             # Use the LLM utility for entity extraction
-            entities = await llm.extract_entities(message)
+            entities = await llm.extract_entities(message, client=agent.llm_client)
             return entities
         except Exception as e:
             self.logger.error(f"Entity extraction failed: {e}")
@@ -92,6 +152,7 @@ class KnowledgeManagementBehavior(Behavior):
             return
             
         storage = agent.storage
+        await self._load_registry(storage)
         
         activity = await self.create_activity("update_dossiers")
         
@@ -102,65 +163,131 @@ class KnowledgeManagementBehavior(Behavior):
                 entity = self.pending_extractions.pop(0)
                 
                 try:
-                    await self._update_dossier(entity, storage)
-                    processed += 1
+                    if await self._update_dossier(entity, storage):
+                        processed += 1
                 except Exception as e:
-                    activity.log(f"Failed to update dossier: {e}", level="error")
-                    
-            activity.log(f"Updated {processed} dossiers")
+                    activity.log("Failed to update dossier: {}", e)
+            
+            written = await self._flush_dossiers(storage)
+            activity.log("Updated {} entities, wrote {} dossiers", processed, written)
             await self.complete_activity(activity)
         except Exception as e:
             await self.fail_activity(activity, f"Failed to process entities: {e}")
     
+    @staticmethod
+    def _history_log(record: EntityRecord) -> str:
+        """Name of the append-only log holding an entity's full mention history."""
+        return f"dossier_mentions/{record.entity_type}/{record.slug}"
+    
+    async def _get_dossier(self, record: EntityRecord, storage) -> Dict[str, Any]:
+        """Return the cached dossier for a record, loading it from storage on first use."""
+        key = (record.entity_type, record.slug)
+        if key in self._dossiers:
+            self._dossiers.move_to_end(key)
+        else:
+            existing = await storage.load_yaml(record.category, record.slug)
+            if existing is None:
+                existing = {
+                    "name": record.name,
+                    "type": record.entity_type,
+                    "created": datetime.now().isoformat(),
+                    "mentions": [],
+                    "mention_count": 0,
+                    "attributes": {},
+                    "history_logged": True
+                }
+            elif not existing.get("history_logged"):
+                # Dossier predates the history log: its mentions only live in
+                # the YAML, so log them before compaction may drop any
+                mentions = existing.get("mentions", [])
+                self._unlogged_mentions.setdefault(key, []).extend(mentions)
+                existing.setdefault("mention_count", len(mentions))
+                existing["history_logged"] = True
+                self._compact_dossier(existing)
+                self._dirty.add(key)
+            self._dossiers[key] = existing
+        return self._dossiers[key]
+    
+    def _compact_dossier(self, dossier: Dict[str, Any]) -> None:
+        """Roll mentions beyond the most recent N into per-day counts and summary contexts."""
+        mentions = dossier.get("mentions", [])
+        overflow = len(mentions) - self.max_recent_mentions
+        if overflow <= 0:
+            return
+        
+        rolled, dossier["mentions"] = mentions[:overflow], mentions[overflow:]
+        
+        daily = dossier.setdefault("daily_mentions", {})
+        contexts = dossier.setdefault("summary_contexts", [])
+        for mention in rolled:
+            day = mention.get("timestamp", "")[:10] or "unknown"
+            daily[day] = daily.get(day, 0) + 1
+            context = (mention.get("context") or "").strip()
+            if context and context not in contexts:
+                contexts.append(context)
+        
+        # Only the newest contexts are kept until the next summary refresh
+        dossier["summary_contexts"] = contexts[-self.max_summary_contexts:]
+    
+    async def _refresh_summary(self, dossier: Dict[str, Any], agent: "A1") -> bool:
+        """Fold pending rolled-off contexts into the dossier's rolling summary."""
+        contexts = dossier.get("summary_contexts")
+        if not contexts:
+            return False
+        
+        previous = dossier.get("summary", "")
+        text = f"Previous summary: {previous}\n\nNew observations:\n" if previous else "Observations:\n"
+        text += "\n".join(f"- {c}" for c in contexts)
+        
+        dossier["summary"] = await llm.summarize(
+            f"What is known about {dossier.get('name')} ({dossier.get('type')}).\n\n{text}",
+            max_length=120,
+            client=agent.llm_client
+        )
+        dossier["summary_contexts"] = []
+        dossier["summary_updated"] = datetime.now().isoformat()
+        return True
+    
     async def _update_dossier(
         self, 
         entity: Dict[str, Any], 
         storage
-    ) -> None:
-        """Update or create a dossier for an entity."""
+    ) -> bool:
+        """Record a mention of an entity in its (cached) dossier."""
         entity_type = entity.get("type", "unknown")
-        entity_name = entity.get("name", "unnamed")
-        
-        # Sanitize name for filename
-        safe_name = re.sub(r'[^\w\s-]', '', entity_name.lower())
-        safe_name = re.sub(r'[-\s]+', '_', safe_name)
-        
-        # Determine path
-        if entity_type == "person":
-            dossier_path = f"dossiers/people/{safe_name}.yaml"
-        elif entity_type == "project":
-            dossier_path = f"dossiers/projects/{safe_name}.yaml"
-        elif entity_type == "concept":
-            dossier_path = f"dossiers/concepts/{safe_name}.yaml"
+        entity_name = (entity.get("name") or "").strip()
+        
+        if entity_type not in ENTITY_CATEGORIES or not entity_name:
+            return False
+        
+        # Resolve against known entities in memory; only unseen entities get a new dossier
+        record = self.registry.resolve(entity_type, entity_name)
+        if record is None:
+            record = self.registry.register(entity_type, entity_name)
         else:
-            return
-            
-        # Load existing dossier or create new
-        try:
-            existing = await storage.load_yaml(dossier_path)
-        except:
-            existing = {
-                "name": entity_name,
-                "type": entity_type,
-                "created": datetime.now().isoformat(),
-                "mentions": [],
-                "attributes": {}
-            }
+            self.registry.add_alias(record, entity_name)
+        
+        existing = await self._get_dossier(record, storage)
         
         # Add new mention
         mention = {
             "timestamp": datetime.now().isoformat(),
             "context": entity.get("context", ""),
-            "source": "conversation"
+            "source": "conversation",
+            "name": entity_name
         }
         
         if "mentions" not in existing:
             existing["mentions"] = []
         existing["mentions"].append(mention)
+        existing["mention_count"] = existing.get("mention_count", 0) + 1
+        existing["aliases"] = sorted(record.aliases)
+        self._unlogged_mentions.setdefault((record.entity_type, record.slug), []).append(mention)
+        self._compact_dossier(existing)
         
         # Merge attributes
         new_attrs = entity.get("attributes", {})
-        if new_attrs:
+        if new_attrs and isinstance(new_attrs, dict):
             if "attributes" not in existing:
                 existing["attributes"] = {}
             existing["attributes"].update(new_attrs)
@@ -168,21 +295,148 @@ class KnowledgeManagementBehavior(Behavior):
         # Update last_seen
         existing["last_seen"] = datetime.now().isoformat()
         
-        # Save back
-        await storage.save_yaml(dossier_path, existing)
-        self.logger.info(f"Updated dossier: {dossier_path}")
+        self._dirty.add((record.entity_type, record.slug))
+        return True
+    
+    async def _flush_dossiers(self, storage) -> int:
+        """Write all dossiers changed since the last flush, plus the registry index.
+        
+        Pending work is taken over before the first await, so mentions and
+        changes added by hooks running concurrently go to the next flush
+        instead of being cleared; whatever fails to write stays pending.
+        """
+        unlogged, self._unlogged_mentions = self._unlogged_mentions, {}
+        dirty, self._dirty = sorted(self._dirty), set()
+        
+        # History first, so a mention is never only in memory once compacted away
+        try:
+            while unlogged:
+                key, mentions = next(iter(unlogged.items()))
+                record = self.registry.get(*key)
+                if record is not None and mentions:
+                    await storage.extend_log(self._history_log(record), mentions)
+                del unlogged[key]
+        except BaseException:
+            for key, mentions in unlogged.items():
+                self._unlogged_mentions.setdefault(key, [])[:0] = mentions
+            self._dirty.update(dirty)
+            raise
+        
+        written = 0
+        for i, key in enumerate(dirty):
+            record = self.registry.get(*key)
+            dossier = self._dossiers.get(key)
+            if record is None or dossier is None:
+                continue
+            try:
+                await storage.save_yaml(record.category, record.slug, dossier)
+            except BaseException:
+                self._dirty.update(dirty[i:])
+                raise
+            written += 1
+        self._evict_dossiers()
+        
+        if self.registry.dirty:
+            self.registry.dirty = False
+            try:
+                await storage.save_yaml("dossiers", "registry", self.registry.to_dict())
+            except BaseException:
+                self.registry.dirty = True
+                raise
+        
+        if written:
+            self.logger.info(f"Flushed {written} dossiers")
+        return written
+    
+    def _evict_dossiers(self) -> None:
+        """Drop least recently used dossiers beyond the cache size (never unsaved ones)"""
+        excess = len(self._dossiers) - self.max_cached_dossiers
+        for key in list(self._dossiers):
+            if excess <= 0:
+                break
+            if key not in self._dirty:
+                del self._dossiers[key]
+                excess -= 1
+    
+    async def _merge_entities(self, primary: EntityRecord, duplicate: EntityRecord, storage) -> None:
+        """Fold a duplicate entity's dossier into the primary one and delete it."""
+        target = await self._get_dossier(primary, storage)
+        source = await self._get_dossier(duplicate, storage)
+        
+        target["mentions"] = sorted(
+            target.get("mentions", []) + source.get("mentions", []),
+            key=lambda m: m.get("timestamp", "")
+        )
+        target["mention_count"] = target.get("mention_count", 0) + source.get("mention_count", 0)
+        daily = target.setdefault("daily_mentions", {})
+        for day, count in (source.get("daily_mentions") or {}).items():
+            daily[day] = daily.get(day, 0) + count
+        target["summary_contexts"] = target.get("summary_contexts", []) + source.get("summary_contexts", [])
+        if source.get("summary"):
+            target["summary_contexts"].append(source["summary"])
+        self._compact_dossier(target)
+        target["summary_contexts"] = target["summary_contexts"][-self.max_summary_contexts:]
+        
+        # Move the duplicate's mention history to the primary's log; written
+        # before the duplicate's log is deleted so no history is lost
+        duplicate_key = (duplicate.entity_type, duplicate.slug)
+        pending = self._unlogged_mentions.pop(duplicate_key, [])
+        history = await storage.read_log(self._history_log(duplicate)) + pending
+        await storage.extend_log(self._history_log(primary), history)
+        await storage.delete_log(self._history_log(duplicate))
+        
+        attributes = dict(source.get("attributes") or {})
+        attributes.update(target.get("attributes") or {})
+        target["attributes"] = attributes
+        target["created"] = min(target.get("created", ""), source.get("created", "")) or target.get("created")
+        target["last_seen"] = max(target.get("last_seen", ""), source.get("last_seen", ""))
+        
+        self.registry.merge(primary, duplicate)
+        target["aliases"] = sorted(primary.aliases)
+        
+        self._dossiers.pop(duplicate_key, None)
+        self._dirty.discard(duplicate_key)
+        self._dirty.add((primary.entity_type, primary.slug))
+        await storage.delete_yaml(duplicate.category, duplicate.slug)
     
     async def periodic_task(self, agent: "A1") -> None:
         """Periodic consolidation of dossiers."""
         activity = await self.create_activity("consolidate_dossiers")
         
         try:
-            # Could implement:
-            # - Deduplication of entities
-            # - Relationship extraction between entities
-            # - Summary generation for each dossier
-            activity.log("Dossier consolidation not yet implemented")
-            await self.complete_activity(activity)
+            storage = agent.storage
+            await self._load_registry(storage)
+            
+            # Merge entities whose names turned out to be variants of each other
+            merged = 0
+            for first, second, score in self.registry.find_duplicates():
+                if self.registry.get(first.entity_type, first.slug) is None:
+                    continue
+                if self.registry.get(second.entity_type, second.slug) is None:
+                    continue
+                
+                first_dossier = await self._get_dossier(first, storage)
+                second_dossier = await self._get_dossier(second, storage)
+                if second_dossier.get("mention_count", 0) > first_dossier.get("mention_count", 0):
+                    first, second = second, first
+                
+                activity.log("Merging {!r} into {!r} (similarity {:.2f})", second.name, first.name, score)
+                await self._merge_entities(first, second, storage)
+                merged += 1
+            
+            # Refresh rolling summaries of loaded dossiers with rolled-off mentions
+            summarized = 0
+            for key, dossier in list(self._dossiers.items()):
+                try:
+                    if await self._refresh_summary(dossier, agent):
+                        self._dirty.add(key)
+                        summarized += 1
+                except Exception as e:
+                    activity.log("Failed to summarize {}: {}", dossier.get('name'), e)
+            
+            await self._flush_dossiers(storage)
+            activity.log("Merged {} duplicate entities, refreshed {} summaries", merged, summarized)
+            await self.complete_activity(activity, {"merged": merged, "summarized": summarized})
         except Exception as e:
             await self.fail_activity(activity, f"Failed to consolidate dossiers: {e}")
     
@@ -2,6 +2,7 @@
 
 from typing import TYPE_CHECKING, Any
 from .base import Behavior
+from ..logging import level_enabled
 
 if TYPE_CHECKING:
     from ..agent.core import A1
@@ -23,7 +24,8 @@ Be concise and focus on completing the user's request efficiently.
         """Add planning context to prompts"""
         # For complex prompts, we could add planning instructions
         # For now, just pass through
-        self.logger.info(f"Pre-processing prompt: {prompt}")
+        if level_enabled("DEBUG"):
+            self.logger.debug("Pre-processing prompt ({} chars): {:.200}", len(prompt), prompt)
         return prompt
     
     async def post_process(self, response: str, agent: "A1") -> str:
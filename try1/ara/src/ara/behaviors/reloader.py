@@ -0,0 +1,182 @@
+"""Hot reloading of behavior modules for running agents"""
+
+import asyncio
+import importlib
+import inspect
+import sys
+import weakref
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Set
+
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
+
+from .base import Behavior
+from ..logging import get_logger
+
+if TYPE_CHECKING:
+    from ..agent.core import A1
+
+
+class _ChangeHandler(FileSystemEventHandler):
+    """Forwards Python file changes from the watchdog thread to the event loop"""
+
+    def __init__(self, reloader: "BehaviorReloader"):
+        self.reloader = reloader
+
+    def on_modified(self, event) -> None:
+        if not event.is_directory and event.src_path.endswith(".py"):
+            self.reloader.notify_changed(Path(event.src_path))
+
+    on_created = on_modified
+
+
+class BehaviorReloader:
+    """Watches behavior source files and swaps changed behaviors into attached agents
+
+    One reloader serves every agent in the process (see get_reloader), so a
+    server with many live sessions watches each directory once and reloads a
+    module once per change, then replaces the behavior in every agent using it.
+    """
+
+    def __init__(self, debounce: float = 0.5):
+        self.debounce = debounce
+        self.logger = get_logger(__name__, context="reloader")
+        self._agents: "weakref.WeakSet[A1]" = weakref.WeakSet()
+        self._observer: Optional[Observer] = None
+        self._watched: Set[Path] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: Dict[Path, asyncio.TimerHandle] = {}
+
+    def attach(self, agent: "A1") -> None:
+        """Start hot reloading behaviors of an agent"""
+        self._loop = asyncio.get_running_loop()
+        self._agents.add(agent)
+        for behavior in agent.behavior_manager.behaviors.values():
+            self._watch(Path(inspect.getfile(type(behavior))).parent)
+
+    def detach(self, agent: "A1") -> None:
+        """Stop hot reloading an agent; the watcher stops with the last agent"""
+        self._agents.discard(agent)
+        if not self._agents:
+            self.stop()
+
+    def _watch(self, directory: Path) -> None:
+        if directory in self._watched:
+            return
+        if self._observer is None:
+            self._observer = Observer()
+            self._observer.daemon = True
+            self._observer.start()
+        self._observer.schedule(_ChangeHandler(self), str(directory), recursive=False)
+        self._watched.add(directory)
+        self.logger.info(f"Watching {directory} for behavior changes")
+
+    def stop(self) -> None:
+        """Stop watching files"""
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+        self._watched.clear()
+
+    def notify_changed(self, path: Path) -> None:
+        """Called from the watchdog thread when a file changes"""
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._schedule, path.resolve())
+
+    def _schedule(self, path: Path) -> None:
+        # Editors often write a file several times in a row; reload once
+        handle = self._pending.pop(path, None)
+        if handle:
+            handle.cancel()
+        self._pending[path] = self._loop.call_later(
+            self.debounce, lambda: asyncio.ensure_future(self.reload_path(path))
+        )
+
+    def _behavior_modules(self) -> Set[str]:
+        """Modules defining the class of a behavior registered in an attached agent"""
+        return {
+            type(behavior).__module__
+            for agent in list(self._agents)
+            for behavior in agent.behavior_manager.behaviors.values()
+        }
+
+    async def reload_path(self, path: Path) -> List[str]:
+        """Reload the module at path and replace its behaviors in all attached agents
+
+        Only modules defining a registered behavior are reloaded; other files in
+        watched directories (the behavior framework itself, helpers) are skipped,
+        as reloading them would leave live objects referring to stale classes.
+        """
+        self._pending.pop(path, None)
+        module = next(
+            (
+                m for m in list(sys.modules.values())
+                if getattr(m, "__file__", None) and Path(m.__file__).resolve() == path
+            ),
+            None
+        )
+        if module is None:
+            return []
+        if module.__name__ not in self._behavior_modules():
+            self.logger.debug(f"Not reloading {module.__name__}: defines no registered behavior")
+            return []
+
+        try:
+            module = importlib.reload(module)
+        except Exception as e:
+            self.logger.error(f"Failed to reload {module.__name__}, keeping current behaviors: {e}")
+            return []
+
+        replaced = []
+        for agent in list(self._agents):
+            manager = agent.behavior_manager
+            for old in list(manager.behaviors.values()):
+                if type(old).__module__ != module.__name__:
+                    continue
+                new_cls = getattr(module, type(old).__name__, None)
+                if new_cls is None or not issubclass(new_cls, Behavior):
+                    continue
+                try:
+                    await manager.replace(self._construct(new_cls, old))
+                    replaced.append(old.name)
+                except Exception as e:
+                    self.logger.error(f"Failed to hot reload {old.name}: {e}")
+
+        if replaced:
+            self.logger.info(f"Hot reloaded {module.__name__}: {', '.join(sorted(set(replaced)))}")
+        return replaced
+
+    @staticmethod
+    def _construct(new_cls: type, old: Behavior) -> Behavior:
+        """Instantiate the reloaded class with the old configuration; state comes over later via migrate_state"""
+        try:
+            behavior = new_cls()
+            if behavior.name == old.name:
+                behavior.apply_config(old)
+                return behavior
+        except TypeError:
+            pass
+        
+        # Constructor needs arguments (or names the behavior differently): build a
+        # bare instance with the old identity and a copy of all its attributes,
+        # since there are no new defaults to keep
+        behavior = new_cls.__new__(new_cls)
+        Behavior.__init__(behavior, old.name, old.version)
+        vars(behavior).update(
+            (key, value) for key, value in vars(old).items()
+            if key not in Behavior._NON_STATE_ATTRIBUTES
+        )
+        return behavior
+
+
+_reloader: Optional[BehaviorReloader] = None
+
+
+def get_reloader() -> BehaviorReloader:
+    """Get the process-wide behavior reloader"""
+    global _reloader
+    if _reloader is None:
+        _reloader = BehaviorReloader()
+    return _reloader
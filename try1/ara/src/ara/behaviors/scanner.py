@@ -0,0 +1,138 @@
+"""Shared keyword/pattern scanner that behaviors subscribe to"""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+@dataclass(frozen=True)
+class PatternMatch:
+    """A single match of a registered pattern group"""
+    subscriber: str
+    group: str
+    text: str
+    start: int
+    end: int
+
+
+class PatternScanner:
+    """Compiles every registered keyword into one regex run once per message
+
+    Behaviors register named groups of keywords (or raw regexes) under their
+    own subscriber name. All keywords are combined into a single alternation,
+    so scanning a message is one pass regardless of how many behaviors or
+    keywords are registered. Matches are grouped by subscriber for dispatch.
+    
+    Keywords behave like `keyword in text.lower()`: each one is reported at
+    most once per message (at its first occurrence), and overlapping keywords
+    do not hide each other ("help" is found in "helpful" even when "helpful"
+    is registered too). A keyword registered by several subscribers is
+    reported to each of them. Raw regexes are compiled into a second pass,
+    run only if any are registered, and report every match.
+    """
+
+    def __init__(self):
+        # lowercased keyword -> (subscriber, group) pairs interested in it
+        self._keywords: Dict[str, Set[Tuple[str, str]]] = {}
+        # (subscriber, group) -> list of regex sources
+        self._patterns: Dict[Tuple[str, str], List[str]] = {}
+        self._compiled: Optional[Tuple[Optional[re.Pattern], Optional[re.Pattern]]] = None
+        # keyword -> registered keywords it starts with (itself included), longest first
+        self._prefixes: Dict[str, List[str]] = {}
+        # regex group name -> (subscriber, group)
+        self._group_names: Dict[str, Tuple[str, str]] = {}
+
+    def register(
+        self,
+        subscriber: str,
+        group: str,
+        keywords: Iterable[str] = (),
+        patterns: Iterable[str] = ()
+    ) -> None:
+        """Register keywords (matched anywhere in the text, case-insensitive) and/or regexes
+        
+        Raw regexes must only use non-capturing groups.
+        """
+        for keyword in keywords:
+            self._keywords.setdefault(keyword.lower(), set()).add((subscriber, group))
+        patterns = list(patterns)
+        if patterns:
+            self._patterns.setdefault((subscriber, group), []).extend(patterns)
+        self._compiled = None
+
+    def unregister(self, subscriber: str) -> None:
+        """Remove every keyword and pattern group registered by a subscriber"""
+        for keyword in list(self._keywords):
+            self._keywords[keyword] = {k for k in self._keywords[keyword] if k[0] != subscriber}
+            if not self._keywords[keyword]:
+                del self._keywords[keyword]
+        for key in [k for k in self._patterns if k[0] == subscriber]:
+            del self._patterns[key]
+        self._compiled = None
+
+    @property
+    def subscribers(self) -> List[str]:
+        keys = set(self._patterns)
+        for interested in self._keywords.values():
+            keys.update(interested)
+        return sorted({subscriber for subscriber, _ in keys})
+
+    def _compile(self) -> Tuple[Optional[re.Pattern], Optional[re.Pattern]]:
+        if self._compiled is None:
+            keywords = None
+            if self._keywords:
+                # A lookahead tries every position, so keywords starting inside
+                # another match are found; longest first so the one matched at a
+                # position tells which shorter keywords also start there
+                words = sorted(self._keywords, key=len, reverse=True)
+                keywords = re.compile(f"(?=({'|'.join(map(re.escape, words))}))", re.IGNORECASE)
+                self._prefixes = {w: [p for p in words if w.startswith(p)] for w in words}
+
+            alternatives = []
+            self._group_names = {}
+            for i, (key, sources) in enumerate(self._patterns.items()):
+                if not sources:
+                    continue
+                name = f"g{i}"
+                self._group_names[name] = key
+                alternatives.append(f"(?P<{name}>{'|'.join(sources)})")
+            patterns = re.compile("|".join(alternatives), re.IGNORECASE) if alternatives else None
+            self._compiled = (keywords, patterns)
+        return self._compiled
+
+    def scan(self, text: str) -> Dict[str, List[PatternMatch]]:
+        """Scan text once and return matches grouped by subscriber, in text order"""
+        keywords, patterns = self._compile()
+        found: List[Tuple[Tuple[str, str], str, int, int]] = []
+        if not text:
+            return {}
+
+        if keywords is not None:
+            seen: Set[str] = set()
+            for m in keywords.finditer(text):
+                start = m.start()
+                for keyword in self._prefixes.get(m.group(1).lower(), ()):
+                    if keyword in seen:
+                        continue
+                    seen.add(keyword)
+                    end = start + len(keyword)
+                    for target in self._keywords[keyword]:
+                        found.append((target, text[start:end], start, end))
+                if len(seen) == len(self._keywords):
+                    break
+
+        if patterns is not None:
+            for m in patterns.finditer(text):
+                found.append((self._group_names[m.lastgroup], m.group(), m.start(), m.end()))
+
+        results: Dict[str, List[PatternMatch]] = {}
+        for (subscriber, group), matched, start, end in sorted(found, key=lambda f: f[2]):
+            results.setdefault(subscriber, []).append(PatternMatch(subscriber, group, matched, start, end))
+        return results
+
+    def count(self, text: str, subscriber: str, group: Optional[str] = None) -> int:
+        """Count matches in text for one subscriber (optionally one group)"""
+        return sum(
+            1 for m in self.scan(text).get(subscriber, [])
+            if group is None or m.group == group
+        )
@@ -1,9 +1,11 @@
 """User modeling behavior that maintains user profile and preferences"""
 
 import json
-from typing import TYPE_CHECKING, Dict, Any, List
+from typing import TYPE_CHECKING, Dict, Any, List, Optional
 from datetime import datetime
 from ..behaviors.base import Behavior, Activity
+from ..llm import utils as llm
+from ..storage.user_model import UserModel, UserModelStore, RecentTopic
 
 if TYPE_CHECKING:
     from ..agent.core import A1
@@ -12,58 +14,40 @@ if TYPE_CHECKING:
 class UserModelingBehavior(Behavior):
     """Behavior that tracks and models user personality, preferences, and context"""
     
-    def __init__(self):
+    state_fields = ("user_interactions_count", "store")
+    config_fields = ("update_threshold", "analysis_turns", "analysis_max_chars", "persist_debounce")
+    
+    def __init__(self, persist_debounce: float = 2.0):
         super().__init__("user-modeling", version="0.1.1")
         self.user_interactions_count = 0
         self.update_threshold = 5  # Update model every N interactions
+        self.analysis_turns = 20  # Recent turns considered by the analysis
+        self.analysis_max_chars = 3000
+        self.persist_debounce = persist_debounce
+        self.store: Optional[UserModelStore] = None
+    
+    @property
+    def model(self) -> UserModel:
+        """The shared in-memory user model (read by other behaviors without disk access)"""
+        if self.store is None:
+            raise RuntimeError("User model not initialized")
+        return self.store.model
         
     async def initialize(self, agent: "A1") -> None:
-        """Initialize user model structure"""
-        # Ensure user_model directory exists
-        user_model_path = agent.path / "user_model"
-        user_model_path.mkdir(exist_ok=True)
-        
-        # Initialize default files if they don't exist
-        default_files = {
-            "personality_traits": {
-                "openness": 0.5,
-                "conscientiousness": 0.5,
-                "extraversion": 0.5,
-                "agreeableness": 0.5,
-                "neuroticism": 0.5,
-                "traits": [],
-                "last_updated": datetime.now().isoformat()
-            },
-            "communication_preferences": {
-                "formality_level": "neutral",
-                "preferred_length": "balanced",
-                "technical_depth": "moderate",
-                "response_style": "conversational",
-                "observed_patterns": []
-            },
-            "dislikes": {
-                "topics": [],
-                "approaches": [],
-                "patterns": []
-            },
-            "inferred_traits": {
-                "interests": [],
-                "expertise_areas": [],
-                "communication_style": {},
-                "behavioral_patterns": []
-            },
-            "contextual_state": {
-                "current_goal": None,
-                "emotional_state": "neutral",
-                "recent_topics": [],
-                "session_start": datetime.now().isoformat()
-            }
-        }
-        
-        for filename, default_content in default_files.items():
-            file_path = user_model_path / f"{filename}.yaml"
-            if not file_path.exists():
-                await agent.storage.save_yaml("user_model", filename, default_content)
+        """Load the user model into memory, creating default files if missing"""
+        await self._ensure_store(agent)
+    
+    async def _ensure_store(self, agent: "A1") -> UserModelStore:
+        """Create and load the user model store on first use"""
+        if self.store is None:
+            self.store = UserModelStore(agent.storage, debounce=self.persist_debounce)
+        await self.store.load()
+        return self.store
+    
+    async def shutdown(self, agent: "A1") -> None:
+        """Persist outstanding user model changes"""
+        if self.store:
+            await self.store.close()
     
     async def on_user_message(self, message: str, agent: "A1") -> None:
         """Analyze user message and update model"""
@@ -72,19 +56,17 @@ class UserModelingBehavior(Behavior):
         # Update contextual state
         activity = await self.create_activity("update_contextual_state")
         try:
-            contextual_state = await agent.storage.load_yaml("user_model", "contextual_state") or {}
+            store = await self._ensure_store(agent)
+            contextual_state = store.model.contextual_state
             
-            # Add to recent topics
-            if "recent_topics" not in contextual_state:
-                contextual_state["recent_topics"] = []
-            contextual_state["recent_topics"].append({
-                "message": message[:100],  # First 100 chars
-                "timestamp": datetime.now().isoformat()
-            })
-            # Keep only last 10 topics
-            contextual_state["recent_topics"] = contextual_state["recent_topics"][-10:]
+            # Add to recent topics, keeping only the last 10
+            contextual_state.recent_topics.append(RecentTopic(
+                message=message[:100],  # First 100 chars
+                timestamp=datetime.now().isoformat()
+            ))
+            contextual_state.recent_topics = contextual_state.recent_topics[-10:]
             
-            await agent.storage.save_yaml("user_model", "contextual_state", contextual_state)
+            store.mark_changed("contextual_state")
             await self.complete_activity(activity, "Updated contextual state")
             
         except Exception as e:
@@ -102,16 +84,13 @@ class UserModelingBehavior(Behavior):
         try:
             activity.log("Starting comprehensive user analysis")
             
-            # Get recent conversation history
-            recent_convos = await agent.storage.list_files("episodic", "conversation_*.md")
-            recent_convos = sorted(recent_convos)[-5:]  # Last 5 conversations
-            
-            # Build analysis prompt
-            conversation_text = ""
-            for conv_path in recent_convos:
-                content = await agent.storage.load_markdown("episodic", conv_path.stem)
-                if content:
-                    conversation_text += f"\n\n{content}"
+            # Get the most recent turns across sessions from the conversation
+            # catalog, reading only the bytes that fit the analysis budget
+            recent_turns = await agent.storage.catalog.recent_turns(
+                self.analysis_turns,
+                max_bytes=self.analysis_max_chars
+            )
+            conversation_text = "".join(turn["content"] for turn in recent_turns)
             
             if not conversation_text:
                 activity.log("No conversation history to analyze")
@@ -126,7 +105,7 @@ class UserModelingBehavior(Behavior):
 4. Any patterns or preferences
 
 Conversations:
-{conversation_text[:3000]}  # Limit to 3000 chars
+{conversation_text[:self.analysis_max_chars]}
 
 Provide a structured analysis in JSON format with these keys:
 - personality_updates: dict of trait scores (0-1)
@@ -135,9 +114,16 @@ Provide a structured analysis in JSON format with these keys:
 - inferred_traits: list of behavioral traits
 """
             
-            # Make LLM call for analysis
+            # Make LLM call for analysis out of band: this runs in on_user_message,
+            # possibly deferred past the turn, so it must not run a nested agent
+            # turn that appends to (and races with) agent.messages
             activity.log("Calling LLM for user analysis")
-            analysis_response = await agent.ago(analysis_prompt)
+            analysis_response = await llm.complete(
+                analysis_prompt,
+                model=agent.llm,
+                client=agent.llm_client,
+                temperature=0.3
+            )
             
             # Parse and update user model
             try:
@@ -149,7 +135,7 @@ Provide a structured analysis in JSON format with these keys:
                     await self._apply_analysis_updates(agent, analysis_data)
                     activity.log("Successfully updated user model")
             except Exception as e:
-                activity.log(f"Failed to parse analysis: {e}")
+                activity.log("Failed to parse analysis: {}", e)
             
             await self.complete_activity(activity, "User model updated")
             
@@ -157,35 +143,38 @@ Provide a structured analysis in JSON format with these keys:
             await self.fail_activity(activity, str(e))
     
     async def _apply_analysis_updates(self, agent: "A1", analysis: Dict[str, Any]) -> None:
-        """Apply analysis results to user model files"""
+        """Apply analysis results to the user model"""
+        store = await self._ensure_store(agent)
+        
         # Update personality traits
         if "personality_updates" in analysis:
-            traits = await agent.storage.load_yaml("user_model", "personality_traits") or {}
+            traits = store.model.personality_traits
             for trait, score in analysis["personality_updates"].items():
-                if trait in traits:
+                current = getattr(traits, trait, None)
+                if isinstance(current, (int, float)):
                     # Weighted average with existing score
-                    traits[trait] = (traits[trait] * 0.7 + score * 0.3)
-            traits["last_updated"] = datetime.now().isoformat()
-            await agent.storage.save_yaml("user_model", "personality_traits", traits)
+                    setattr(traits, trait, current * 0.7 + score * 0.3)
+            traits.last_updated = datetime.now().isoformat()
+            store.mark_changed("personality_traits")
         
         # Update interests
         if "new_interests" in analysis:
-            inferred = await agent.storage.load_yaml("user_model", "inferred_traits") or {}
-            if "interests" not in inferred:
-                inferred["interests"] = []
+            inferred = store.model.inferred_traits
             # Add new interests, avoid duplicates
             for interest in analysis["new_interests"]:
-                if interest not in inferred["interests"]:
-                    inferred["interests"].append(interest)
-            await agent.storage.save_yaml("user_model", "inferred_traits", inferred)
+                if interest not in inferred.interests:
+                    inferred.interests.append(interest)
+            store.mark_changed("inferred_traits")
     
     async def get_user_personality_traits(self, agent: "A1") -> Dict[str, Any]:
         """Get current personality traits"""
-        return await agent.storage.load_yaml("user_model", "personality_traits") or {}
+        store = await self._ensure_store(agent)
+        return store.model.personality_traits.model_dump()
     
     async def get_user_context(self, agent: "A1") -> Dict[str, Any]:
         """Get current user context"""
-        return await agent.storage.load_yaml("user_model", "contextual_state") or {}
+        store = await self._ensure_store(agent)
+        return store.model.contextual_state.model_dump()
     
     async def pre_process(self, prompt: str, agent: "A1") -> str:
         """Add user context to prompts if relevant"""
@@ -202,19 +191,22 @@ Provide a structured analysis in JSON format with these keys:
         activity = await self.create_activity("periodic_user_model_maintenance")
         
         try:
-            # Clean up old contextual data
-            contextual_state = await agent.storage.load_yaml("user_model", "contextual_state") or {}
+            store = await self._ensure_store(agent)
+            contextual_state = store.model.contextual_state
             
             # Remove old topics (older than 24 hours)
-            if "recent_topics" in contextual_state:
-                cutoff = datetime.now().timestamp() - 86400  # 24 hours
-                contextual_state["recent_topics"] = [
-                    topic for topic in contextual_state["recent_topics"]
-                    if datetime.fromisoformat(topic["timestamp"]).timestamp() > cutoff
-                ]
+            cutoff = datetime.now().timestamp() - 86400  # 24 hours
+            recent = [
+                topic for topic in contextual_state.recent_topics
+                if datetime.fromisoformat(topic.timestamp).timestamp() > cutoff
+            ]
+            
+            # Only mark dirty (and persist) when something actually expired
+            if len(recent) != len(contextual_state.recent_topics):
+                contextual_state.recent_topics = recent
+                store.mark_changed("contextual_state")
             
-            await agent.storage.save_yaml("user_model", "contextual_state", contextual_state)
             await self.complete_activity(activity, "Maintenance completed")
             
         except Exception as e:
-            await self.fail_activity(activity, str(e))
\ No newline at end of file
+            await self.fail_activity(activity, str(e))
@@ -0,0 +1,149 @@
+"""In-process event bus that lets UIs react to agent state changes instead of polling"""
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional
+
+from .logging import get_logger, log_session
+
+# Event kinds published by the agent, its behaviors and its metrics
+ACTIVITY_STARTED = "activity.started"
+ACTIVITY_FINISHED = "activity.finished"
+ACTIVITY_LOGGED = "activity.logged"
+BEHAVIOR_CHANGED = "behavior.changed"
+MESSAGE_APPENDED = "message.appended"
+METRIC_RECORDED = "metric.recorded"
+SESSION_STARTED = "session.started"
+SESSION_ENDED = "session.ended"
+TOOL_CALLED = "tool.called"
+
+
+@dataclass(slots=True)
+class Event:
+    """Something changed in an agent; data holds a few identifying fields, not full state"""
+    kind: str
+    data: Dict[str, Any]
+    session: Optional[str] = None
+    timestamp: float = field(default_factory=time.time)
+
+
+@dataclass(eq=False)
+class EventSubscription:
+    """A subscriber and the events it wants
+
+    kinds=None matches every kind. With a session, only that session's events
+    and session-less (process-wide) events are delivered.
+    """
+    callback: Callable[[Event], None]
+    kinds: Optional[FrozenSet[str]] = None
+    session: Optional[str] = None
+
+    def matches(self, event: Event) -> bool:
+        if self.kinds is not None and event.kind not in self.kinds:
+            return False
+        return self.session is None or event.session is None or event.session == self.session
+
+
+class EventBus:
+    """Synchronous publish/subscribe for the process
+
+    Callbacks run in the publisher's thread and must be cheap (typically they
+    mark a view dirty, see CoalescedRenderer). With no subscribers, publish()
+    returns right away, so publishing on hot paths costs nothing when no UI
+    is attached.
+    """
+
+    def __init__(self):
+        self._subscriptions: List[EventSubscription] = []
+        self._lock = threading.Lock()
+        self.logger = get_logger(__name__, context="events")
+
+    @property
+    def active(self) -> bool:
+        return bool(self._subscriptions)
+
+    def subscribe(
+        self,
+        callback: Callable[[Event], None],
+        kinds: Optional[Iterable[str]] = None,
+        session: Optional[str] = None
+    ) -> EventSubscription:
+        subscription = EventSubscription(callback, frozenset(kinds) if kinds is not None else None, session)
+        with self._lock:
+            # Copy on write so publish() can iterate without the lock
+            self._subscriptions = self._subscriptions + [subscription]
+        return subscription
+
+    def unsubscribe(self, subscription: EventSubscription) -> None:
+        with self._lock:
+            self._subscriptions = [s for s in self._subscriptions if s is not subscription]
+
+    def publish(self, kind: str, **data: Any) -> None:
+        """Deliver an event, tagged with the session of the current context"""
+        subscriptions = self._subscriptions
+        if not subscriptions:
+            return
+        event = Event(kind, data, log_session.get())
+        for subscription in subscriptions:
+            if subscription.matches(event):
+                try:
+                    subscription.callback(event)
+                except Exception as e:
+                    self.logger.error(f"Event subscriber failed on {kind}: {e}")
+
+
+class CoalescedRenderer:
+    """Calls render at most max_rate times a second, and only after mark_dirty()
+
+    Any number of mark_dirty() calls between two renders result in a single
+    render; nothing runs while nothing changes. mark_dirty() may be called
+    from any thread; render runs on the event loop the renderer was created on.
+    """
+
+    def __init__(self, render: Callable[[], None], max_rate: float = 4.0):
+        self.render = render
+        self.min_interval = 1.0 / max_rate
+        self._loop = asyncio.get_running_loop()
+        self._handle: Optional[asyncio.Handle] = None
+        self._last_render = 0.0
+        self._closed = False
+        self.logger = get_logger(__name__, context="events")
+
+    def mark_dirty(self) -> None:
+        if self._closed:
+            return
+        try:
+            on_loop = asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            on_loop = False
+        if not on_loop:
+            self._loop.call_soon_threadsafe(self.mark_dirty)
+            return
+        if self._handle is not None:
+            return
+        delay = max(0.0, self._last_render + self.min_interval - self._loop.time())
+        self._handle = self._loop.call_later(delay, self._flush)
+
+    def mark_dirty_later(self, delay: float) -> None:
+        """Render again after delay, e.g. to advance a running timer"""
+        self._loop.call_later(delay, self.mark_dirty)
+
+    def _flush(self) -> None:
+        self._handle = None
+        self._last_render = self._loop.time()
+        try:
+            self.render()
+        except Exception as e:
+            self.logger.error(f"Render failed: {e}")
+
+    def cancel(self) -> None:
+        """Stop rendering for good (e.g. when the view goes away)"""
+        self._closed = True
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+
+event_bus = EventBus()
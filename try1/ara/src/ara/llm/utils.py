@@ -6,11 +6,15 @@ Provides common functionality for making LLM requests across the system.
 
 import json
 import os
+import time
 from typing import Dict, List, Any, Optional, Literal
 from dataclasses import dataclass
 
 import httpx
 
+from ..monitoring.metrics import llm_origin, record_llm_usage
+from ..monitoring.tracing import tracer
+
 
 @dataclass
 class LLMResponse:
@@ -70,15 +74,29 @@ class LLMClient:
             data["tools"] = tools
             data["tool_choice"] = tool_choice or "auto"
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/chat/completions",
-                json=data,
-                headers=headers,
-                timeout=60.0
-            )
-            response.raise_for_status()
-            result = response.json()
+        if "openrouter.ai" in self.base_url:
+            # Ask OpenRouter to report cost alongside token counts
+            data.setdefault("usage", {"include": True})
+        
+        # Usage is recorded against the calling agent and behavior (see monitoring.metrics)
+        start = time.perf_counter()
+        with tracer.span("llm.request", model=data["model"], origin=llm_origin.get()) as span:
+            try:
+                async with httpx.AsyncClient() as client:
+                    response = await client.post(
+                        f"{self.base_url}/chat/completions",
+                        json=data,
+                        headers=headers,
+                        timeout=60.0
+                    )
+                    response.raise_for_status()
+                    result = response.json()
+            except Exception:
+                record_llm_usage(data["model"], None, time.perf_counter() - start, success=False)
+                raise
+            record_llm_usage(result.get("model", data["model"]), result.get("usage"), time.perf_counter() - start)
+            if span:
+                span.set_attributes(**(result.get("usage") or {}))
         
         # Extract content
         choice = result["choices"][0]
@@ -138,22 +156,24 @@ async def complete(
     prompt: str,
     system: Optional[str] = None,
     model: Optional[str] = None,
+    client: Optional[LLMClient] = None,
     **kwargs
 ) -> str:
-    """Simple completion with string prompt"""
+    """Simple completion with string prompt (default client unless one is given)"""
     messages = []
     if system:
         messages.append({"role": "system", "content": system})
     messages.append({"role": "user", "content": prompt})
     
-    client = get_default_client()
+    client = client or get_default_client()
     response = await client.complete(messages, model=model, **kwargs)
     return response.content
 
 
 async def extract_entities(
     text: str,
-    model: str = "gpt-4o-mini"
+    model: str = "gpt-4o-mini",
+    client: Optional[LLMClient] = None
 ) -> List[Dict[str, Any]]:
     """Extract entities from text using LLM"""
     
@@ -173,7 +193,7 @@ async def extract_entities(
     ]
     """
     try:
-        client = get_default_client()
+        client = client or get_default_client()
         response = await client.complete_json(
             [{"role": "user", "content": prompt}],
             model=model,
@@ -189,7 +209,8 @@ async def extract_entities(
 async def summarize(
     text: str,
     max_length: int = 200,
-    model: str = "gpt-4o-mini"
+    model: str = "gpt-4o-mini",
+    client: Optional[LLMClient] = None
 ) -> str:
     """Summarize text using LLM"""
     
@@ -199,4 +220,4 @@ async def summarize(
     {text}
     """
     
-    return await complete(prompt, model=model, temperature=0.5)
\ No newline at end of file
+    return await complete(prompt, model=model, client=client, temperature=0.5)
\ No newline at end of file
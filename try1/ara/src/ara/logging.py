@@ -1,18 +1,36 @@
 """Centralized logging configuration for ARA"""
 
+import atexit
+import gzip
+import json
+import os
+import queue
+import shutil
 import sys
+import time
+import traceback
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Dict, List, Any, Callable
-from datetime import datetime
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional, Dict, List, Any, Callable, Deque, Tuple, Union
+from datetime import datetime, timedelta
 from loguru import logger
 import threading
 
 
 class LogMessage:
     """Represents a structured log message"""
-    def __init__(self, record: Dict[str, Any]):
+    
+    __slots__ = ("seq", "time", "level", "levelno", "message", "module", "function", "line",
+                 "behavior", "activity", "context", "session")
+    
+    def __init__(self, record: Dict[str, Any], seq: int = 0):
+        self.seq = seq
         self.time = record["time"]
         self.level = record["level"].name
+        self.levelno = getattr(record["level"], "no", 0)
         self.message = record["message"]
         self.module = record["module"]
         self.function = record["function"]
@@ -22,6 +40,7 @@ class LogMessage:
         self.behavior = record["extra"].get("behavior", None)
         self.activity = record["extra"].get("activity", None)
         self.context = record["extra"].get("context", "system")
+        self.session = record["extra"].get("session", None)
         
     def formatted(self) -> str:
         """Get formatted message"""
@@ -37,60 +56,149 @@ class LogMessage:
         return f"[{timestamp}] {prefix} {self.message}"
 
 
+@dataclass(eq=False)
+class LogSubscription:
+    """A filtered stream of log messages delivered to a callback"""
+    callback: Callable[[LogMessage], None]
+    behavior: Optional[str] = None
+    activity: Optional[str] = None
+    context: Optional[str] = None
+    min_level: int = 0
+    session: Optional[str] = None
+    
+    def matches(self, msg: LogMessage) -> bool:
+        return (
+            msg.levelno >= self.min_level
+            and (self.behavior is None or msg.behavior == self.behavior)
+            and (self.activity is None or msg.activity == self.activity)
+            and (self.context is None or msg.context == self.context)
+            and (self.session is None or msg.session == self.session)
+        )
+
+
+# LogMessage attributes with a secondary index
+_INDEXED_FIELDS = ("behavior", "activity", "context", "session")
+
+
 class LogRouter:
-    """Routes logs to multiple destinations with filtering"""
+    """Routes logs to filtered subscribers and keeps a recent, indexed buffer
     
-    def __init__(self):
-        self.tui_handler: Optional[Callable] = None
-        self.log_buffer: List[LogMessage] = []
-        self.max_buffer_size = 1000
+    The buffer is a ring of the last `max_buffer_size` messages. Each message
+    is also appended to per-value indexes (by behavior, activity and context);
+    since the ring evicts oldest first, an evicted message is always at the
+    front of its index queues, so eviction and insertion are O(1) and a
+    filtered query only walks the messages of the most selective index.
+    """
+    
+    def __init__(self, max_buffer_size: int = 1000):
+        self.max_buffer_size = max_buffer_size
+        self.log_buffer: Deque[LogMessage] = deque()
+        self._indexes: Dict[str, Dict[str, Deque[LogMessage]]] = {name: {} for name in _INDEXED_FIELDS}
+        self._subscriptions: List[LogSubscription] = []
+        self._seq = 0
+        # Interactive UIs own the terminal while active; console output is muted meanwhile
+        self._console_mutes = 0
         self._lock = threading.Lock()
+    
+    @property
+    def console_enabled(self) -> bool:
+        return self._console_mutes == 0
+    
+    def mute_console(self) -> None:
+        """Suppress console log output (e.g. while a full-screen UI is running)"""
+        self._console_mutes += 1
+    
+    def unmute_console(self) -> None:
+        self._console_mutes = max(0, self._console_mutes - 1)
+    
+    def subscribe(
+        self,
+        callback: Callable[[LogMessage], None],
+        behavior: Optional[str] = None,
+        activity: Optional[str] = None,
+        context: Optional[str] = None,
+        min_level: Union[int, str] = 0,
+        session: Optional[str] = None
+    ) -> LogSubscription:
+        """Deliver new messages matching the filters to callback
         
-    def set_tui_handler(self, handler: Callable) -> None:
-        """Set the TUI log handler"""
-        self.tui_handler = handler
-        
-    def remove_tui_handler(self) -> None:
-        """Remove the TUI log handler"""
-        self.tui_handler = None
+        Callbacks run on the logging thread and must be quick (hand off to
+        their own loop or thread as needed).
+        """
+        if isinstance(min_level, str):
+            min_level = logger.level(min_level).no
+        subscription = LogSubscription(callback, behavior, activity, context, min_level, session)
+        with self._lock:
+            self._subscriptions = [*self._subscriptions, subscription]
+        return subscription
+    
+    def unsubscribe(self, subscription: LogSubscription) -> None:
+        with self._lock:
+            self._subscriptions = [s for s in self._subscriptions if s is not subscription]
         
     def add_message(self, record: Dict[str, Any]) -> None:
         """Add a log message to the buffer and route it"""
-        msg = LogMessage(record)
-        
         with self._lock:
-            # Add to buffer
+            self._seq += 1
+            msg = LogMessage(record, self._seq)
+            
+            if len(self.log_buffer) >= self.max_buffer_size:
+                self._evict(self.log_buffer.popleft())
             self.log_buffer.append(msg)
-            if len(self.log_buffer) > self.max_buffer_size:
-                self.log_buffer.pop(0)
+            for name in _INDEXED_FIELDS:
+                value = getattr(msg, name)
+                if value is not None:
+                    index = self._indexes[name].get(value)
+                    if index is None:
+                        index = self._indexes[name][value] = deque()
+                    index.append(msg)
             
-            # Route to TUI if available
-            if self.tui_handler:
+            subscriptions = self._subscriptions
+        
+        for subscription in subscriptions:
+            if subscription.matches(msg):
                 try:
-                    self.tui_handler(msg)
+                    subscription.callback(msg)
                 except Exception:
-                    pass  # Don't let TUI errors break logging
+                    pass  # Don't let subscriber errors break logging
+    
+    def _evict(self, msg: LogMessage) -> None:
+        for name in _INDEXED_FIELDS:
+            value = getattr(msg, name)
+            if value is None:
+                continue
+            index = self._indexes[name][value]
+            index.popleft()
+            if not index:
+                del self._indexes[name][value]
     
     def get_filtered_logs(self, behavior: Optional[str] = None, 
                          activity: Optional[str] = None,
                          context: Optional[str] = None,
-                         limit: int = 100) -> List[LogMessage]:
-        """Get filtered logs from the buffer"""
+                         limit: int = 100,
+                         session: Optional[str] = None) -> List[LogMessage]:
+        """Get the most recent matching logs from the buffer, oldest first"""
+        filters = {
+            name: value for name, value in
+            (("behavior", behavior), ("activity", activity), ("context", context), ("session", session))
+            if value
+        }
         with self._lock:
+            if not filters:
+                candidates = self.log_buffer
+            else:
+                indexes = [self._indexes[name].get(value) for name, value in filters.items()]
+                if any(index is None for index in indexes):
+                    return []
+                candidates = min(indexes, key=len)
+            
             filtered = []
-            for msg in reversed(self.log_buffer):
-                # Apply filters
-                if behavior and msg.behavior != behavior:
-                    continue
-                if activity and msg.activity != activity:
-                    continue
-                if context and msg.context != context:
-                    continue
-                    
-                filtered.append(msg)
-                if len(filtered) >= limit:
-                    break
-                    
+            for msg in reversed(candidates):
+                if all(getattr(msg, name) == value for name, value in filters.items()):
+                    filtered.append(msg)
+                    if len(filtered) >= limit:
+                        break
+            
             return list(reversed(filtered))
 
 
@@ -98,30 +206,360 @@ class LogRouter:
 log_router = LogRouter()
 
 
-def setup_logging(log_dir: Optional[Path] = None, enable_file_logging: bool = True):
-    """Configure logging for ARA
+# Lowest level any sink accepts; see level_enabled
+_min_levelno = 0
+
+
+@lru_cache(maxsize=None)
+def _levelno(level: str) -> int:
+    return logger.level(level).no
+
+
+def default_level() -> str:
+    """ARA_LOG_LEVEL, else DEBUG when developing (ARA_DEV=1) and INFO otherwise
+    
+    At DEBUG every sink accepts everything, so level_enabled("DEBUG") guards
+    on hot paths never skip any work.
+    """
+    return os.getenv("ARA_LOG_LEVEL") or ("DEBUG" if os.getenv("ARA_DEV") == "1" else "INFO")
+
+
+def level_enabled(level: str) -> bool:
+    """Whether a message at this level would reach any sink
+    
+    Check this before building expensive log arguments on hot paths.
+    """
+    return _levelno(level) >= _min_levelno
+
+
+# Session the current context's log records belong to (set per agent turn/task)
+log_session: ContextVar[Optional[str]] = ContextVar("log_session", default=None)
+
+# Custom format for structured logging
+LOG_FORMAT = (
+    "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | "
+    "<level>{level: <8}</level> | "
+    "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - "
+    "<level>{message}</level>"
+)
+
+
+def _add_session(record: Dict[str, Any]) -> None:
+    """Patcher stamping each record with the session of the context it was logged in"""
+    if "session" not in record["extra"]:
+        session = log_session.get()
+        if session is not None:
+            record["extra"]["session"] = session
+
+
+# Days of per-session log files kept (like the shared files' retention)
+SESSION_LOG_RETENTION_DAYS = 30
+
+
+class _SessionFiles:
+    """Daily log files of one session, rotated at midnight; files older than the retention are deleted"""
+    
+    def __init__(self, log_dir: Path, levelno: int, retention_days: int = SESSION_LOG_RETENTION_DAYS):
+        self.log_dir = log_dir
+        self.levelno = levelno
+        self.retention_days = retention_days
+        self._day: Optional[str] = None
+        self._main = None
+        self._errors = None
+    
+    def write(self, record: Dict[str, Any], line: str) -> None:
+        day = record["time"].strftime("%Y-%m-%d")
+        if day != self._day:
+            self.close()
+            self._day = day
+            self._main = open(self.log_dir / f"ara_{day}.log", "a", encoding="utf-8")
+            self._apply_retention(record["time"])
+        if record["level"].no >= self.levelno:
+            self._main.write(line)
+            self._main.flush()
+        if record["level"].no >= _levelno("ERROR"):
+            if self._errors is None:
+                self._errors = open(self.log_dir / f"ara_errors_{day}.log", "a", encoding="utf-8")
+            self._errors.write(line)
+            self._errors.flush()
+    
+    def _apply_retention(self, now: datetime) -> None:
+        cutoff = (now - timedelta(days=self.retention_days)).strftime("%Y-%m-%d")
+        for path in self.log_dir.glob("ara_*.log"):
+            # ara_<day>.log / ara_errors_<day>.log; the day sorts lexically
+            day = path.stem.rsplit("_", 1)[-1]
+            if day < cutoff:
+                path.unlink(missing_ok=True)
+    
+    def close(self) -> None:
+        for f in (self._main, self._errors):
+            if f is not None:
+                f.close()
+        self._main = self._errors = None
+
+
+class SessionLogRouter:
+    """One loguru sink that writes each session's records to that session's files
+    
+    Sessions register and unregister here instead of adding loguru handlers,
+    so creating an agent never reconfigures the global logging pipeline and
+    does not start another writer thread.
+    """
+    
+    def __init__(self):
+        self._sessions: Dict[str, _SessionFiles] = {}
+        self._lock = threading.Lock()
+    
+    def add(self, session_id: str, log_dir: Path, level: Optional[str] = None) -> None:
+        log_dir.mkdir(parents=True, exist_ok=True)
+        levelno = _levelno(level or default_level())
+        with self._lock:
+            previous = self._sessions.pop(session_id, None)
+            self._sessions[session_id] = _SessionFiles(log_dir, levelno)
+        if previous:
+            previous.close()
+    
+    def remove(self, session_id: str) -> None:
+        with self._lock:
+            files = self._sessions.pop(session_id, None)
+        if files:
+            files.close()
+    
+    def __len__(self) -> int:
+        return len(self._sessions)
+    
+    def sink(self, message) -> None:
+        record = message.record
+        session = record["extra"].get("session")
+        if session is None:
+            return
+        with self._lock:
+            files = self._sessions.get(session)
+            if files:
+                files.write(record, str(message))
+
+
+session_logs = SessionLogRouter()
+
+class JsonlLogSink:
+    """Structured JSON-lines log sink with a background batched writer
+    
+    Records are reduced to plain dicts (time, level, message, source location,
+    behavior/activity/context/session and any other extra fields) and queued;
+    a writer thread appends them in batches, rotating the file when it grows
+    past `max_bytes` or gets older than `max_age` seconds. Rotated files are
+    renamed with a timestamp, optionally gzipped, and only the newest
+    `retention` are kept.
+    """
+    
+    _STOP = object()
+    
+    def __init__(
+        self,
+        path: Path,
+        max_bytes: Optional[int] = 50 * 1024 * 1024,
+        max_age: Optional[float] = 24 * 3600,
+        retention: int = 10,
+        compress: bool = False,
+        batch_size: int = 500,
+        flush_interval: float = 1.0
+    ):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.retention = retention
+        self.compress = compress
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._file = None
+        self._opened_at = 0.0
+        self._thread = threading.Thread(target=self._run, name="ara-jsonl-log", daemon=True)
+        self._thread.start()
+    
+    def __call__(self, message) -> None:
+        """loguru sink: convert the record and hand it to the writer thread"""
+        record = message.record
+        extra = record["extra"]
+        entry = {
+            "time": record["time"].isoformat(),
+            "level": record["level"].name,
+            "message": record["message"],
+            "logger": record["name"],
+            "function": record["function"],
+            "line": record["line"],
+            "behavior": extra.get("behavior"),
+            "activity": extra.get("activity"),
+            "context": extra.get("context", "system"),
+            "session": extra.get("session"),
+        }
+        for key, value in extra.items():
+            entry.setdefault(key, value)
+        if record["exception"] is not None:
+            exc_type, exc_value, exc_traceback = record["exception"]
+            entry["exception"] = "".join(traceback.format_exception(exc_type, exc_value, exc_traceback))
+        self._queue.put(entry)
+    
+    def _run(self) -> None:
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                self._maybe_rotate()
+                continue
+            
+            batch = []
+            while item is not self._STOP:
+                batch.append(json.dumps(item, default=str))
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                self._write(batch)
+            if item is self._STOP:
+                self._close()
+                return
+    
+    def _write(self, lines: List[str]) -> None:
+        self._maybe_rotate()
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+            self._opened_at = time.time()
+        self._file.write("\n".join(lines) + "\n")
+        self._file.flush()
+    
+    def _maybe_rotate(self) -> None:
+        if self._file is None:
+            return
+        too_big = self.max_bytes is not None and self._file.tell() >= self.max_bytes
+        too_old = self.max_age is not None and time.time() - self._opened_at >= self.max_age
+        if too_big or too_old:
+            self.rotate()
+    
+    def rotate(self) -> None:
+        """Close the current file and start a new one (called on the writer thread)"""
+        self._close()
+        if not self.path.exists() or self.path.stat().st_size == 0:
+            return
+        stamp = datetime.now().strftime("%Y-%m-%dT%H-%M-%S-%f")
+        rotated = self.path.with_name(f"{self.path.stem}.{stamp}{self.path.suffix}")
+        os.replace(self.path, rotated)
+        if self.compress:
+            with open(rotated, "rb") as src, gzip.open(f"{rotated}.gz", "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            rotated.unlink()
+        
+        old = sorted(self.path.parent.glob(f"{self.path.stem}.*{self.path.suffix}*"))
+        for stale in old[:-self.retention] if self.retention else old:
+            stale.unlink(missing_ok=True)
+    
+    def _close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+    
+    def stop(self) -> None:
+        """Write everything queued so far and stop the writer thread"""
+        if self._thread.is_alive():
+            self._queue.put(self._STOP)
+            self._thread.join()
+
+
+# path -> (loguru handler id, sink, level); kept across setup_logging reconfigurations
+_json_sinks: Dict[Path, Tuple[int, JsonlLogSink, str]] = {}
+
+
+def add_json_sink(path: Path, level: Optional[str] = None, **options: Any) -> JsonlLogSink:
+    """Write structured JSONL logs to path (once per path; see JsonlLogSink for options)
+    
+    Independent of the text file sinks, and kept when logging is reconfigured.
+    """
+    path = Path(path).resolve()
+    if path in _json_sinks:
+        return _json_sinks[path][1]
+    sink = JsonlLogSink(path, **options)
+    level = level or default_level()
+    handler_id = logger.add(sink, level=level, format="{message}")
+    _json_sinks[path] = (handler_id, sink, level)
+    return sink
+
+
+def remove_json_sink(path: Path) -> None:
+    entry = _json_sinks.pop(Path(path).resolve(), None)
+    if entry:
+        handler_id, sink, _ = entry
+        try:
+            logger.remove(handler_id)
+        except ValueError:
+            pass  # Already removed by a reconfiguration
+        sink.stop()
+
+
+@atexit.register
+def _stop_json_sinks() -> None:
+    for path in list(_json_sinks):
+        remove_json_sink(path)
+
+
+# Arguments of the current configuration; setup_logging is a no-op when unchanged
+_configuration: Optional[Tuple[Any, ...]] = None
+# JSONL sink installed by setup_logging(json_logs=True), as opposed to add_json_sink callers
+_configured_json_path: Optional[Path] = None
+
+
+def setup_logging(
+    log_dir: Optional[Path] = None,
+    enable_file_logging: bool = True,
+    level: Optional[str] = None,
+    json_logs: Optional[bool] = None
+):
+    """Configure process-wide logging for ARA (idempotent)
+    
+    Calling again with the same arguments does nothing, so components may
+    call this freely. Per-session output goes through `session_logs` and
+    never requires reconfiguring.
     
     Args:
-        log_dir: Directory for log files (default: ./logs)
-        enable_file_logging: Whether to enable file logging
+        log_dir: Directory for shared log files (default: ./logs)
+        enable_file_logging: Whether to enable shared file logging
+        level: Lowest level recorded by the router and file sinks
+            (default: see default_level; INFO unless ARA_LOG_LEVEL or ARA_DEV=1)
+        json_logs: Also write structured logs to <log_dir>/ara.jsonl
+            (default: ARA_JSON_LOGS=1); works with or without file logging
     """
-    # Remove any existing handlers
+    global _min_levelno, _configuration, _configured_json_path
+    level = level or default_level()
+    if json_logs is None:
+        json_logs = os.getenv("ARA_JSON_LOGS") == "1"
+    if (enable_file_logging or json_logs) and log_dir is None:
+        log_dir = Path("./logs")
+    if log_dir is not None:
+        log_dir = Path(log_dir)
+    configuration = (
+        log_dir.resolve() if enable_file_logging or json_logs else None,
+        enable_file_logging, level, json_logs
+    )
+    if configuration == _configuration:
+        return
+    _configuration = configuration
+    
+    # Replace our handlers; JSONL sinks keep running and are re-attached below
+    if _configured_json_path is not None:
+        remove_json_sink(_configured_json_path)
+        _configured_json_path = None
     logger.remove()
+    logger.configure(patcher=_add_session)
+    for path, (_, sink, sink_level) in list(_json_sinks.items()):
+        _json_sinks[path] = (logger.add(sink, level=sink_level, format="{message}"), sink, sink_level)
     
     # Create log directory if needed
     if enable_file_logging:
-        if log_dir is None:
-            log_dir = Path("./logs")
         log_dir.mkdir(parents=True, exist_ok=True)
     
-    # Custom format for structured logging
-    log_format = (
-        "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | "
-        "<level>{level: <8}</level> | "
-        "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - "
-        "<level>{message}</level>"
-    )
-    
     def router_sink(message):
         """Sink that routes to our log router"""
         log_router.add_message(message.record)
@@ -129,10 +567,20 @@ def setup_logging(log_dir: Optional[Path] = None, enable_file_logging: bool = Tr
     # Add router sink (always enabled)
     logger.add(
         router_sink,
-        level="DEBUG",
+        level=level,
         enqueue=True  # Thread-safe
     )
     
+    # Per-session files; sessions without registered files are dropped
+    logger.add(
+        session_logs.sink,
+        level=level,
+        format=LOG_FORMAT,
+        colorize=False,
+        enqueue=True,
+        filter=lambda record: "session" in record["extra"] and len(session_logs) > 0
+    )
+    
     # Add file logging if enabled
     if enable_file_logging:
         # Main log file
@@ -140,8 +588,8 @@ def setup_logging(log_dir: Optional[Path] = None, enable_file_logging: bool = Tr
             log_dir / "ara_{time:YYYY-MM-DD}.log",
             rotation="1 day",
             retention="30 days",
-            level="DEBUG",
-            format=log_format,
+            level=level,
+            format=LOG_FORMAT,
             enqueue=True
         )
         
@@ -151,26 +599,33 @@ def setup_logging(log_dir: Optional[Path] = None, enable_file_logging: bool = Tr
             rotation="1 day",
             retention="30 days",
             level="ERROR",
-            format=log_format,
+            format=LOG_FORMAT,
             enqueue=True
         )
     
-    # Add console output ONLY if not in TUI mode
+    if json_logs:
+        log_dir.mkdir(parents=True, exist_ok=True)
+        _configured_json_path = (log_dir / "ara.jsonl").resolve()
+        add_json_sink(_configured_json_path, level=level)
+    
+    # Console output is muted while a TUI owns the terminal
     # This prevents stdout interference with Textual
-    if not log_router.tui_handler:
-        logger.add(
-            sys.stderr,  # Use stderr to avoid stdout interference
-            level="INFO",
-            format=log_format,
-            colorize=True
-        )
+    logger.add(
+        sys.stderr,  # Use stderr to avoid stdout interference
+        level="INFO",
+        format=LOG_FORMAT,
+        colorize=True,
+        filter=lambda record: log_router.console_enabled
+    )
+    _min_levelno = min(_levelno(level), _levelno("INFO"))
 
 
+@lru_cache(maxsize=1024)
 def get_logger(name: Optional[str] = None, 
                behavior: Optional[str] = None,
                activity: Optional[str] = None,
                context: Optional[str] = None):
-    """Get a logger with optional context
+    """Get a logger with optional context (bound loggers are cached)
     
     Args:
         name: Logger name (usually __name__)
@@ -195,5 +650,50 @@ def get_logger(name: Optional[str] = None,
     return logger
 
 
+class _SiteState:
+    __slots__ = ("calls", "last_emit", "suppressed")
+    
+    def __init__(self):
+        self.calls = 0
+        self.last_emit = 0.0
+        self.suppressed = 0
+
+
+_sites: Dict[str, _SiteState] = {}
+
+
+def should_log(site: str, every: int = 1, interval: float = 0.0) -> bool:
+    """Sample a hot log call site: emit one in `every` calls, at most once per `interval` seconds
+    
+    Suppressed calls are counted; `take_suppressed(site)` returns and resets
+    the count so the next emitted message can mention it.
+    """
+    state = _sites.get(site)
+    if state is None:
+        state = _sites[site] = _SiteState()
+    state.calls += 1
+    now = time.monotonic()
+    if (every > 1 and state.calls % every != 1) or (interval and now - state.last_emit < interval):
+        state.suppressed += 1
+        return False
+    state.last_emit = now
+    return True
+
+
+def take_suppressed(site: str) -> int:
+    """Number of calls suppressed at a site since it was last asked"""
+    state = _sites.get(site)
+    if state is None:
+        return 0
+    suppressed, state.suppressed = state.suppressed, 0
+    return suppressed
+
+
+def ensure_logging() -> None:
+    """Configure default logging unless the application already configured it"""
+    if _configuration is None:
+        setup_logging(enable_file_logging=False)
+
+
 # Setup default logging on import
-setup_logging(enable_file_logging=False)
\ No newline at end of file
+ensure_logging()
\ No newline at end of file
@@ -0,0 +1,148 @@
+"""Event-loop lag measurement and blocking-call detection"""
+
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import TYPE_CHECKING, Deque, List, Optional
+
+from .sketch import StreamingHistogram
+from ..logging import get_logger, should_log, take_suppressed
+
+if TYPE_CHECKING:
+    from .metrics import MetricsCollector
+
+
+@dataclass
+class StallReport:
+    """What the event loop was running while it was blocked"""
+    timestamp: datetime
+    lag: float
+    task: Optional[str]
+    stack: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return {
+            "timestamp": self.timestamp.isoformat(),
+            "lag": self.lag,
+            "task": self.task,
+            "stack": self.stack,
+        }
+
+
+class LoopLagMonitor:
+    """Measures event-loop lag and captures the stack of code that blocks the loop
+
+    A heartbeat task sleeps for `interval` and records how late it wakes up
+    (the lag). A watchdog thread checks the heartbeat; when it has been
+    silent for longer than `threshold`, the loop is blocked right now, so the
+    watchdog grabs the loop thread's current Python stack and the running
+    task. Reports are kept in `stalls` and logged (rate-limited).
+
+    Opt-in: create one per event loop (A1(monitor_loop=True), or
+    ARA_LOOP_MONITOR=1 for the server) and call start()/stop().
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.1,
+        threshold: float = 0.25,
+        metrics: Optional["MetricsCollector"] = None,
+        max_reports: int = 50
+    ):
+        self.interval = interval
+        self.threshold = threshold
+        self.metrics = metrics
+        self.lag = StreamingHistogram()
+        self.stalls: Deque[StallReport] = deque(maxlen=max_reports)
+        self.stall_count = 0
+        self.logger = get_logger(__name__, context="loop_monitor")
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._heartbeat: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._last_beat = 0.0
+        # Report being filled in for the current stall, if any
+        self._stall: Optional[StallReport] = None
+
+    @property
+    def running(self) -> bool:
+        return self._heartbeat is not None and not self._heartbeat.done()
+
+    def start(self) -> None:
+        """Start monitoring the running event loop"""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stopping.clear()
+        self._heartbeat = self._loop.create_task(self._beat(), name="loop-lag-monitor")
+        self._watchdog = threading.Thread(target=self._watch, name="loop-lag-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stopping.set()
+        if self._heartbeat:
+            self._heartbeat.cancel()
+            try:
+                await self._heartbeat
+            except asyncio.CancelledError:
+                pass
+            self._heartbeat = None
+        if self._watchdog:
+            self._watchdog.join(timeout=self.interval * 2)
+            self._watchdog = None
+
+    async def _beat(self) -> None:
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(0.0, now - expected)
+            self._last_beat = now
+            self.lag.add(lag)
+            if self.metrics:
+                self.metrics.record_loop_lag(lag)
+
+            stall, self._stall = self._stall, None
+            if stall is not None:
+                # The watchdog saw the stall while it happened; now we know its full length
+                stall.lag = lag
+                if should_log("loop_monitor.stall", interval=10.0):
+                    self.logger.warning(
+                        "Event loop blocked for {:.3f}s in {} ({} more stalls not logged):\n{}",
+                        lag, stall.task or "a callback", take_suppressed("loop_monitor.stall"),
+                        "".join(stall.stack)
+                    )
+
+    def _watch(self) -> None:
+        while not self._stopping.wait(self.interval / 2):
+            silent = time.monotonic() - self._last_beat
+            if silent <= self.interval + self.threshold or self._stall is not None:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            task = asyncio.current_task(self._loop)
+            self._stall = StallReport(
+                timestamp=datetime.now(),
+                lag=silent - self.interval,
+                task=task.get_name() if task else None,
+                stack=traceback.format_stack(frame)
+            )
+            self.stalls.append(self._stall)
+            self.stall_count += 1
+
+    def summary(self) -> dict:
+        """Lag statistics and the most recent stalls"""
+        return {
+            "lag": self.lag.to_dict(),
+            "stalls": [report.to_dict() for report in list(self.stalls)[-10:]],
+            "stall_count": self.stall_count,
+        }
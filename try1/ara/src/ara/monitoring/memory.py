@@ -0,0 +1,212 @@
+"""Memory introspection: sizes of agent structures, object census and tracemalloc diffs"""
+
+import gc
+import resource
+import sys
+import threading
+import tracemalloc
+import types
+from collections import Counter, deque
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from ..logging import log_router
+from .tracing import tracer
+
+if TYPE_CHECKING:
+    from ..agent.core import A1
+
+
+def deep_sizeof(obj: Any, max_objects: int = 200_000) -> int:
+    """Approximate bytes retained by obj and everything it references
+
+    Follows containers, instance __dict__ and __slots__; shared objects are
+    counted once. Stops after max_objects so a huge structure cannot stall
+    the caller (the result is then a lower bound). Containers changed by
+    another thread during the walk are skipped rather than failing the
+    report; measure copies where that matters.
+    """
+    seen = set()
+    stack = [obj]
+    total = 0
+    while stack and len(seen) < max_objects:
+        current = stack.pop()
+        if id(current) in seen or isinstance(current, (type, types.ModuleType)):
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current, 0)
+
+        if isinstance(current, (str, bytes, bytearray, int, float, bool)) or current is None:
+            continue
+        try:
+            if isinstance(current, dict):
+                stack.extend(list(current.items()))
+            elif isinstance(current, (list, tuple, set, frozenset, deque)):
+                stack.extend(list(current))
+        except RuntimeError:
+            continue  # Mutated while being copied
+        if hasattr(current, "__dict__"):
+            stack.append(vars(current))
+        for slot in getattr(type(current), "__slots__", ()):
+            if hasattr(current, slot):
+                stack.append(getattr(current, slot))
+    return total
+
+
+def _measure(obj: Any) -> Dict[str, int]:
+    return {"count": len(obj), "bytes": deep_sizeof(obj)}
+
+
+def agent_structures(agent: "A1") -> Dict[str, Any]:
+    """Shallow copies of an agent's main in-memory structures
+
+    Cheap enough for the event loop; measuring the copies (measure_structures)
+    can then run in a worker thread without racing the agent's own updates.
+    """
+    metrics = agent.metrics
+    return {
+        "session_id": agent.session_id,
+        "messages": list(agent.messages),
+        "behaviors": {
+            name: {"activities": dict(behavior.activities), "state": behavior.export_state()}
+            for name, behavior in agent.behavior_manager.behaviors.items()
+        },
+        "metrics": {
+            "tool_metrics": list(metrics.tool_metrics),
+            "conversation_metrics": list(metrics.conversation_metrics),
+            "retrieval_metrics": list(metrics.retrieval_metrics),
+            "hook_metrics": list(metrics.hook_metrics),
+            "llm_metrics": list(metrics.llm_metrics),
+            "aggregates": [
+                dict(metrics._tool_stats), dict(metrics._retrieval_stats),
+                dict(metrics._hook_stats), dict(metrics._llm_stats),
+            ],
+        },
+        "catalog_sessions": len(agent.storage.catalog._sessions),
+    }
+
+
+def measure_structures(structures: Dict[str, Any]) -> Dict[str, Any]:
+    """Item counts and approximate retained bytes of structures copied by agent_structures"""
+    metrics = structures["metrics"]
+    return {
+        "session_id": structures["session_id"],
+        "messages": _measure(structures["messages"]),
+        "behaviors": {
+            name: {"activities": _measure(behavior["activities"]), "state_bytes": deep_sizeof(behavior["state"])}
+            for name, behavior in structures["behaviors"].items()
+        },
+        "metrics": {
+            **{name: _measure(metrics[name]) for name in (
+                "tool_metrics", "conversation_metrics", "retrieval_metrics", "hook_metrics", "llm_metrics"
+            )},
+            "aggregates_bytes": deep_sizeof(metrics["aggregates"]),
+        },
+        "conversation_catalog": {"sessions": structures["catalog_sessions"]},
+    }
+
+
+def agent_memory_report(agent: "A1") -> Dict[str, Any]:
+    """Item counts and approximate retained bytes of an agent's main in-memory structures"""
+    return measure_structures(agent_structures(agent))
+
+
+def object_census(top: int = 20) -> List[Dict[str, Any]]:
+    """Most common live object types tracked by the garbage collector"""
+    counts = Counter(type(obj).__qualname__ for obj in gc.get_objects())
+    return [{"type": name, "count": count} for name, count in counts.most_common(top)]
+
+
+def process_memory_report(census_top: Optional[int] = None) -> Dict[str, Any]:
+    """Process-wide memory: peak RSS, shared buffers and, if census_top is set, an object census
+
+    The census walks every object the garbage collector tracks, which takes
+    long in a large process; run it off the event loop.
+    """
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    # ru_maxrss is kilobytes on Linux and bytes on macOS
+    max_rss = usage.ru_maxrss if sys.platform == "darwin" else usage.ru_maxrss * 1024
+    report = {
+        "max_rss_bytes": max_rss,
+        "gc_counts": gc.get_count(),
+        # Copied under their locks: both are appended to from other threads
+        "log_buffer": _measure(log_router.get_filtered_logs(limit=log_router.max_buffer_size)),
+        "trace_spans": _measure(tracer.get_spans()),
+        "tracemalloc": snapshots.status(),
+    }
+    if census_top:
+        report["census"] = object_census(census_top)
+    return report
+
+
+class TracemallocSnapshots:
+    """Named tracemalloc snapshots for diffing allocations between two points"""
+
+    def __init__(self, max_snapshots: int = 10):
+        self.max_snapshots = max_snapshots
+        self._snapshots: Dict[str, tracemalloc.Snapshot] = {}
+        self._taken: Dict[str, datetime] = {}
+        # take and diff run in worker threads
+        self._lock = threading.Lock()
+
+    def start(self, frames: int = 10) -> None:
+        """Start tracing allocations (costly; only while investigating)"""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+
+    def stop(self) -> None:
+        tracemalloc.stop()
+        with self._lock:
+            self._snapshots.clear()
+            self._taken.clear()
+
+    def take(self, label: Optional[str] = None) -> str:
+        """Take a snapshot (starting tracing if needed) and return its label
+
+        Copies every traced allocation, which takes a while in a large
+        process; run it off the event loop.
+        """
+        self.start()
+        label = label or datetime.now().strftime("%H:%M:%S.%f")
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ])
+        with self._lock:
+            self._snapshots[label] = snapshot
+            self._taken[label] = datetime.now()
+            while len(self._snapshots) > self.max_snapshots:
+                oldest = next(iter(self._snapshots))
+                del self._snapshots[oldest]
+                del self._taken[oldest]
+        return label
+
+    def diff(self, before: str, after: str, top: int = 20, key_type: str = "lineno") -> List[Dict[str, Any]]:
+        """Largest allocation changes between two snapshots, grouped by line or file"""
+        with self._lock:
+            first, second = self._snapshots.get(before), self._snapshots.get(after)
+        if first is None or second is None:
+            raise KeyError(f"Unknown snapshot: {before if first is None else after}")
+        stats = second.compare_to(first, key_type)
+        return [
+            {
+                "location": str(stat.traceback[0]) if stat.traceback else "?",
+                "size_diff": stat.size_diff,
+                "size": stat.size,
+                "count_diff": stat.count_diff,
+                "count": stat.count,
+            }
+            for stat in stats[:top]
+        ]
+
+    def status(self) -> Dict[str, Any]:
+        current, peak = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (0, 0)
+        return {
+            "tracing": tracemalloc.is_tracing(),
+            "traced_bytes": current,
+            "traced_peak_bytes": peak,
+            "snapshots": {label: taken.isoformat() for label, taken in list(self._taken.items())},
+        }
+
+
+snapshots = TracemallocSnapshots()
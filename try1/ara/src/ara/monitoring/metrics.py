@@ -1,12 +1,19 @@
 """Metrics collection for observability"""
 
+from contextvars import ContextVar
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Deque, Dict, Optional, Tuple
 from dataclasses import dataclass, field
-from collections import defaultdict
-import statistics
+from collections import defaultdict, deque
 from loguru import logger
 
+from .sketch import StreamingHistogram
+from ..logging import should_log, take_suppressed
+from ..events import METRIC_RECORDED, event_bus
+
+if TYPE_CHECKING:
+    from .timeseries import TimeSeriesStore
+
 
 @dataclass
 class ToolMetric:
@@ -34,13 +41,49 @@ class MetricsSummary:
     p99_duration: float = 0.0
 
 
+@dataclass
+class _Aggregate:
+    """Running duration histogram plus named counters for one metric key"""
+    durations: StreamingHistogram = field(default_factory=StreamingHistogram)
+    counts: Dict[str, float] = field(default_factory=lambda: defaultdict(int))
+
+
+# The collector and origin ("agent" or a behavior name) that LLM calls made in
+# the current context are attributed to. The agent sets the collector for its
+# turns and tasks; the behavior manager sets the origin around hooks.
+current_metrics: ContextVar[Optional["MetricsCollector"]] = ContextVar("current_metrics", default=None)
+llm_origin: ContextVar[str] = ContextVar("llm_origin", default="agent")
+
+
 class MetricsCollector:
-    """Collects and aggregates metrics for agent operations"""
+    """Collects and aggregates metrics for agent operations
+    
+    Summaries come from fixed-size running aggregates (counts, sums and a
+    streaming histogram per key), so memory and summary cost stay constant
+    however long the agent runs. Only the last `raw_sample_size` raw records
+    of each kind are kept, for inspection and debugging. When `timeseries`
+    is set, observations are also added to that persistent history.
+    """
     
-    def __init__(self):
-        self.tool_metrics: List[ToolMetric] = []
-        self.conversation_metrics: List[Dict] = []
-        self._tool_durations: Dict[str, List[float]] = defaultdict(list)
+    def __init__(self, raw_sample_size: int = 1000):
+        self.raw_sample_size = raw_sample_size
+        self.tool_metrics: Deque[ToolMetric] = deque(maxlen=raw_sample_size)
+        self.conversation_metrics: Deque[Dict] = deque(maxlen=raw_sample_size)
+        self.retrieval_metrics: Deque[Dict] = deque(maxlen=raw_sample_size)
+        self.hook_metrics: Deque[Dict] = deque(maxlen=raw_sample_size)
+        self.behavior_init_metrics: Dict[str, Dict] = {}
+        self._tool_stats: Dict[str, _Aggregate] = defaultdict(_Aggregate)
+        self._conversation_totals: Dict[str, float] = defaultdict(float)
+        self._retrieval_stats: Dict[str, _Aggregate] = defaultdict(_Aggregate)
+        self._hook_stats: Dict[str, _Aggregate] = defaultdict(_Aggregate)
+        self.llm_metrics: Deque[Dict] = deque(maxlen=raw_sample_size)
+        # (origin, model) -> aggregate
+        self._llm_stats: Dict[Tuple[str, str], _Aggregate] = defaultdict(_Aggregate)
+        # Event-loop lag samples (see monitoring.loop_monitor)
+        self.loop_lag = StreamingHistogram()
+        self.timeseries: Optional["TimeSeriesStore"] = None
+        # Label of this collector's points in a timeseries shared by sessions
+        self.session: Optional[str] = None
     
     def record_tool_call(
         self,
@@ -61,13 +104,24 @@ class MetricsCollector:
         )
         
         self.tool_metrics.append(metric)
-        self._tool_durations[tool_name].append(duration)
+        stats = self._tool_stats[tool_name]
+        stats.durations.add(duration)
+        stats.counts["success" if success else "failure"] += 1
+        if self.timeseries:
+            self.timeseries.observe(f"tool.{tool_name}.duration", duration, session=self.session)
+            if not success:
+                self.timeseries.observe(f"tool.{tool_name}.failures", 1, session=self.session)
+        event_bus.publish(METRIC_RECORDED, metric="tool", name=tool_name)
         
-        # Log if slow or failed
-        if duration > 1.0:
-            logger.warning(f"Slow tool call: {tool_name} took {duration:.2f}s")
+        # Log if slow or failed (slow calls at most every 10s per tool)
+        site = f"metrics.slow_tool.{tool_name}"
+        if duration > 1.0 and should_log(site, interval=10.0):
+            logger.warning(
+                "Slow tool call: {} took {:.2f}s ({} more slow calls not logged)",
+                tool_name, duration, take_suppressed(site)
+            )
         if not success:
-            logger.error(f"Tool call failed: {tool_name} - {error}")
+            logger.error("Tool call failed: {} - {}", tool_name, error)
     
     def record_conversation_turn(
         self,
@@ -83,63 +137,274 @@ class MetricsCollector:
             "total_tokens": prompt_tokens + completion_tokens,
             "duration": duration
         })
+        totals = self._conversation_totals
+        totals["turns"] += 1
+        totals["prompt_tokens"] += prompt_tokens
+        totals["completion_tokens"] += completion_tokens
+        totals["total_tokens"] += prompt_tokens + completion_tokens
+        totals["total_duration"] += duration
+        if self.timeseries:
+            self.timeseries.observe("turn.duration", duration, session=self.session)
+            self.timeseries.observe("turn.tokens", prompt_tokens + completion_tokens, session=self.session)
+        event_bus.publish(METRIC_RECORDED, metric="conversation")
+    
+    def record_retrieval(
+        self,
+        source: str,
+        duration: float,
+        hits: int,
+        timed_out: bool = False
+    ) -> None:
+        """Record a memory retrieval (e.g. episodic memory injection)"""
+        self.retrieval_metrics.append({
+            "timestamp": datetime.now(),
+            "source": source,
+            "duration": duration,
+            "hits": hits,
+            "timed_out": timed_out
+        })
+        stats = self._retrieval_stats[source]
+        stats.durations.add(duration)
+        if hits > 0:
+            stats.counts["hit"] += 1
+        if timed_out:
+            stats.counts["timeout"] += 1
+        if self.timeseries:
+            self.timeseries.observe(f"retrieval.{source}.duration", duration, session=self.session)
+        event_bus.publish(METRIC_RECORDED, metric="retrieval", name=source)
+        
+        site = f"metrics.retrieval_timeout.{source}"
+        if timed_out and should_log(site, interval=10.0):
+            logger.warning(
+                "Retrieval timed out: {} after {:.3f}s ({} more timeouts not logged)",
+                source, duration, take_suppressed(site)
+            )
+    
+    def record_hook(
+        self,
+        behavior: str,
+        hook: str,
+        duration: float,
+        outcome: str
+    ) -> None:
+        """Record a behavior hook execution (outcome: ok, error, timeout, deferred, skipped, ...)"""
+        self.hook_metrics.append({
+            "timestamp": datetime.now(),
+            "behavior": behavior,
+            "hook": hook,
+            "duration": duration,
+            "outcome": outcome
+        })
+        stats = self._hook_stats[f"{behavior}.{hook}"]
+        stats.durations.add(duration)
+        stats.counts[outcome] += 1
+        if self.timeseries:
+            self.timeseries.observe(f"hook.{behavior}.{hook}.duration", duration, session=self.session)
+        event_bus.publish(METRIC_RECORDED, metric="hook", name=f"{behavior}.{hook}")
+    
+    def record_llm_call(
+        self,
+        origin: str,
+        model: str,
+        prompt_tokens: int,
+        completion_tokens: int,
+        duration: float,
+        cost: float = 0.0,
+        success: bool = True
+    ) -> None:
+        """Record one LLM request and what it consumed"""
+        self.llm_metrics.append({
+            "timestamp": datetime.now(),
+            "origin": origin,
+            "model": model,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "duration": duration,
+            "cost": cost,
+            "success": success
+        })
+        stats = self._llm_stats[(origin, model)]
+        stats.durations.add(duration)
+        stats.counts["prompt_tokens"] += prompt_tokens
+        stats.counts["completion_tokens"] += completion_tokens
+        stats.counts["cost"] += cost
+        if not success:
+            stats.counts["errors"] += 1
+        if self.timeseries:
+            self.timeseries.observe(f"llm.{origin}.duration", duration, session=self.session)
+            self.timeseries.observe(f"llm.{origin}.tokens", prompt_tokens + completion_tokens, session=self.session)
+            if cost:
+                self.timeseries.observe(f"llm.{origin}.cost", cost, session=self.session)
+        event_bus.publish(METRIC_RECORDED, metric="llm", name=origin)
+    
+    def record_loop_lag(self, lag: float) -> None:
+        """Record how late an event-loop heartbeat woke up"""
+        self.loop_lag.add(lag)
+        if self.timeseries:
+            self.timeseries.observe("loop.lag", lag, session=self.session)
+    
+    def record_behavior_init(self, behavior: str, duration: float, success: bool) -> None:
+        """Record how long a behavior took to initialize"""
+        self.behavior_init_metrics[behavior] = {
+            "timestamp": datetime.now(),
+            "duration": duration,
+            "success": success
+        }
     
     def get_tool_summary(self, tool_name: Optional[str] = None) -> Dict[str, MetricsSummary]:
         """Get summary statistics for tool calls"""
-        summaries = {}
-        
-        # Filter metrics by tool name if specified
         if tool_name:
-            metrics = [m for m in self.tool_metrics if m.tool_name == tool_name]
-            tool_names = [tool_name] if metrics else []
+            names = [tool_name] if tool_name in self._tool_stats else []
         else:
-            metrics = self.tool_metrics
-            tool_names = list(self._tool_durations.keys())
+            names = list(self._tool_stats)
         
-        for name in tool_names:
-            tool_metrics = [m for m in metrics if m.tool_name == name]
-            if not tool_metrics:
-                continue
-            
-            durations = sorted([m.duration for m in tool_metrics])
-            summary = MetricsSummary(
-                count=len(tool_metrics),
-                success_count=sum(1 for m in tool_metrics if m.success),
-                failure_count=sum(1 for m in tool_metrics if not m.success),
-                total_duration=sum(durations),
-                min_duration=min(durations),
-                max_duration=max(durations),
-                avg_duration=statistics.mean(durations)
+        summaries = {}
+        for name in names:
+            stats = self._tool_stats[name]
+            durations = stats.durations
+            summaries[name] = MetricsSummary(
+                count=durations.count,
+                success_count=stats.counts["success"],
+                failure_count=stats.counts["failure"],
+                total_duration=durations.sum,
+                min_duration=durations.min,
+                max_duration=durations.max,
+                avg_duration=durations.mean,
+                p50_duration=durations.quantile(0.5),
+                p95_duration=durations.quantile(0.95),
+                p99_duration=durations.quantile(0.99)
             )
-            
-            # Calculate percentiles
-            if len(durations) > 1:
-                summary.p50_duration = statistics.median(durations)
-                summary.p95_duration = durations[int(len(durations) * 0.95)]
-                summary.p99_duration = durations[int(len(durations) * 0.99)]
-            
-            summaries[name] = summary
         
         return summaries
     
+    def get_llm_summary(self, by: str = "origin") -> Dict[str, Dict]:
+        """Get LLM calls, tokens, cost and latency rolled up by "origin" or "model"
+        
+        Origins are "agent" for the main loop and behavior names for calls
+        made from behavior hooks and periodic tasks.
+        """
+        index = {"origin": 0, "model": 1}[by]
+        grouped: Dict[str, _Aggregate] = defaultdict(_Aggregate)
+        for key, stats in self._llm_stats.items():
+            target = grouped[key[index]]
+            target.durations.merge(stats.durations)
+            for name, n in stats.counts.items():
+                target.counts[name] += n
+        
+        summaries = {}
+        for name, stats in grouped.items():
+            prompt_tokens = int(stats.counts["prompt_tokens"])
+            completion_tokens = int(stats.counts["completion_tokens"])
+            summaries[name] = {
+                "calls": stats.durations.count,
+                "errors": int(stats.counts["errors"]),
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+                "cost": stats.counts["cost"],
+                "avg_duration": stats.durations.mean,
+                "p95_duration": stats.durations.quantile(0.95)
+            }
+        return summaries
+    
     def get_conversation_summary(self) -> Dict:
         """Get summary of conversation metrics"""
-        if not self.conversation_metrics:
+        totals = self._conversation_totals
+        turns = int(totals["turns"])
+        if not turns:
             return {}
         
-        total_tokens = sum(m["total_tokens"] for m in self.conversation_metrics)
-        total_duration = sum(m["duration"] for m in self.conversation_metrics)
-        
         return {
-            "turns": len(self.conversation_metrics),
-            "total_tokens": total_tokens,
-            "total_duration": total_duration,
-            "avg_tokens_per_turn": total_tokens / len(self.conversation_metrics),
-            "avg_duration_per_turn": total_duration / len(self.conversation_metrics)
+            "turns": turns,
+            "prompt_tokens": int(totals["prompt_tokens"]),
+            "completion_tokens": int(totals["completion_tokens"]),
+            "total_tokens": int(totals["total_tokens"]),
+            "total_duration": totals["total_duration"],
+            "avg_tokens_per_turn": totals["total_tokens"] / turns,
+            "avg_duration_per_turn": totals["total_duration"] / turns
         }
     
+    def get_retrieval_summary(self) -> Dict[str, Dict]:
+        """Get latency and hit rate of memory retrievals per source"""
+        summaries = {}
+        for source, stats in self._retrieval_stats.items():
+            count = stats.durations.count
+            summaries[source] = {
+                "count": count,
+                "hit_rate": stats.counts["hit"] / count,
+                "timeout_rate": stats.counts["timeout"] / count,
+                "avg_duration": stats.durations.mean,
+                "p95_duration": stats.durations.quantile(0.95)
+            }
+        return summaries
+    
+    def get_hook_summary(self) -> Dict[str, Dict]:
+        """Get duration statistics and outcome counts per behavior hook ("behavior.hook")"""
+        summaries = {}
+        for key, stats in self._hook_stats.items():
+            summaries[key] = {
+                "count": stats.durations.count,
+                "outcomes": dict(stats.counts),
+                "avg_duration": stats.durations.mean,
+                "p95_duration": stats.durations.quantile(0.95),
+                "max_duration": stats.durations.max
+            }
+        return summaries
+    
+    def merge(self, other: "MetricsCollector") -> None:
+        """Fold another collector's aggregates into this one (raw samples are not copied)
+        
+        Used to combine sessions for fleet-wide summaries and to keep totals
+        of sessions that have ended.
+        """
+        for mine, theirs in (
+            (self._tool_stats, other._tool_stats),
+            (self._retrieval_stats, other._retrieval_stats),
+            (self._hook_stats, other._hook_stats),
+            (self._llm_stats, other._llm_stats),
+        ):
+            for key, stats in theirs.items():
+                target = mine[key]
+                target.durations.merge(stats.durations)
+                for name, n in stats.counts.items():
+                    target.counts[name] += n
+        for name, value in other._conversation_totals.items():
+            self._conversation_totals[name] += value
+        self.loop_lag.merge(other.loop_lag)
+    
     def clear_metrics(self) -> None:
         """Clear all collected metrics"""
         self.tool_metrics.clear()
         self.conversation_metrics.clear()
-        self._tool_durations.clear()
\ No newline at end of file
+        self.retrieval_metrics.clear()
+        self.hook_metrics.clear()
+        self.behavior_init_metrics.clear()
+        self._tool_stats.clear()
+        self._conversation_totals.clear()
+        self._retrieval_stats.clear()
+        self._hook_stats.clear()
+        self.llm_metrics.clear()
+        self._llm_stats.clear()
+        self.loop_lag.clear()
+
+
+def record_llm_usage(
+    model: str,
+    usage: Optional[Dict[str, Any]],
+    duration: float,
+    success: bool = True
+) -> None:
+    """Attribute an LLM call to the current context's collector and origin, if any"""
+    collector = current_metrics.get()
+    if collector is None:
+        return
+    usage = usage or {}
+    collector.record_llm_call(
+        origin=llm_origin.get(),
+        model=model,
+        prompt_tokens=usage.get("prompt_tokens") or 0,
+        completion_tokens=usage.get("completion_tokens") or 0,
+        duration=duration,
+        cost=usage.get("cost") or 0.0,
+        success=success
+    )
@@ -0,0 +1,174 @@
+"""Prometheus text exposition of agent metrics"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .metrics import MetricsCollector
+from .sketch import StreamingHistogram
+
+# Upper bounds (seconds) for exported latency histograms
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+Labels = Dict[str, str]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class PrometheusWriter:
+    """Builds a Prometheus text-format (0.0.4) payload one metric family at a time"""
+
+    CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self, namespace: str = "ara", buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.namespace = namespace
+        self.buckets = buckets
+        self._lines: List[str] = []
+
+    def _header(self, name: str, kind: str, help_text: str) -> str:
+        name = f"{self.namespace}_{name}"
+        self._lines.append(f"# HELP {name} {help_text}")
+        self._lines.append(f"# TYPE {name} {kind}")
+        return name
+
+    def _samples(self, name: str, kind: str, help_text: str, samples: Iterable[Tuple[Labels, float]]) -> None:
+        name = self._header(name, kind, help_text)
+        for labels, value in samples:
+            self._lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+    def counter(self, name: str, help_text: str, samples: Iterable[Tuple[Labels, float]]) -> None:
+        self._samples(f"{name}_total", "counter", help_text, samples)
+
+    def gauge(self, name: str, help_text: str, samples: Iterable[Tuple[Labels, float]]) -> None:
+        self._samples(name, "gauge", help_text, samples)
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        histograms: Iterable[Tuple[Labels, StreamingHistogram]]
+    ) -> None:
+        """Export streaming histograms as cumulative le buckets plus _sum and _count"""
+        name = self._header(name, "histogram", help_text)
+        for labels, histogram in histograms:
+            for bound in self.buckets:
+                bucket_labels = {**labels, "le": _format_value(bound)}
+                self._lines.append(
+                    f"{name}_bucket{_format_labels(bucket_labels)} {histogram.count_at_or_below(bound)}"
+                )
+            self._lines.append(f'{name}_bucket{_format_labels({**labels, "le": "+Inf"})} {histogram.count}')
+            self._lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(histogram.sum)}")
+            self._lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+
+    def write_collector(self, collector: MetricsCollector) -> None:
+        """Export the aggregates of a (typically merged) MetricsCollector"""
+        tools = collector._tool_stats
+        self.counter(
+            "tool_calls",
+            "Tool calls by tool and result",
+            (
+                ({"tool": tool, "result": result}, stats.counts[result])
+                for tool, stats in tools.items()
+                for result in ("success", "failure")
+            )
+        )
+        self.histogram(
+            "tool_duration_seconds",
+            "Tool call duration",
+            (({"tool": tool}, stats.durations) for tool, stats in tools.items())
+        )
+
+        hooks = collector._hook_stats
+        self.counter(
+            "hook_runs",
+            "Behavior hook runs by outcome",
+            (
+                (dict(zip(("behavior", "hook"), key.rsplit(".", 1)), outcome=outcome), n)
+                for key, stats in hooks.items()
+                for outcome, n in stats.counts.items()
+            )
+        )
+        self.histogram(
+            "hook_duration_seconds",
+            "Behavior hook duration",
+            ((dict(zip(("behavior", "hook"), key.rsplit(".", 1))), stats.durations) for key, stats in hooks.items())
+        )
+
+        retrievals = collector._retrieval_stats
+        self.counter(
+            "retrievals",
+            "Memory retrievals by source",
+            (({"source": source}, stats.durations.count) for source, stats in retrievals.items())
+        )
+        self.counter(
+            "retrieval_timeouts",
+            "Memory retrievals that timed out",
+            (({"source": source}, stats.counts["timeout"]) for source, stats in retrievals.items())
+        )
+        self.histogram(
+            "retrieval_duration_seconds",
+            "Memory retrieval duration",
+            (({"source": source}, stats.durations) for source, stats in retrievals.items())
+        )
+
+        totals = collector._conversation_totals
+        self.counter("conversation_turns", "Completed conversation turns", [({}, int(totals["turns"]))])
+
+        llm = collector._llm_stats
+        self.counter(
+            "llm_calls",
+            "LLM requests by origin (agent or behavior) and model",
+            (({"origin": origin, "model": model}, stats.durations.count) for (origin, model), stats in llm.items())
+        )
+        self.counter(
+            "llm_errors",
+            "Failed LLM requests by origin and model",
+            (({"origin": origin, "model": model}, int(stats.counts["errors"])) for (origin, model), stats in llm.items())
+        )
+        self.counter(
+            "llm_tokens",
+            "LLM tokens by origin, model and kind",
+            (
+                ({"origin": origin, "model": model, "kind": kind}, int(stats.counts[f"{kind}_tokens"]))
+                for (origin, model), stats in llm.items()
+                for kind in ("prompt", "completion")
+            )
+        )
+        self.counter(
+            "llm_cost",
+            "LLM cost reported by the provider, by origin and model",
+            (({"origin": origin, "model": model}, float(stats.counts["cost"])) for (origin, model), stats in llm.items())
+        )
+        self.histogram(
+            "llm_duration_seconds",
+            "LLM request latency",
+            (({"origin": origin, "model": model}, stats.durations) for (origin, model), stats in llm.items())
+        )
+
+        if collector.loop_lag.count:
+            self.histogram("event_loop_lag_seconds", "Event loop heartbeat lag", [({}, collector.loop_lag)])
+
+    def render(self) -> str:
+        return "\n".join(self._lines) + "\n"
+
+
+def merge_collectors(collectors: Iterable[MetricsCollector], base: Optional[MetricsCollector] = None) -> MetricsCollector:
+    """Combine the aggregates of several collectors into a new one"""
+    total = MetricsCollector(raw_sample_size=0)
+    if base is not None:
+        total.merge(base)
+    for collector in collectors:
+        total.merge(collector)
+    return total
@@ -0,0 +1,113 @@
+"""Fixed-memory streaming statistics for latency-like measurements"""
+
+import math
+from typing import Dict, Optional
+
+
+class StreamingHistogram:
+    """Log-bucketed histogram giving quantiles within a bounded relative error
+
+    Each positive value lands in bucket ``ceil(log(value) / log(gamma))`` where
+    ``gamma = (1 + accuracy) / (1 - accuracy)``, so any quantile read back is
+    within ``accuracy`` (relative) of the true value. Memory depends only on
+    the range of values seen (about 1200 buckets from a microsecond to a few
+    hours at 1% accuracy), not on how many were recorded, and two histograms
+    with the same accuracy merge by adding bucket counts.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, min_value: float = 1e-6):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self.min_value = min_value
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._buckets: Dict[int, int] = {}
+        # Values at or below min_value (including zero) are counted together
+        self._zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def add(self, value: float) -> None:
+        """Record one value"""
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if value <= self.min_value:
+            self._zero_count += 1
+        else:
+            key = math.ceil(math.log(value) / self._log_gamma)
+            self._buckets[key] = self._buckets.get(key, 0) + 1
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """Approximate value at quantile q (0..1); exact for the min and max"""
+        if not self.count:
+            return 0.0
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+
+        rank = q * (self.count - 1)
+        seen = self._zero_count
+        if rank < seen:
+            return self.min
+        for key in sorted(self._buckets):
+            seen += self._buckets[key]
+            if rank < seen:
+                # Midpoint of the bucket (in relative terms), clamped to what was seen
+                value = 2 * self._gamma ** key / (self._gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def count_at_or_below(self, bound: float) -> int:
+        """Approximate number of values <= bound (exact when bound >= max)"""
+        if bound >= self.max:
+            return self.count
+        if bound < self.min:
+            return 0
+        total = self._zero_count
+        if bound > self.min_value:
+            limit = math.ceil(math.log(bound) / self._log_gamma)
+            total += sum(n for key, n in self._buckets.items() if key <= limit)
+        return total
+
+    def merge(self, other: "StreamingHistogram") -> None:
+        """Fold another histogram with the same accuracy into this one"""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge histograms with different accuracy")
+        for key, n in other._buckets.items():
+            self._buckets[key] = self._buckets.get(key, 0) + n
+        self._zero_count += other._zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def clear(self) -> None:
+        self._buckets.clear()
+        self._zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def to_dict(self, quantiles=(0.5, 0.95, 0.99)) -> Dict[str, Optional[float]]:
+        """Summary statistics as a plain dict"""
+        summary = {
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "mean": self.mean,
+        }
+        for q in quantiles:
+            summary[f"p{round(q * 100):g}"] = self.quantile(q)
+        return summary
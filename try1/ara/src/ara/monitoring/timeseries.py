@@ -0,0 +1,284 @@
+"""Persistent, downsampled time series of agent metrics (SQLite)"""
+
+import asyncio
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ..logging import get_logger
+
+# (resolution seconds, retention seconds); the first is what observations are bucketed at
+DEFAULT_RESOLUTIONS: Tuple[Tuple[int, int], ...] = (
+    (60, 7 * 24 * 3600),
+    (3600, 90 * 24 * 3600),
+    (86400, 5 * 365 * 24 * 3600),
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS points (
+    series TEXT NOT NULL,
+    session TEXT NOT NULL DEFAULT '',
+    resolution INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    sum REAL NOT NULL,
+    min REAL NOT NULL,
+    max REAL NOT NULL,
+    PRIMARY KEY (series, session, resolution, bucket)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+# Files written before points were labeled by session
+_MIGRATE_UNLABELED = """
+ALTER TABLE points RENAME TO points_unlabeled;
+""" + _SCHEMA + """
+INSERT INTO points (series, resolution, bucket, count, sum, min, max)
+SELECT series, resolution, bucket, count, sum, min, max FROM points_unlabeled;
+DROP TABLE points_unlabeled;
+"""
+
+
+class TimeSeriesStore:
+    """Round-robin style metric history kept in SQLite under the agent path
+
+    `observe()` only updates an in-memory (count, sum, min, max) cell for the
+    current base bucket, so it is cheap enough for hot paths. Points are
+    labeled with the session that observed them; queries aggregate over
+    sessions unless one is given. A background
+    task flushes cells every `flush_interval` seconds (merging with what other
+    processes or sessions wrote to the same file), rolls complete base buckets
+    up into coarser resolutions and deletes points past their retention.
+
+    The SQLite file is opened on first use (or by `open()`), not in the
+    constructor, so creating a store costs nothing until it is needed.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        resolutions: Sequence[Tuple[int, int]] = DEFAULT_RESOLUTIONS,
+        flush_interval: float = 60.0
+    ):
+        self.path = Path(path)
+        self.resolutions = sorted(resolutions)
+        self.base_resolution = self.resolutions[0][0]
+        self.flush_interval = flush_interval
+        self.logger = get_logger(__name__, context="timeseries")
+        # (series, session, bucket) -> [count, sum, min, max]
+        self._pending: Dict[Tuple[str, str, int], List[float]] = {}
+        self._pending_lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._connection: Optional[sqlite3.Connection] = None
+
+    @property
+    def _db(self) -> sqlite3.Connection:
+        """The database connection, opened on first use (callers hold _db_lock)"""
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(self.path, check_same_thread=False, timeout=10.0)
+            db.execute("PRAGMA journal_mode=WAL")
+            columns = [row[1] for row in db.execute("PRAGMA table_info(points)")]
+            db.executescript(_MIGRATE_UNLABELED if columns and "session" not in columns else _SCHEMA)
+            self._connection = db
+        return self._connection
+
+    def open(self) -> None:
+        """Open (and if needed create or migrate) the database file now; blocking"""
+        with self._db_lock:
+            self._db
+
+    def observe(
+        self,
+        series: str,
+        value: float,
+        timestamp: Optional[float] = None,
+        session: Optional[str] = None
+    ) -> None:
+        """Add one observation to the current base bucket of a series"""
+        bucket = int((timestamp or time.time()) // self.base_resolution) * self.base_resolution
+        key = (series, session or "", bucket)
+        with self._pending_lock:
+            cell = self._pending.get(key)
+            if cell is None:
+                self._pending[key] = [1, value, value, value]
+            else:
+                cell[0] += 1
+                cell[1] += value
+                if value < cell[2]:
+                    cell[2] = value
+                if value > cell[3]:
+                    cell[3] = value
+
+    def start(self) -> None:
+        """Flush and downsample periodically on the running loop"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background task and write out pending observations"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+                await asyncio.to_thread(self.downsample)
+            except Exception as e:
+                self.logger.error(f"Failed to persist metrics: {e}")
+
+    async def flush(self) -> None:
+        """Write pending observations to disk (off the event loop)"""
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+        if pending:
+            await asyncio.to_thread(self._write, pending)
+
+    def _write(self, pending: Dict[Tuple[str, str, int], List[float]]) -> None:
+        rows = [
+            (series, session, self.base_resolution, bucket, int(c), s, lo, hi)
+            for (series, session, bucket), (c, s, lo, hi) in pending.items()
+        ]
+        with self._db_lock, self._db:
+            self._db.executemany(
+                """
+                INSERT INTO points (series, session, resolution, bucket, count, sum, min, max)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (series, session, resolution, bucket) DO UPDATE SET
+                    count = count + excluded.count,
+                    sum = sum + excluded.sum,
+                    min = MIN(min, excluded.min),
+                    max = MAX(max, excluded.max)
+                """,
+                rows
+            )
+
+    def downsample(self, now: Optional[float] = None) -> None:
+        """Roll complete base buckets up into coarser resolutions and apply retention"""
+        now = int(now or time.time())
+        with self._db_lock, self._db:
+            for resolution, _ in self.resolutions[1:]:
+                key = f"rolled_up_until:{resolution}"
+                row = self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+                since = int(row[0]) if row else 0
+                # Only complete periods, allowing for observations other sessions
+                # sharing this file have not flushed yet
+                until = int(now - 2 * self.flush_interval - self.base_resolution) // resolution * resolution
+                if until <= since:
+                    continue
+                self._db.execute(
+                    """
+                    INSERT OR REPLACE INTO points (series, session, resolution, bucket, count, sum, min, max)
+                    SELECT series, session, ?, bucket / ? * ?, SUM(count), SUM(sum), MIN(min), MAX(max)
+                    FROM points
+                    WHERE resolution = ? AND bucket >= ? AND bucket < ?
+                    GROUP BY series, session, bucket / ?
+                    """,
+                    (resolution, resolution, resolution, self.base_resolution, since, until, resolution)
+                )
+                self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(until)))
+
+            for resolution, retention in self.resolutions:
+                self._db.execute(
+                    "DELETE FROM points WHERE resolution = ? AND bucket < ?",
+                    (resolution, now - retention)
+                )
+
+    def _stored_resolution(self, resolution: Optional[int], start: float) -> int:
+        """Finest stored resolution whose retention covers start (and divides the requested one)"""
+        now = time.time()
+        usable = [
+            stored for stored, _ in self.resolutions
+            if resolution is None or resolution % stored == 0
+        ]
+        retained = [
+            stored for stored, retention in self.resolutions
+            if stored in usable and start >= now - retention
+        ]
+        return min(retained) if retained else max(usable)
+
+    def query(
+        self,
+        series: str,
+        start: float,
+        end: Optional[float] = None,
+        resolution: Optional[int] = None,
+        session: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Points of a series between two unix timestamps at a given resolution
+
+        The resolution (seconds) must be a multiple of the base resolution;
+        by default it is the finest stored resolution whose retention covers
+        `start`. Points come from that tier up to where it has been rolled up,
+        and from the base resolution after that, so recent periods not rolled
+        up yet are included. Without a session, points of all sessions are
+        combined.
+        Each point has bucket (start time), count, sum, min, max and avg.
+        """
+        end = end or time.time()
+        if resolution is not None and resolution % self.base_resolution:
+            raise ValueError(f"Resolution must be a multiple of {self.base_resolution}s")
+        stored = self._stored_resolution(resolution, start)
+        resolution = resolution or stored
+
+        with self._db_lock:
+            until = end
+            if stored != self.base_resolution:
+                row = self._db.execute(
+                    "SELECT value FROM meta WHERE key = ?", (f"rolled_up_until:{stored}",)
+                ).fetchone()
+                until = int(row[0]) if row else 0
+            rows = self._db.execute(
+                """
+                SELECT bucket / ? * ? AS b, SUM(count), SUM(sum), MIN(min), MAX(max)
+                FROM points
+                WHERE series = ? AND bucket >= ? AND bucket < ?
+                    AND ((resolution = ? AND bucket < ?) OR (resolution = ? AND bucket >= ?))
+                    AND (? IS NULL OR session = ?)
+                GROUP BY b ORDER BY b
+                """,
+                (resolution, resolution, series, int(start) // resolution * resolution, end,
+                 stored, until, self.base_resolution, until, session, session)
+            ).fetchall()
+        return [
+            {"bucket": b, "count": c, "sum": s, "min": lo, "max": hi, "avg": s / c if c else 0.0}
+            for b, c, s, lo, hi in rows
+        ]
+
+    def series(self, prefix: str = "", session: Optional[str] = None) -> List[str]:
+        """Names of all stored series, optionally filtered by prefix and session"""
+        with self._db_lock:
+            rows = self._db.execute(
+                """
+                SELECT DISTINCT series FROM points
+                WHERE series LIKE ? ESCAPE '\\' AND (? IS NULL OR session = ?)
+                ORDER BY series
+                """,
+                (prefix.replace("\\", "\\\\").replace("%", r"\%").replace("_", r"\_") + "%", session, session)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def sessions(self) -> List[str]:
+        """Sessions with stored points"""
+        with self._db_lock:
+            rows = self._db.execute(
+                "SELECT DISTINCT session FROM points WHERE session != '' ORDER BY session"
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def close(self) -> None:
+        with self._db_lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
@@ -0,0 +1,219 @@
+"""Lightweight span tracing with Chrome trace_event and OTLP-JSON export"""
+
+import asyncio
+import functools
+import json
+import os
+import secrets
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Union
+
+
+@dataclass
+class Span:
+    """A timed operation; spans nest through the current context"""
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    start_ns: int
+    end_ns: Optional[int] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+    # Task (or thread) the span started in, used as the Chrome trace row
+    lane: int = 0
+
+    @property
+    def duration(self) -> float:
+        """Duration in seconds (0 while still open)"""
+        return ((self.end_ns or self.start_ns) - self.start_ns) / 1e9
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_attributes(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def current_span() -> Optional[Span]:
+    """The innermost open span in this context, if tracing is enabled"""
+    return _current_span.get()
+
+
+class Tracer:
+    """Records spans for the process; disabled (near zero cost) until enabled
+
+    A span opened with no parent in the current context starts a new trace, so
+    each top-level `A1.ago` call becomes one trace. Finished spans are kept in a
+    bounded buffer and exported on demand.
+    """
+
+    def __init__(self, max_spans: int = 10000):
+        self.enabled = os.getenv("ARA_TRACE") == "1"
+        self.spans: Deque[Span] = deque(maxlen=max_spans)
+        # Spans finish on worker threads too (to_thread calls inside a span)
+        self._lock = threading.Lock()
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+        """Time the enclosed block as a child of the current span
+
+        Yields the span (None when tracing is disabled) so callers can add
+        attributes discovered along the way.
+        """
+        if not self.enabled:
+            yield None
+            return
+
+        parent = _current_span.get()
+        span = Span(
+            name=name,
+            trace_id=parent.trace_id if parent else secrets.token_hex(16),
+            span_id=secrets.token_hex(8),
+            parent_id=parent.span_id if parent else None,
+            start_ns=time.time_ns(),
+            attributes=attributes,
+            lane=_lane(),
+        )
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end_ns = time.time_ns()
+            with self._lock:
+                self.spans.append(span)
+
+    def traced(self, name: Optional[str] = None) -> Callable:
+        """Decorator wrapping an async function in a span"""
+        def decorate(func: Callable) -> Callable:
+            span_name = name or func.__qualname__
+
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return await func(*args, **kwargs)
+                with self.span(span_name):
+                    return await func(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def get_spans(self, trace_id: Optional[str] = None) -> List[Span]:
+        """Finished spans, optionally of a single trace"""
+        with self._lock:
+            return [s for s in self.spans if trace_id is None or s.trace_id == trace_id]
+
+    def clear(self) -> None:
+        with self._lock:
+            self.spans.clear()
+
+    def export_chrome(self, path: Union[str, Path], trace_id: Optional[str] = None) -> Path:
+        """Write spans as Chrome trace_event JSON (chrome://tracing, Perfetto)"""
+        return _write_json(path, to_chrome_trace(self.get_spans(trace_id)))
+
+    def export_otlp(
+        self,
+        path: Union[str, Path],
+        trace_id: Optional[str] = None,
+        service_name: str = "ara"
+    ) -> Path:
+        """Write spans as an OTLP-JSON ExportTraceServiceRequest"""
+        return _write_json(path, to_otlp_json(self.get_spans(trace_id), service_name))
+
+
+def _lane() -> int:
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    return id(task) if task is not None else threading.get_ident()
+
+
+def _write_json(path: Union[str, Path], payload: Dict[str, Any]) -> Path:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, default=str))
+    return path
+
+
+def to_chrome_trace(spans: List[Span]) -> Dict[str, Any]:
+    """Chrome trace_event format: one complete ("X") event per span, a row per task"""
+    pid = os.getpid()
+    lanes: Dict[int, int] = {}
+    events = []
+    for span in sorted(spans, key=lambda s: s.start_ns):
+        tid = lanes.setdefault(span.lane, len(lanes) + 1)
+        args = dict(span.attributes, trace_id=span.trace_id, span_id=span.span_id)
+        if span.error:
+            args["error"] = span.error
+        events.append({
+            "name": span.name,
+            "cat": span.name.split(".", 1)[0],
+            "ph": "X",
+            "ts": span.start_ns / 1000,
+            "dur": ((span.end_ns or span.start_ns) - span.start_ns) / 1000,
+            "pid": pid,
+            "tid": tid,
+            "args": args,
+        })
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def to_otlp_json(spans: List[Span], service_name: str = "ara") -> Dict[str, Any]:
+    """OTLP-JSON (OpenTelemetry protocol, JSON encoding) trace payload"""
+    otlp_spans = []
+    for span in spans:
+        item = {
+            "traceId": span.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(span.start_ns),
+            "endTimeUnixNano": str(span.end_ns or span.start_ns),
+            "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in span.attributes.items()],
+            # STATUS_CODE_OK = 1, STATUS_CODE_ERROR = 2
+            "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+        }
+        if span.parent_id:
+            item["parentSpanId"] = span.parent_id
+        otlp_spans.append(item)
+
+    return {
+        "resourceSpans": [{
+            "resource": {
+                "attributes": [{"key": "service.name", "value": {"stringValue": service_name}}]
+            },
+            "scopeSpans": [{"scope": {"name": "ara.monitoring.tracing"}, "spans": otlp_spans}],
+        }]
+    }
+
+
+tracer = Tracer()
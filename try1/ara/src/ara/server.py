@@ -1,28 +1,56 @@
 """FastAPI server for agent chat interface."""
 import asyncio
 import json
+import os
+import secrets
+import time
 import uuid
-from typing import Dict, List, Optional
+from pathlib import Path
+from typing import Any, Dict, List, Optional
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
-from fastapi.responses import HTMLResponse
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, status
+from fastapi.responses import HTMLResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 
 from ara.agent.core import A1
 from ara.behaviors.planning import PlanningBehavior
 from ara.behaviors.knowledge_management import KnowledgeManagementBehavior
+from ara.monitoring.metrics import MetricsCollector
+from ara.monitoring.prometheus import PrometheusWriter, merge_collectors
+from ara.monitoring.sketch import StreamingHistogram
+from ara.monitoring.loop_monitor import LoopLagMonitor
+from ara.monitoring.timeseries import TimeSeriesStore
+from ara.monitoring import memory
+from ara.ui.remote import MonitorStream
+
+# Reload edited behaviors inside live sessions instead of restarting the server
+HOT_RELOAD_BEHAVIORS = os.getenv("ARA_HOT_RELOAD") == "1"
+# Measure event-loop lag and capture stacks of code blocking it (shared by all sessions)
+MONITOR_LOOP = os.getenv("ARA_LOOP_MONITOR") == "1"
+# Expose /debug/memory* (heap sizes and allocation traces of every session)
+DEBUG_MEMORY = os.getenv("ARA_DEBUG_MEMORY") == "1"
+# Serve the /monitor stream (every session's messages and logs) to clients presenting this token
+MONITOR_TOKEN = os.getenv("ARA_MONITOR_TOKEN")
 
 class ChatSession:
     def __init__(self, session_id: str):
         self.session_id = session_id
         # let's create our new agent!
-        self.agent = A1(api_key=None)  # Will use env var OPENROUTER_API_KEY
+        self.agent = A1(  # Will use env var OPENROUTER_API_KEY
+            api_key=None,
+            hot_reload=HOT_RELOAD_BEHAVIORS,
+            session_id=session_id,
+            headless=True,
+            metrics_history=history
+        )
         self.agent.add_behavior(PlanningBehavior())
         self.agent.add_behavior(KnowledgeManagementBehavior())
         self.messages: List[dict] = []
         self.started = False
+        # Messages received but not yet answered
+        self.pending = 0
     
     async def start(self):
         """Start the agent session."""
@@ -37,14 +65,35 @@ class ChatSession:
             self.started = False
 
 
+class ServerStats:
+    """Server-level counters; per-session agent metrics are aggregated at scrape time"""
+    
+    def __init__(self):
+        self.started_at = time.time()
+        self.connections = 0
+        self.requests: Dict[str, int] = {"ok": 0, "error": 0}
+        self.request_duration = StreamingHistogram()
+        # Aggregates of sessions that have ended, so counters never go backwards
+        self.retired_metrics = MetricsCollector(raw_sample_size=0)
+        # Server-wide metrics not tied to a session (e.g. event-loop lag)
+        self.server_metrics = MetricsCollector(raw_sample_size=0)
+        self.loop_monitor = LoopLagMonitor(metrics=self.server_metrics) if MONITOR_LOOP else None
+    
+    def record_request(self, duration: float, ok: bool) -> None:
+        self.requests["ok" if ok else "error"] += 1
+        self.request_duration.add(duration)
+
+
 class ConnectionManager:
     def __init__(self):
         self.active_connections: Dict[str, WebSocket] = {}
         self.sessions: Dict[str, ChatSession] = {}
+        self.stats = ServerStats()
     
     async def connect(self, websocket: WebSocket, session_id: str):
         await websocket.accept()
         self.active_connections[session_id] = websocket
+        self.stats.connections += 1
         
         # Create new chat session with agent
         session = ChatSession(session_id)
@@ -60,6 +109,7 @@ class ConnectionManager:
         if session_id in self.sessions:
             session = self.sessions[session_id]
             await session.stop()
+            self.stats.retired_metrics.merge(session.agent.metrics)
             del self.sessions[session_id]
     
     async def send_message(self, message: str, session_id: str):
@@ -68,18 +118,59 @@ class ConnectionManager:
     
     def get_session(self, session_id: str) -> Optional[ChatSession]:
         return self.sessions.get(session_id)
+    
+    def render_metrics(self) -> str:
+        """All sessions' agent metrics plus server gauges in Prometheus text format"""
+        writer = PrometheusWriter()
+        stats = self.stats
+        writer.gauge("active_sessions", "Chat sessions with a running agent", [({}, len(self.sessions))])
+        writer.gauge("active_connections", "Open WebSocket connections", [({}, len(self.active_connections))])
+        writer.gauge(
+            "requests_in_progress",
+            "User messages received and not yet answered",
+            [({}, sum(session.pending for session in self.sessions.values()))]
+        )
+        writer.gauge("uptime_seconds", "Seconds since the server started", [({}, time.time() - stats.started_at)])
+        writer.counter("connections", "WebSocket connections accepted", [({}, stats.connections)])
+        writer.counter(
+            "requests",
+            "User messages handled by result",
+            [({"result": result}, n) for result, n in stats.requests.items()]
+        )
+        writer.histogram("request_duration_seconds", "Time to answer a user message", [({}, stats.request_duration)])
+        writer.write_collector(
+            merge_collectors(
+                [*(session.agent.metrics for session in self.sessions.values()), stats.server_metrics],
+                base=stats.retired_metrics
+            )
+        )
+        if stats.loop_monitor:
+            writer.counter("event_loop_stalls", "Times the event loop was blocked past the threshold",
+                           [({}, stats.loop_monitor.stall_count)])
+        return writer.render()
 
 
 manager = ConnectionManager()
+# One metric history store for the process, shared by all sessions (points are
+# labeled with their session) and read back by the /metrics/history endpoints
+history = TimeSeriesStore(Path("./dev-data") / "metrics" / "timeseries.sqlite")
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
+    if manager.stats.loop_monitor:
+        manager.stats.loop_monitor.start()
+    await asyncio.to_thread(history.open)
+    history.start()
     yield
+    if manager.stats.loop_monitor:
+        await manager.stats.loop_monitor.stop()
     # Shutdown - cleanup any remaining sessions
     for session_id in list(manager.sessions.keys()):
         await manager.disconnect(session_id)
+    await history.stop()
+    history.close()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -284,6 +375,128 @@ async def get():
     """)
 
 
+@app.get("/metrics")
+async def metrics():
+    return Response(manager.render_metrics(), media_type=PrometheusWriter.CONTENT_TYPE)
+
+
+@app.get("/metrics/history")
+async def metrics_history(
+    series: str,
+    start: float,
+    end: Optional[float] = None,
+    resolution: Optional[int] = None,
+    session: Optional[str] = None
+):
+    """Persisted points of one metric series between two unix timestamps (all sessions by default)"""
+    try:
+        points = await asyncio.to_thread(history.query, series, start, end, resolution, session)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"series": series, "points": points}
+
+
+@app.get("/metrics/history/series")
+async def metrics_history_series(prefix: str = "", session: Optional[str] = None):
+    """Names of the persisted metric series"""
+    return {"series": await asyncio.to_thread(history.series, prefix, session)}
+
+
+@app.get("/metrics/history/sessions")
+async def metrics_history_sessions():
+    """Sessions with persisted metric history"""
+    return {"sessions": await asyncio.to_thread(history.sessions)}
+
+
+@app.get("/debug/loop")
+async def loop_stalls():
+    """Event-loop lag statistics and recent stalls with the blocking stacks"""
+    if not manager.stats.loop_monitor:
+        raise HTTPException(status_code=404, detail="Loop monitor disabled (set ARA_LOOP_MONITOR=1)")
+    return manager.stats.loop_monitor.summary()
+
+
+def _require_memory_debug() -> None:
+    if not DEBUG_MEMORY:
+        raise HTTPException(status_code=404, detail="Memory debugging disabled (set ARA_DEBUG_MEMORY=1)")
+
+
+@app.get("/debug/memory")
+async def memory_report(census: bool = False, census_top: int = 20):
+    """Process memory and the size of each session's in-memory structures
+    
+    Sessions' structures are copied on the loop and measured in a worker
+    thread, as is the (slow) object census, so sessions keep being served.
+    """
+    _require_memory_debug()
+    structures = [memory.agent_structures(session.agent) for session in manager.sessions.values()]
+    
+    def measure() -> Dict[str, Any]:
+        return {
+            "process": memory.process_memory_report(census_top if census else None),
+            "sessions": {s["session_id"]: memory.measure_structures(s) for s in structures},
+        }
+    
+    return await asyncio.to_thread(measure)
+
+
+@app.post("/debug/memory/snapshots")
+async def take_memory_snapshot(label: Optional[str] = None):
+    """Take a tracemalloc snapshot (starts allocation tracing on first use)"""
+    _require_memory_debug()
+    label = await asyncio.to_thread(memory.snapshots.take, label)
+    return {"label": label, **memory.snapshots.status()}
+
+
+@app.get("/debug/memory/diff")
+async def memory_diff(before: str, after: str, top: int = 20, key_type: str = "lineno"):
+    """Largest allocation changes between two snapshots"""
+    _require_memory_debug()
+    try:
+        stats = await asyncio.to_thread(memory.snapshots.diff, before, after, top, key_type)
+        return {"before": before, "after": after, "stats": stats}
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@app.delete("/debug/memory/snapshots")
+async def stop_memory_tracing():
+    """Stop allocation tracing and drop all snapshots"""
+    _require_memory_debug()
+    memory.snapshots.stop()
+    return memory.snapshots.status()
+
+
+@app.websocket("/monitor")
+async def monitor_endpoint(websocket: WebSocket, session: Optional[str] = None, token: Optional[str] = None):
+    """Stream agent snapshots and logs of one session (or all) to a remote monitor
+    
+    Disabled unless ARA_MONITOR_TOKEN is set; clients must pass it as ?token=.
+    Attach the Textual monitor with: python -m ara.ui.remote ws://host:8000/monitor --token TOKEN
+    """
+    if not MONITOR_TOKEN or not secrets.compare_digest((token or "").encode(), MONITOR_TOKEN.encode()):
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    await websocket.accept()
+    stream = MonitorStream(lambda: {sid: s.agent for sid, s in manager.sessions.items()}, session=session)
+    stream.start()
+    
+    async def send() -> None:
+        while True:
+            await websocket.send_json(await stream.get())
+    
+    sender = asyncio.create_task(send())
+    try:
+        # Nothing is expected from the monitor; this notices when it goes away
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        stream.close()
+        sender.cancel()
+
+
 @app.websocket("/ws/{session_id}")
 async def websocket_endpoint(websocket: WebSocket, session_id: str):
     session = await manager.connect(websocket, session_id)
@@ -296,10 +509,13 @@ async def websocket_endpoint(websocket: WebSocket, session_id: str):
             
             if message_data.get("type") == "user_message":
                 user_message = message_data.get("content", "")
+                session.pending += 1
+                started = time.perf_counter()
                 
                 try:
                     # Get agent response
                     response = await session.agent.ago(user_message)
+                    manager.stats.record_request(time.perf_counter() - started, ok=True)
                     
                     # Send agent response back to client
                     await manager.send_message(
@@ -311,6 +527,7 @@ async def websocket_endpoint(websocket: WebSocket, session_id: str):
                     )
                     
                 except Exception as e:
+                    manager.stats.record_request(time.perf_counter() - started, ok=False)
                     # Send error message
                     await manager.send_message(
                         json.dumps({
@@ -319,6 +536,8 @@ async def websocket_endpoint(websocket: WebSocket, session_id: str):
                         }),
                         session_id
                     )
+                finally:
+                    session.pending -= 1
                     
     except WebSocketDisconnect:
         await manager.disconnect(session_id)
@@ -329,6 +548,7 @@ if __name__ == "__main__":
         "ara.server:app",
         host="0.0.0.0", 
         port=8000,
-        reload=True,
+        # Process reloads would drop live sessions; behaviors hot reload instead
+        reload=not HOT_RELOAD_BEHAVIORS,
         reload_dirs=["src"]
     )
\ No newline at end of file
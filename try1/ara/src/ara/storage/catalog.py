@@ -0,0 +1,150 @@
+"""Catalog of saved conversations with per-message byte offsets"""
+
+import asyncio
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import aiofiles
+from loguru import logger
+
+
+class ConversationCatalog:
+    """Index of conversation files maintained on write
+
+    Each save appends one JSON line to ``episodic/catalog.jsonl`` describing the
+    file: session id, time range, message count and the byte ranges of the
+    message sections added since the session's previous save (``first_turn``
+    is the index of the first one), so the catalog grows with the
+    conversation rather than with every snapshot of it. In memory, entries
+    are merged into one per session whose turns point into the files they
+    were first written to; queries then read just the byte ranges they need
+    instead of whole files.
+    """
+
+    def __init__(self, episodic_path: Path):
+        self.episodic_path = episodic_path
+        self.path = episodic_path / "catalog.jsonl"
+        # session_id -> merged entry, in order of last write
+        self._sessions: Dict[str, Dict[str, Any]] = {}
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+
+    async def _load(self) -> None:
+        """Load the catalog from disk once (off the event loop)"""
+        if self._loaded:
+            return
+        async with self._load_lock:
+            if self._loaded:
+                return
+            for entry in await asyncio.to_thread(self._read_entries):
+                self._index(entry)
+            self._loaded = True
+        logger.debug(f"Loaded conversation catalog with {len(self._sessions)} sessions")
+
+    def _read_entries(self) -> List[Dict[str, Any]]:
+        if not self.path.exists():
+            return []
+        with open(self.path, "r") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def _index(self, entry: Dict[str, Any]) -> None:
+        first_turn = entry.pop("first_turn", 0)
+        turns = [{**turn, "file": entry["file"]} for turn in entry["turns"]]
+        previous = self._sessions.pop(entry["session_id"], None)
+        if previous:
+            # Keep the session's original start time across snapshots
+            entry["start"] = min(previous["start"], entry["start"])
+            turns = previous["turns"][:first_turn] + turns
+        entry["turns"] = turns
+        self._sessions[entry["session_id"]] = entry
+
+    async def record(
+        self,
+        session_id: str,
+        filename: str,
+        timestamp: str,
+        turns: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Record a conversation file just written (a snapshot of the whole session)"""
+        await self._load()
+        # Earlier messages were recorded with the previous snapshot; their
+        # byte ranges in that file stay valid, so only new turns are written
+        previous = self._sessions.get(session_id)
+        first_turn = 0
+        if previous and len(turns) >= previous["message_count"]:
+            first_turn = previous["message_count"]
+        entry = {
+            "session_id": session_id,
+            "file": filename,
+            "start": timestamp,
+            "end": timestamp,
+            "message_count": len(turns),
+            "first_turn": first_turn,
+            "turns": turns[first_turn:],
+        }
+
+        async with aiofiles.open(self.path, "a") as f:
+            await f.write(json.dumps(entry) + "\n")
+
+        self._index(entry)
+        return entry
+
+    async def sessions(self) -> List[Dict[str, Any]]:
+        """Catalog entry for every session, most recently written first"""
+        await self._load()
+        return list(reversed(self._sessions.values()))
+
+    async def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        await self._load()
+        return self._sessions.get(session_id)
+
+    async def recent_turns(
+        self,
+        limit: int,
+        roles: Sequence[str] = ("user", "assistant"),
+        max_bytes: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Most recent turns across sessions, oldest first, reading only their bytes
+
+        Args:
+            limit: Maximum number of turns to return
+            roles: Message roles to include
+            max_bytes: Stop before the combined turn size exceeds this
+        """
+        selected: List[Dict[str, Any]] = []
+        total = 0
+        for entry in await self.sessions():
+            for turn in reversed(entry["turns"]):
+                if turn["role"] not in roles:
+                    continue
+                if max_bytes is not None and total + turn["length"] > max_bytes and selected:
+                    return await self._read_turns(reversed(selected))
+                selected.append({**turn, "session_id": entry["session_id"]})
+                total += turn["length"]
+                if len(selected) >= limit:
+                    return await self._read_turns(reversed(selected))
+        return await self._read_turns(reversed(selected))
+
+    async def _read_turns(self, turns: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        results = []
+        handles: Dict[str, Any] = {}
+        try:
+            for turn in turns:
+                f = handles.get(turn["file"])
+                if f is None:
+                    path = self.episodic_path / turn["file"]
+                    if not path.exists():
+                        continue
+                    f = handles[turn["file"]] = await aiofiles.open(path, "rb")
+                await f.seek(turn["offset"])
+                data = await f.read(turn["length"])
+                results.append({
+                    "session_id": turn["session_id"],
+                    "role": turn["role"],
+                    "content": data.decode("utf-8", errors="replace"),
+                })
+        finally:
+            for f in handles.values():
+                await f.close()
+        return results
@@ -0,0 +1,236 @@
+"""In-memory registry of known entities with fuzzy name resolution"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple, Any
+from collections import defaultdict
+
+
+# Maps common nicknames to a canonical first name so "Bob" and "Robert" resolve together
+NICKNAMES = {
+    "bob": "robert", "bobby": "robert", "rob": "robert", "robbie": "robert",
+    "bill": "william", "billy": "william", "will": "william", "liam": "william",
+    "jim": "james", "jimmy": "james", "jamie": "james",
+    "mike": "michael", "mikey": "michael",
+    "dave": "david", "davey": "david",
+    "tom": "thomas", "tommy": "thomas",
+    "chris": "christopher",
+    "alex": "alexander",
+    "sam": "samuel",
+    "joe": "joseph", "joey": "joseph",
+    "dan": "daniel", "danny": "daniel",
+    "matt": "matthew",
+    "nick": "nicholas",
+    "tony": "anthony",
+    "steve": "steven",
+    "andy": "andrew", "drew": "andrew",
+    "ben": "benjamin",
+    "ed": "edward", "eddie": "edward", "ted": "edward",
+    "rick": "richard", "dick": "richard", "rich": "richard",
+    "greg": "gregory",
+    "liz": "elizabeth", "beth": "elizabeth", "lizzie": "elizabeth", "betty": "elizabeth",
+    "kate": "katherine", "katie": "katherine", "kathy": "katherine",
+    "jen": "jennifer", "jenny": "jennifer",
+    "meg": "margaret", "maggie": "margaret", "peggy": "margaret",
+    "sue": "susan", "susie": "susan",
+    "becky": "rebecca",
+    "vicky": "victoria",
+}
+
+_HONORIFICS = frozenset(["mr", "mrs", "ms", "miss", "dr", "prof", "sir"])
+
+ENTITY_CATEGORIES = {
+    "person": "dossiers/people",
+    "project": "dossiers/projects",
+    "concept": "dossiers/concepts",
+}
+
+
+def normalize_name(name: str, entity_type: str = "") -> str:
+    """Normalize an entity name for comparison (case, punctuation, honorifics, nicknames)"""
+    tokens = re.sub(r"[^\w\s]", " ", name.lower()).split()
+    if entity_type == "person":
+        tokens = [t for t in tokens if t not in _HONORIFICS] or tokens
+        tokens = [NICKNAMES.get(t, t) for t in tokens]
+    return " ".join(tokens)
+
+
+def slugify(name: str) -> str:
+    """Derive a filesystem-safe slug from an entity name"""
+    slug = re.sub(r'[^\w\s-]', '', name.lower())
+    return re.sub(r'[-\s]+', '_', slug).strip("_") or "unnamed"
+
+
+def _trigrams(text: str) -> Set[str]:
+    """Character trigrams of a normalized name, padded so short names still match"""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+@dataclass
+class EntityRecord:
+    """A known entity and the names it has been seen under"""
+    entity_type: str
+    slug: str
+    name: str
+    aliases: Set[str] = field(default_factory=set)
+
+    @property
+    def category(self) -> str:
+        """Storage category holding this entity's dossier"""
+        return ENTITY_CATEGORIES[self.entity_type]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "type": self.entity_type,
+            "slug": self.slug,
+            "name": self.name,
+            "aliases": sorted(self.aliases),
+        }
+
+
+class EntityRegistry:
+    """Resolves entity mentions to dossiers in memory using normalized names and trigram similarity"""
+
+    def __init__(self, similarity_threshold: float = 0.7):
+        self.similarity_threshold = similarity_threshold
+        self.records: Dict[Tuple[str, str], EntityRecord] = {}
+        # (type, normalized alias) -> slug
+        self._aliases: Dict[Tuple[str, str], str] = {}
+        # (type, trigram) -> slugs
+        self._trigram_index: Dict[Tuple[str, str], Set[str]] = defaultdict(set)
+        # (type, first token) -> slugs, for matching a lone first name to a full name
+        self._first_names: Dict[Tuple[str, str], Set[str]] = defaultdict(set)
+        self.dirty = False
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def get(self, entity_type: str, slug: str) -> Optional[EntityRecord]:
+        return self.records.get((entity_type, slug))
+
+    def resolve(self, entity_type: str, name: str) -> Optional[EntityRecord]:
+        """Find the existing record a mention refers to, if any"""
+        normalized = normalize_name(name, entity_type)
+        if not normalized:
+            return None
+
+        # Exact alias match
+        slug = self._aliases.get((entity_type, normalized))
+        if slug:
+            return self.records[(entity_type, slug)]
+
+        # A lone first name matches a full name only when it is unambiguous
+        if entity_type == "person" and " " not in normalized:
+            candidates = self._first_names.get((entity_type, normalized), set())
+            if len(candidates) == 1:
+                return self.records[(entity_type, next(iter(candidates)))]
+
+        best = self._best_fuzzy_match(entity_type, normalized)
+        return best[1] if best else None
+
+    def register(self, entity_type: str, name: str) -> EntityRecord:
+        """Create a record for a new entity, choosing a slug that does not collide"""
+        base_slug = slugify(name)
+        slug = base_slug
+        suffix = 2
+        while (entity_type, slug) in self.records:
+            slug = f"{base_slug}_{suffix}"
+            suffix += 1
+
+        record = EntityRecord(entity_type=entity_type, slug=slug, name=name)
+        self.records[(entity_type, slug)] = record
+        self.add_alias(record, name)
+        return record
+
+    def add_alias(self, record: EntityRecord, name: str) -> None:
+        """Remember another name a record is known by"""
+        normalized = normalize_name(name, record.entity_type)
+        if not normalized or normalized in record.aliases:
+            return
+
+        record.aliases.add(normalized)
+        self._aliases[(record.entity_type, normalized)] = record.slug
+        for gram in _trigrams(normalized):
+            self._trigram_index[(record.entity_type, gram)].add(record.slug)
+        if record.entity_type == "person":
+            self._first_names[(record.entity_type, normalized.split()[0])].add(record.slug)
+        self.dirty = True
+
+    def remove(self, record: EntityRecord) -> None:
+        """Drop a record and all its index entries"""
+        self.records.pop((record.entity_type, record.slug), None)
+        for alias in record.aliases:
+            if self._aliases.get((record.entity_type, alias)) == record.slug:
+                del self._aliases[(record.entity_type, alias)]
+            for gram in _trigrams(alias):
+                self._trigram_index[(record.entity_type, gram)].discard(record.slug)
+            if record.entity_type == "person":
+                self._first_names[(record.entity_type, alias.split()[0])].discard(record.slug)
+        self.dirty = True
+
+    def merge(self, primary: EntityRecord, duplicate: EntityRecord) -> None:
+        """Fold a duplicate record's aliases into primary and drop the duplicate"""
+        aliases = set(duplicate.aliases)
+        self.remove(duplicate)
+        for alias in aliases:
+            self.add_alias(primary, alias)
+
+    def find_duplicates(self) -> List[Tuple[EntityRecord, EntityRecord, float]]:
+        """Find pairs of records that likely refer to the same entity"""
+        pairs = []
+        seen: Set[Tuple[str, str, str]] = set()
+        for (entity_type, slug), record in list(self.records.items()):
+            for alias in record.aliases:
+                for other_slug, score in self._candidates(entity_type, alias):
+                    if other_slug == slug:
+                        continue
+                    key = (entity_type, *sorted((slug, other_slug)))
+                    if key in seen or score < self.similarity_threshold:
+                        continue
+                    seen.add(key)
+                    pairs.append((record, self.records[(entity_type, other_slug)], score))
+        return pairs
+
+    def _best_fuzzy_match(self, entity_type: str, normalized: str) -> Optional[Tuple[float, EntityRecord]]:
+        best: Optional[Tuple[float, EntityRecord]] = None
+        for slug, score in self._candidates(entity_type, normalized):
+            if score >= self.similarity_threshold and (best is None or score > best[0]):
+                best = (score, self.records[(entity_type, slug)])
+        return best
+
+    def _candidates(self, entity_type: str, normalized: str) -> List[Tuple[str, float]]:
+        """Records sharing trigrams with a name, scored by best alias Jaccard similarity"""
+        grams = _trigrams(normalized)
+        shared: Dict[str, int] = defaultdict(int)
+        for gram in grams:
+            for slug in self._trigram_index.get((entity_type, gram), ()):
+                shared[slug] += 1
+
+        results = []
+        for slug in shared:
+            record = self.records.get((entity_type, slug))
+            if not record:
+                continue
+            score = max(
+                len(grams & other) / len(grams | other)
+                for other in (_trigrams(alias) for alias in record.aliases)
+            )
+            results.append((slug, score))
+        return results
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"entities": [record.to_dict() for record in self.records.values()]}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], **kwargs) -> "EntityRegistry":
+        registry = cls(**kwargs)
+        for item in data.get("entities", []):
+            if item.get("type") not in ENTITY_CATEGORIES:
+                continue
+            record = EntityRecord(entity_type=item["type"], slug=item["slug"], name=item["name"])
+            registry.records[(record.entity_type, record.slug)] = record
+            for alias in item.get("aliases", []) or [item["name"]]:
+                registry.add_alias(record, alias)
+        registry.dirty = False
+        return registry
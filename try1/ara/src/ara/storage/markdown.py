@@ -1,5 +1,7 @@
 """Markdown-based storage system for agent data"""
 
+import os
+import uuid
 import yaml
 import json
 from pathlib import Path
@@ -8,13 +10,18 @@ from typing import List, Dict, Any, Optional
 import aiofiles
 from loguru import logger
 
+from .catalog import ConversationCatalog
+from ..monitoring.tracing import tracer
+
 
 class MarkdownStorage:
     """Handles markdown-based storage for agent memory and data"""
     
-    def __init__(self, base_path: Path):
+    def __init__(self, base_path: Path, session_id: Optional[str] = None):
         self.base_path = base_path
+        self.session_id = session_id or uuid.uuid4().hex
         self._ensure_structure()
+        self.catalog = ConversationCatalog(self.base_path / "episodic")
     
     def _ensure_structure(self):
         """Ensure the storage directory structure exists"""
@@ -32,13 +39,17 @@ class MarkdownStorage:
         for dir_name in directories:
             (self.base_path / dir_name).mkdir(parents=True, exist_ok=True)
     
+    @tracer.traced("storage.save_conversation")
     async def save_conversation(self, messages: List[Any]) -> None:
-        """Save conversation to episodic memory"""
+        """Save conversation to episodic memory and record it in the catalog"""
         timestamp = datetime.now().isoformat()
         filename = f"conversation_{timestamp.replace(':', '-')}.md"
         path = self.base_path / "episodic" / filename
         
-        content = f"# Conversation - {timestamp}\n\n"
+        # Build the file as encoded sections so each message's byte range is known
+        chunks = [f"# Conversation - {timestamp}\n\n".encode("utf-8")]
+        offset = len(chunks[0])
+        turns = []
         
         for msg in messages:
             msg_dict = msg.model_dump(exclude_none=True) if hasattr(msg, 'model_dump') else msg
@@ -46,28 +57,40 @@ class MarkdownStorage:
             content_text = msg_dict.get("content", "")
             
             if role == "user":
-                content += f"## User\n{content_text}\n\n"
+                section = f"## User\n{content_text}\n\n"
             elif role == "assistant":
-                content += f"## Assistant\n{content_text}\n\n"
+                section = f"## Assistant\n{content_text}\n\n"
                 if msg_dict.get("tool_calls"):
-                    content += "### Tool Calls\n```json\n"
-                    content += json.dumps(msg_dict["tool_calls"], indent=2)
-                    content += "\n```\n\n"
+                    section += "### Tool Calls\n```json\n"
+                    section += json.dumps(msg_dict["tool_calls"], indent=2)
+                    section += "\n```\n\n"
             elif role == "tool":
-                content += f"### Tool Result\n```\n{content_text}\n```\n\n"
+                section = f"### Tool Result\n```\n{content_text}\n```\n\n"
+            else:
+                continue
+            
+            data = section.encode("utf-8")
+            chunks.append(data)
+            turns.append({"role": role, "offset": offset, "length": len(data)})
+            offset += len(data)
         
-        async with aiofiles.open(path, 'w') as f:
-            await f.write(content)
+        async with aiofiles.open(path, 'wb') as f:
+            await f.write(b"".join(chunks))
+        
+        await self.catalog.record(self.session_id, filename, timestamp, turns)
         
         logger.debug(f"Saved conversation to {path}")
     
+    @tracer.traced("storage.save_yaml")
     async def save_yaml(self, category: str, name: str, data: Dict[str, Any]) -> None:
-        """Save data as YAML file"""
+        """Save data as YAML file (atomically, so readers never see a partial file)"""
         path = self.base_path / category / f"{name}.yaml"
         path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.tmp")
         
-        async with aiofiles.open(path, 'w') as f:
+        async with aiofiles.open(tmp_path, 'w') as f:
             await f.write(yaml.dump(data, default_flow_style=False))
+        os.replace(tmp_path, path)
         
         logger.debug(f"Saved YAML to {path}")
     
@@ -82,6 +105,19 @@ class MarkdownStorage:
             content = await f.read()
             return yaml.safe_load(content)
     
+    @tracer.traced("storage.delete_yaml")
+    async def delete_yaml(self, category: str, name: str) -> bool:
+        """Delete a YAML file, returning whether it existed"""
+        path = self.base_path / category / f"{name}.yaml"
+        
+        if not path.exists():
+            return False
+        
+        path.unlink()
+        logger.debug(f"Deleted YAML {path}")
+        return True
+    
+    @tracer.traced("storage.save_markdown")
     async def save_markdown(self, category: str, name: str, content: str) -> None:
         """Save content as markdown file"""
         path = self.base_path / category / f"{name}.md"
@@ -92,6 +128,20 @@ class MarkdownStorage:
         
         logger.debug(f"Saved markdown to {path}")
     
+    @tracer.traced("storage.append_markdown")
+    async def append_markdown(self, category: str, name: str, content: str, header: str = "") -> None:
+        """Append content to a markdown file, writing header first if the file is new"""
+        path = self.base_path / category / f"{name}.md"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        
+        if header and not path.exists():
+            content = header + content
+        
+        async with aiofiles.open(path, 'a') as f:
+            await f.write(content)
+        
+        logger.debug(f"Appended markdown to {path}")
+    
     async def load_markdown(self, category: str, name: str) -> Optional[str]:
         """Load content from markdown file"""
         path = self.base_path / category / f"{name}.md"
@@ -110,6 +160,7 @@ class MarkdownStorage:
         
         return list(path.glob(pattern))
     
+    @tracer.traced("storage.append_to_log")
     async def append_to_log(self, log_name: str, entry: Dict[str, Any]) -> None:
         """Append an entry to a log file"""
         path = self.base_path / "logs" / f"{log_name}.jsonl"
@@ -118,6 +169,30 @@ class MarkdownStorage:
         async with aiofiles.open(path, 'a') as f:
             await f.write(json.dumps(entry) + '\n')
     
+    @tracer.traced("storage.extend_log")
+    async def extend_log(self, log_name: str, entries: List[Dict[str, Any]]) -> None:
+        """Append several entries to a log file in a single write"""
+        if not entries:
+            return
+        
+        path = self.base_path / "logs" / f"{log_name}.jsonl"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        
+        async with aiofiles.open(path, 'a') as f:
+            await f.write("".join(json.dumps(entry) + '\n' for entry in entries))
+    
+    @tracer.traced("storage.delete_log")
+    async def delete_log(self, log_name: str) -> bool:
+        """Delete a log file, returning whether it existed"""
+        path = self.base_path / "logs" / f"{log_name}.jsonl"
+        
+        if not path.exists():
+            return False
+        
+        path.unlink()
+        logger.debug(f"Deleted log {path}")
+        return True
+    
     async def read_log(self, log_name: str) -> List[Dict[str, Any]]:
         """Read entries from a log file"""
         path = self.base_path / "logs" / f"{log_name}.jsonl"
@@ -0,0 +1,175 @@
+"""Typed in-memory user model with debounced YAML persistence"""
+
+import asyncio
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Set, TYPE_CHECKING
+
+from pydantic import BaseModel, ConfigDict, Field
+from loguru import logger
+
+if TYPE_CHECKING:
+    from .markdown import MarkdownStorage
+
+
+class _Section(BaseModel):
+    """Base for user model sections; unknown keys found on disk are preserved"""
+    model_config = ConfigDict(extra="allow")
+
+
+class PersonalityTraits(_Section):
+    openness: float = 0.5
+    conscientiousness: float = 0.5
+    extraversion: float = 0.5
+    agreeableness: float = 0.5
+    neuroticism: float = 0.5
+    traits: List[Any] = Field(default_factory=list)
+    last_updated: str = Field(default_factory=lambda: datetime.now().isoformat())
+
+
+class CommunicationPreferences(_Section):
+    formality_level: str = "neutral"
+    preferred_length: str = "balanced"
+    technical_depth: str = "moderate"
+    response_style: str = "conversational"
+    observed_patterns: List[Any] = Field(default_factory=list)
+
+
+class Dislikes(_Section):
+    topics: List[Any] = Field(default_factory=list)
+    approaches: List[Any] = Field(default_factory=list)
+    patterns: List[Any] = Field(default_factory=list)
+
+
+class InferredTraits(_Section):
+    interests: List[Any] = Field(default_factory=list)
+    expertise_areas: List[Any] = Field(default_factory=list)
+    communication_style: Dict[str, Any] = Field(default_factory=dict)
+    behavioral_patterns: List[Any] = Field(default_factory=list)
+
+
+class RecentTopic(_Section):
+    message: str
+    timestamp: str
+
+
+class ContextualState(_Section):
+    current_goal: Optional[str] = None
+    emotional_state: str = "neutral"
+    recent_topics: List[RecentTopic] = Field(default_factory=list)
+    session_start: str = Field(default_factory=lambda: datetime.now().isoformat())
+
+
+class UserModel(BaseModel):
+    """The full user model; each field is persisted as user_model/<field>.yaml"""
+    personality_traits: PersonalityTraits = Field(default_factory=PersonalityTraits)
+    communication_preferences: CommunicationPreferences = Field(default_factory=CommunicationPreferences)
+    dislikes: Dislikes = Field(default_factory=Dislikes)
+    inferred_traits: InferredTraits = Field(default_factory=InferredTraits)
+    contextual_state: ContextualState = Field(default_factory=ContextualState)
+
+
+SECTIONS = list(UserModel.model_fields)
+
+ChangeCallback = Callable[[str, UserModel], None]
+
+
+class UserModelStore:
+    """Holds the user model in memory, notifies subscribers and persists changes in the background
+
+    Writers mutate `model` and call `mark_changed(section)`; readers use `model`
+    directly and never touch disk. Dirty sections are written atomically after
+    `debounce` seconds of quiet, or immediately on `flush()`.
+    """
+
+    CATEGORY = "user_model"
+
+    def __init__(self, storage: "MarkdownStorage", debounce: float = 2.0):
+        self.storage = storage
+        self.debounce = debounce
+        self.model = UserModel()
+        self.loaded = False
+        self._dirty: Set[str] = set()
+        self._subscribers: List[ChangeCallback] = []
+        # Pending debounce timer, and the save it started
+        self._save_handle: Optional[asyncio.TimerHandle] = None
+        self._save_task: Optional[asyncio.Task] = None
+        self._load_lock = asyncio.Lock()
+
+    async def load(self) -> UserModel:
+        """Load all sections from disk once; missing sections are created with defaults"""
+        async with self._load_lock:
+            if self.loaded:
+                return self.model
+
+            values: Dict[str, Any] = {}
+            for section in SECTIONS:
+                data = await self.storage.load_yaml(self.CATEGORY, section)
+                if data is None:
+                    self._dirty.add(section)
+                else:
+                    values[section] = data
+
+            self.model = UserModel.model_validate(values)
+            self.loaded = True
+
+        if self._dirty:
+            await self.flush()
+        return self.model
+
+    def subscribe(self, callback: ChangeCallback) -> None:
+        """Register a callback invoked as callback(section, model) after each change"""
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: ChangeCallback) -> None:
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def mark_changed(self, *sections: str) -> None:
+        """Record in-memory changes to sections, notify subscribers and schedule a save"""
+        for section in sections:
+            if section not in SECTIONS:
+                raise ValueError(f"Unknown user model section: {section}")
+            self._dirty.add(section)
+            for callback in list(self._subscribers):
+                try:
+                    callback(section, self.model)
+                except Exception as e:
+                    logger.error(f"User model subscriber failed for {section}: {e}")
+
+        # Debounce: every change restarts the quiet period
+        if self._save_handle is not None:
+            self._save_handle.cancel()
+        self._save_handle = asyncio.get_running_loop().call_later(self.debounce, self._start_save)
+
+    def _start_save(self) -> None:
+        self._save_handle = None
+        self._save_task = asyncio.create_task(self.flush())
+        self._save_task.add_done_callback(self._save_done)
+
+    @staticmethod
+    def _save_done(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Failed to save user model: {task.exception()}")
+
+    async def flush(self) -> None:
+        """Write all dirty sections now"""
+        dirty, self._dirty = sorted(self._dirty), set()
+        for i, section in enumerate(dirty):
+            data = getattr(self.model, section).model_dump(mode="json")
+            try:
+                await self.storage.save_yaml(self.CATEGORY, section, data)
+            except BaseException:
+                # Keep unsaved sections dirty for the next attempt
+                self._dirty.update(dirty[i:])
+                raise
+
+    async def close(self) -> None:
+        """Cancel any pending debounce and persist outstanding changes"""
+        if self._save_handle is not None:
+            self._save_handle.cancel()
+            self._save_handle = None
+        if self._save_task and not self._save_task.done():
+            # Let an in-flight save finish; its failure is logged by _save_done
+            await asyncio.wait({self._save_task})
+        self._save_task = None
+        await self.flush()
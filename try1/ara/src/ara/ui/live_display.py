@@ -1,6 +1,5 @@
 """Live terminal display for monitoring behaviors and activities"""
 
-import asyncio
 from typing import TYPE_CHECKING, Optional, List
 from datetime import datetime
 from rich.live import Live
@@ -13,6 +12,8 @@ from rich.text import Text
 from rich.align import Align
 from loguru import logger
 
+from ..events import CoalescedRenderer, Event, EventSubscription, event_bus
+
 if TYPE_CHECKING:
     from ..agent.core import A1
     from ..behaviors.base import Activity, ActivityStatus
@@ -25,7 +26,8 @@ class LiveDisplay:
         self.agent = agent
         self.live: Optional[Live] = None
         self._running = False
-        self._update_task: Optional[asyncio.Task] = None
+        self._renderer: Optional[CoalescedRenderer] = None
+        self._event_subscription: Optional[EventSubscription] = None
         self.selected_activity_id: Optional[str] = None
         self.log_buffer: List[str] = []
         self.max_log_lines = 20
@@ -37,14 +39,15 @@ class LiveDisplay:
         
         self._running = True
         self.layout = self._create_layout()
-        self.live = Live(self.layout, refresh_per_second=2, screen=True)
+        # Redrawn only when something changed, at most twice a second
+        self.live = Live(self.layout, auto_refresh=False, screen=True)
         self.live.start()
+        self._renderer = CoalescedRenderer(self._render, max_rate=2.0)
+        self._event_subscription = event_bus.subscribe(self._on_event, session=self.agent.session_id)
+        self._renderer.mark_dirty()
         
         # Add loguru handler to capture logs
         self._setup_log_handler()
-        
-        # Start update loop
-        self._update_task = asyncio.create_task(self._update_loop())
         logger.info("Started live display")
     
     async def stop(self) -> None:
@@ -54,12 +57,12 @@ class LiveDisplay:
         
         self._running = False
         
-        if self._update_task:
-            self._update_task.cancel()
-            try:
-                await self._update_task
-            except asyncio.CancelledError:
-                pass
+        if self._event_subscription:
+            event_bus.unsubscribe(self._event_subscription)
+            self._event_subscription = None
+        if self._renderer:
+            self._renderer.cancel()
+            self._renderer = None
         
         if self.live:
             self.live.stop()
@@ -95,14 +98,23 @@ class LiveDisplay:
         
         return layout
     
-    async def _update_loop(self) -> None:
-        """Update the display periodically"""
-        while self._running:
-            try:
-                self._update_display()
-                await asyncio.sleep(0.5)
-            except Exception as e:
-                logger.error(f"Error updating display: {e}")
+    def _on_event(self, event: Event) -> None:
+        """Any agent event may change what is shown"""
+        if self._renderer:
+            self._renderer.mark_dirty()
+    
+    def _render(self) -> None:
+        """Redraw the layout (called by the renderer once per batch of changes)"""
+        self._update_display()
+        self.live.refresh()
+        
+        # Running activities show their elapsed time; advance it while any run
+        if self._renderer and any(
+            activity.status.value == "running"
+            for behavior in self.agent.behavior_manager.behaviors.values()
+            for activity in behavior.activities.values()
+        ):
+            self._renderer.mark_dirty_later(1.0)
     
     def _update_display(self) -> None:
         """Update all display components"""
@@ -217,7 +229,7 @@ class LiveDisplay:
         # Logs
         if activity.logs:
             detail_parts.append("\n[bold]Activity Logs:[/bold]")
-            for log in activity.logs[-10:]:  # Last 10 logs
+            for log in list(activity.logs)[-10:]:  # Last 10 logs
                 detail_parts.append(f"  {log}")
         
         content = "\n".join(detail_parts)
@@ -295,6 +307,8 @@ class LiveDisplay:
         self.log_buffer.append(f"[{timestamp}] {message}")
         if len(self.log_buffer) > self.max_log_lines * 2:
             self.log_buffer = self.log_buffer[-self.max_log_lines:]
+        if self._renderer:
+            self._renderer.mark_dirty()
     
     def _setup_log_handler(self) -> None:
         """Set up loguru handler to capture logs"""
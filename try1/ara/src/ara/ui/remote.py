@@ -0,0 +1,413 @@
+"""Remote monitoring: stream agent state over a WebSocket and attach the Textual monitor to it
+
+Server side, a MonitorStream feeds one /monitor connection with JSON messages:
+
+    {"type": "hello", "protocol": 1, "sessions": [...]}
+    {"type": "snapshot", "session": id, "agent": {...}}   whenever the session changed (coalesced)
+    {"type": "log", "session": id, "record": {...}}
+    {"type": "session.ended", "session": id}
+
+Client side, RemoteAgent mirrors one session with the attributes the monitor
+widgets read from A1, so ARAMonitorApp runs unchanged against it:
+
+    python -m ara.ui.remote ws://localhost:8000/monitor [--session ID] [--list] [--token TOKEN]
+
+The server only serves /monitor when ARA_MONITOR_TOKEN is set, and only to
+clients presenting that token (it streams every session's messages and logs).
+"""
+
+import argparse
+import asyncio
+import json
+import os
+from collections import deque
+from dataclasses import asdict
+from datetime import datetime
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Set
+from urllib.parse import urlencode
+
+from ..events import (
+    ACTIVITY_FINISHED, ACTIVITY_STARTED, BEHAVIOR_CHANGED, MESSAGE_APPENDED, METRIC_RECORDED, SESSION_ENDED,
+    CoalescedRenderer, Event, event_bus
+)
+from ..logging import LogMessage, get_logger, log_router, log_session
+from .terminal import shorten_values, truncate_text
+
+if TYPE_CHECKING:
+    from ..agent.core import A1
+    from ..behaviors.base import Activity
+
+PROTOCOL_VERSION = 1
+
+# Bounds on what a snapshot carries; the monitor only shows recent state
+SNAPSHOT_MESSAGES = 20
+SNAPSHOT_ACTIVITIES = 5
+SNAPSHOT_ACTIVITY_LOGS = 20
+SNAPSHOT_TEXT_CHARS = 2000
+SNAPSHOT_ARG_CHARS = 200
+
+
+def activity_to_dict(activity: "Activity", log_lines: int = SNAPSHOT_ACTIVITY_LOGS) -> Dict[str, Any]:
+    return {
+        "id": activity.id,
+        "name": activity.name,
+        "status": activity.status.value,
+        "start_time": activity.start_time.isoformat() if activity.start_time else None,
+        "end_time": activity.end_time.isoformat() if activity.end_time else None,
+        "error": activity.error,
+        "logs": [
+            {"time": entry.time.isoformat(), "message": truncate_text(entry.text, SNAPSHOT_TEXT_CHARS)}
+            for entry in list(activity.logs)[-log_lines:]
+        ],
+    }
+
+
+def _content_text(content: Any) -> str:
+    """Message content as display text; multimodal parts other than text become placeholders"""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        parts = []
+        for part in content:
+            if isinstance(part, dict) and part.get("type") == "text":
+                parts.append(str(part.get("text", "")))
+            else:
+                parts.append(f"[{part.get('type', 'part') if isinstance(part, dict) else type(part).__name__}]")
+        return "\n".join(parts)
+    return str(content)
+
+
+def _message_to_dict(message: Any) -> Dict[str, Any]:
+    data = message.model_dump(exclude_none=True)
+    if data.get("content"):
+        # Snapshots carry text only (the mirror's Message holds a string), never image data
+        data["content"] = truncate_text(_content_text(data["content"]), SNAPSHOT_TEXT_CHARS)
+    for tool_call in data.get("tool_calls") or []:
+        # Keep arguments valid JSON, with long values (e.g. file contents) cut
+        try:
+            arguments = json.loads(tool_call["function"].get("arguments") or "{}")
+        except ValueError:
+            arguments = {}
+        tool_call["function"]["arguments"] = json.dumps(shorten_values(arguments, SNAPSHOT_ARG_CHARS))
+    return data
+
+
+def agent_snapshot(agent: "A1") -> Dict[str, Any]:
+    """What the monitor shows of an agent: behaviors with recent activities, recent messages, metrics"""
+    behaviors = []
+    for behavior in agent.behavior_manager.behaviors.values():
+        running, finished = [], []
+        for activity in behavior.activities.values():
+            (running if activity.status.value == "running" else finished).append(activity)
+        behaviors.append({
+            "name": behavior.name,
+            "version": behavior.version,
+            "enabled": behavior.enabled,
+            "interval": behavior.interval,
+            "activities": [activity_to_dict(a) for a in running + finished[-SNAPSHOT_ACTIVITIES:]],
+        })
+
+    return {
+        "session_id": agent.session_id,
+        "llm": agent.llm,
+        "path": str(agent.path),
+        "messages": [_message_to_dict(m) for m in agent.messages[-SNAPSHOT_MESSAGES:]],
+        "message_count": len(agent.messages),
+        "behaviors": behaviors,
+        "metrics": {
+            "tools": {name: asdict(summary) for name, summary in agent.metrics.get_tool_summary().items()},
+            "conversation": agent.metrics.get_conversation_summary(),
+        },
+    }
+
+
+def log_to_dict(msg: LogMessage) -> Dict[str, Any]:
+    return {
+        "time": msg.time.isoformat(),
+        "level": msg.level,
+        "levelno": msg.levelno,
+        "message": truncate_text(msg.message, SNAPSHOT_TEXT_CHARS),
+        "module": msg.module,
+        "function": msg.function,
+        "line": msg.line,
+        "behavior": msg.behavior,
+        "activity": msg.activity,
+        "context": msg.context,
+    }
+
+
+class MonitorStream:
+    """Messages for one monitor connection, for one session or (session=None) all of them
+
+    Event-bus events only mark a session dirty; a snapshot of each dirty
+    session is sent at most max_rate times a second, so a busy agent costs
+    the same as a quiet one and nothing is sent while idle. Log records at
+    min_level and above are forwarded as they come; if the client falls
+    behind by more than max_pending messages, new ones are dropped (the next
+    snapshot catches it up).
+    """
+
+    def __init__(
+        self,
+        agents: Callable[[], Dict[str, "A1"]],
+        session: Optional[str] = None,
+        max_rate: float = 2.0,
+        min_level: str = "INFO",
+        max_pending: int = 1000
+    ):
+        self.agents = agents
+        self.session = session
+        self.min_level = min_level
+        self.outbox: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=max_pending)
+        self.dropped = 0
+        self._loop = asyncio.get_running_loop()
+        self._dirty: Set[str] = set()
+        self._renderer = CoalescedRenderer(self._send_snapshots, max_rate)
+        self._event_subscription = None
+        self._log_subscription = None
+
+    def start(self) -> None:
+        sessions = list(self.agents())
+        self._put({"type": "hello", "protocol": PROTOCOL_VERSION, "sessions": sessions})
+        self._event_subscription = event_bus.subscribe(self._on_event, session=self.session)
+        self._log_subscription = log_router.subscribe(self._on_log, min_level=self.min_level, session=self.session)
+        self._dirty.update(s for s in sessions if self.session in (None, s))
+        self._renderer.mark_dirty()
+
+    def close(self) -> None:
+        if self._event_subscription:
+            event_bus.unsubscribe(self._event_subscription)
+            self._event_subscription = None
+        if self._log_subscription:
+            log_router.unsubscribe(self._log_subscription)
+            self._log_subscription = None
+        self._renderer.cancel()
+
+    async def get(self) -> Dict[str, Any]:
+        return await self.outbox.get()
+
+    def _watched(self, session: str) -> bool:
+        return self.session is None or session == self.session
+
+    def _on_event(self, event: Event) -> None:
+        session = event.data.get("session_id") or event.session
+        if event.kind == SESSION_ENDED:
+            if self._watched(session):
+                self._dirty.discard(session)
+                self._put({"type": "session.ended", "session": session})
+            return
+        if session is None:
+            # Process-wide change (e.g. a behavior registered outside a turn)
+            self._dirty.update(s for s in self.agents() if self._watched(s))
+        elif self._watched(session):
+            self._dirty.add(session)
+        else:
+            return
+        self._renderer.mark_dirty()
+
+    def _on_log(self, msg: LogMessage) -> None:
+        # Runs on the logging thread
+        message = {"type": "log", "session": msg.session, "record": log_to_dict(msg)}
+        self._loop.call_soon_threadsafe(self._put, message)
+
+    def _send_snapshots(self) -> None:
+        dirty, self._dirty = self._dirty, set()
+        agents = self.agents()
+        for session in dirty:
+            agent = agents.get(session)
+            if agent is not None:
+                self._put({"type": "snapshot", "session": session, "agent": agent_snapshot(agent)})
+
+    def _put(self, message: Dict[str, Any]) -> None:
+        try:
+            self.outbox.put_nowait(message)
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+
+class _RemoteMetrics:
+    """The metrics summaries of the last snapshot, read like MetricsCollector's"""
+
+    def __init__(self):
+        self.tools: Dict[str, Any] = {}
+        self.conversation: Dict[str, Any] = {}
+
+    def get_tool_summary(self) -> Dict[str, Any]:
+        return self.tools
+
+    def get_conversation_summary(self) -> Dict[str, Any]:
+        return self.conversation
+
+
+class RemoteAgent:
+    """Read-only mirror of a server-side agent, shaped like A1 for the monitor widgets
+
+    apply_snapshot() replaces the mirrored state and publishes the matching
+    events on the local event bus, so the widgets re-render as they would for
+    a local agent.
+    """
+
+    def __init__(self, session_id: Optional[str] = None):
+        self.session_id = session_id
+        self.llm = ""
+        self.path = ""
+        self.messages: List[Any] = []
+        self.behavior_manager = SimpleNamespace(behaviors={})
+        self.metrics = _RemoteMetrics()
+        self._message_count = 0
+        # activity id -> (status, time of the last log line), to publish only what changed
+        self._activity_versions: Dict[str, tuple] = {}
+
+    def apply_snapshot(self, data: Dict[str, Any]) -> None:
+        from ..agent.core import Message
+        from ..behaviors.base import Activity, ActivityLogEntry, ActivityStatus, MAX_ACTIVITY_LOGS
+        from ..monitoring.metrics import MetricsSummary
+
+        self.session_id = data["session_id"]
+        self.llm = data["llm"]
+        self.path = data["path"]
+        self.messages = [Message(**m) for m in data["messages"]]
+
+        behaviors = {}
+        changed: List[tuple] = []
+        versions = {}
+        for b in data["behaviors"]:
+            activities = {}
+            for a in b["activities"]:
+                activity = Activity(
+                    id=a["id"],
+                    name=a["name"],
+                    behavior_name=b["name"],
+                    status=ActivityStatus(a["status"]),
+                    start_time=datetime.fromisoformat(a["start_time"]) if a["start_time"] else None,
+                    end_time=datetime.fromisoformat(a["end_time"]) if a["end_time"] else None,
+                    error=a["error"],
+                    logs=deque(
+                        (ActivityLogEntry(datetime.fromisoformat(e["time"]), e["message"]) for e in a["logs"]),
+                        maxlen=MAX_ACTIVITY_LOGS
+                    ),
+                )
+                activities[activity.id] = activity
+                versions[activity.id] = (a["status"], a["logs"][-1]["time"] if a["logs"] else None)
+                if self._activity_versions.get(activity.id) != versions[activity.id]:
+                    changed.append((activity, b["name"]))
+            behaviors[b["name"]] = SimpleNamespace(
+                name=b["name"], version=b["version"], enabled=b["enabled"],
+                interval=b["interval"], activities=activities
+            )
+        self.behavior_manager.behaviors = behaviors
+        self._activity_versions = versions
+
+        self.metrics.tools = {name: MetricsSummary(**s) for name, s in data["metrics"]["tools"].items()}
+        self.metrics.conversation = data["metrics"]["conversation"]
+
+        # Let the widgets know, as the local agent would
+        token = log_session.set(self.session_id)
+        try:
+            event_bus.publish(BEHAVIOR_CHANGED)
+            event_bus.publish(METRIC_RECORDED, metric="snapshot")
+            if data["message_count"] != self._message_count:
+                self._message_count = data["message_count"]
+                event_bus.publish(MESSAGE_APPENDED)
+            for activity, behavior in changed:
+                kind = ACTIVITY_STARTED if activity.status.value == "running" else ACTIVITY_FINISHED
+                event_bus.publish(kind, behavior=behavior, activity=activity.id, status=activity.status.value)
+        finally:
+            log_session.reset(token)
+
+    def add_log(self, record: Dict[str, Any]) -> None:
+        """Add a streamed log record to the local log router (shown by the log views)"""
+        log_router.add_message({
+            "time": datetime.fromisoformat(record["time"]),
+            "level": SimpleNamespace(name=record["level"], no=record["levelno"]),
+            "message": record["message"],
+            "module": record["module"],
+            "function": record["function"],
+            "line": record["line"],
+            "extra": {
+                "behavior": record["behavior"],
+                "activity": record["activity"],
+                "context": record["context"],
+                "session": self.session_id,
+            },
+        })
+
+
+def _monitor_url(url: str, session: Optional[str] = None, token: Optional[str] = None) -> str:
+    params = {name: value for name, value in (("session", session), ("token", token)) if value}
+    if not params:
+        return url
+    return f"{url}{'&' if '?' in url else '?'}{urlencode(params)}"
+
+
+async def list_sessions(url: str, token: Optional[str] = None) -> List[str]:
+    """Sessions currently running on a server"""
+    import websockets
+
+    async with websockets.connect(_monitor_url(url, token=token)) as websocket:
+        hello = json.loads(await websocket.recv())
+        return hello["sessions"]
+
+
+async def attach(url: str, session: Optional[str] = None, token: Optional[str] = None) -> None:
+    """Run the Textual monitor against a session on a server (the first one seen if not given)"""
+    import websockets
+    from .textual_display import ARAMonitorApp
+
+    logger = get_logger(__name__, context="remote_monitor")
+    agent = RemoteAgent(session)
+    app = ARAMonitorApp(agent)
+    app.sub_title = f"{url} (waiting for a session)"
+
+    async def receive() -> None:
+        try:
+            async with websockets.connect(_monitor_url(url, session, token)) as websocket:
+                async for raw in websocket:
+                    message = json.loads(raw)
+                    kind = message["type"]
+                    if kind == "snapshot":
+                        if agent.session_id in (None, message["session"]):
+                            agent.apply_snapshot(message["agent"])
+                            app.sub_title = f"{url} session {agent.session_id}"
+                    elif kind == "log":
+                        if message["session"] == agent.session_id:
+                            agent.add_log(message["record"])
+                    elif kind == "session.ended" and message["session"] == agent.session_id:
+                        app.sub_title = f"{url} session {agent.session_id} (ended)"
+            app.sub_title = f"{url} (disconnected)"
+        except Exception as e:
+            logger.error(f"Monitor connection failed: {e}")
+            app.sub_title = f"{url} (disconnected: {e})"
+
+    receiver = asyncio.create_task(receive())
+    try:
+        await app.run_async()
+    finally:
+        receiver.cancel()
+        try:
+            await receiver
+        except asyncio.CancelledError:
+            pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Attach the ARA monitor to a running server")
+    parser.add_argument("url", nargs="?", default="ws://localhost:8000/monitor")
+    parser.add_argument("--session", help="Session to monitor (default: the first one seen)")
+    parser.add_argument("--list", action="store_true", help="List running sessions and exit")
+    parser.add_argument(
+        "--token", default=os.getenv("ARA_MONITOR_TOKEN"),
+        help="The server's ARA_MONITOR_TOKEN (default: from the environment)"
+    )
+    args = parser.parse_args()
+
+    if args.list:
+        for session in asyncio.run(list_sessions(args.url, args.token)):
+            print(session)
+    else:
+        asyncio.run(attach(args.url, args.session, args.token))
+
+
+if __name__ == "__main__":
+    main()
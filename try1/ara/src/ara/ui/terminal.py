@@ -1,7 +1,11 @@
 """Terminal UI for pretty logging with rich"""
 
+import atexit
+import queue
+import threading
+import time
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Any, Callable, Dict, Optional
 from rich.console import Console
 from rich.syntax import Syntax
 from rich.panel import Panel
@@ -15,87 +19,179 @@ import json
 from .live_display import LiveDisplay
 
 
+def truncate_text(text: str, limit: int) -> str:
+    """Cut text to limit characters, saying how much was left out"""
+    if len(text) <= limit:
+        return text
+    return f"{text[:limit]}… ({len(text) - limit} more chars)"
+
+
+def shorten_values(value: Any, limit: int) -> Any:
+    """Truncate every string inside nested dicts and lists (e.g. file contents in tool args)"""
+    if isinstance(value, str):
+        return truncate_text(value, limit)
+    if isinstance(value, dict):
+        return {k: shorten_values(v, limit) for k, v in value.items()}
+    if isinstance(value, list):
+        return [shorten_values(v, limit) for v in value]
+    return value
+
+
 class TerminalUI:
-    """Pretty terminal UI for agent operations"""
+    """Pretty terminal UI for agent operations
+    
+    The log_* methods only queue what to show; a renderer thread builds the
+    rich panels (including formatting tool arguments) and writes them, so
+    console output is never in the agent's latency path. Long texts are
+    truncated to max_text_chars and each string in tool arguments to
+    max_arg_chars. If the terminal falls behind by more than max_pending
+    items, new ones are dropped and counted. headless=True shows nothing
+    (used by the server).
+    """
     
-    def __init__(self):
+    def __init__(
+        self,
+        headless: bool = False,
+        max_text_chars: int = 4000,
+        max_arg_chars: int = 300,
+        max_pending: int = 256
+    ):
         self.console = Console()
         self.agent_tree = Tree("🤖 Agent")
         self.current_operation = None
+        self.headless = headless
+        self.max_text_chars = max_text_chars
+        self.max_arg_chars = max_arg_chars
+        self._queue: "queue.Queue[Optional[Callable[[], Any]]]" = queue.Queue(maxsize=max_pending)
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+        self._dropped = 0
+    
+    def _submit(self, build: Callable[[], Any]) -> None:
+        """Queue a function building the renderable; never blocks the caller"""
+        if self.headless:
+            return
+        if self._worker is None:
+            self._start_worker()
+        try:
+            self._queue.put_nowait(build)
+        except queue.Full:
+            # Read and reset on the renderer thread
+            with self._worker_lock:
+                self._dropped += 1
+    
+    def _start_worker(self) -> None:
+        with self._worker_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._render_loop, name="terminal-ui", daemon=True)
+                self._worker.start()
+                # Show what is still queued when the process exits
+                atexit.register(self.flush)
+    
+    def _render_loop(self) -> None:
+        while True:
+            build = self._queue.get()
+            try:
+                if build is not None:
+                    self.console.print(build())
+                if build is None or self._queue.empty():
+                    with self._worker_lock:
+                        dropped, self._dropped = self._dropped, 0
+                    if dropped:
+                        self.console.print(f"[dim]… {dropped} messages not shown (terminal too slow)[/dim]")
+                if build is None:
+                    return
+            except Exception as e:
+                logger.error(f"Terminal UI render failed: {e}")
+            finally:
+                self._queue.task_done()
+    
+    def flush(self, timeout: float = 5.0) -> None:
+        """Wait until queued output has been written (at most timeout seconds)"""
+        deadline = time.monotonic() + timeout
+        while self._worker is not None and self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+    
+    def close(self) -> None:
+        """Write out queued output and stop the renderer thread"""
+        with self._worker_lock:
+            worker, self._worker = self._worker, None
+        if worker is None:
+            return
+        self._queue.put(None)
+        worker.join(timeout=5.0)
+        atexit.unregister(self.flush)
     
     def log_user_input(self, prompt: str) -> None:
         """Log user input prettily"""
-        self.console.print(
-            Panel(
-                prompt,
-                title="[bold blue]User Input[/bold blue]",
-                border_style="blue",
-                padding=(1, 2)
-            )
-        )
+        self._submit(lambda: Panel(
+            truncate_text(prompt, self.max_text_chars),
+            title="[bold blue]User Input[/bold blue]",
+            border_style="blue",
+            padding=(1, 2)
+        ))
     
     def log_assistant_response(self, response: str) -> None:
         """Log assistant response prettily"""
-        self.console.print(
-            Panel(
-                response,
-                title="[bold green]Assistant Response[/bold green]",
-                border_style="green",
-                padding=(1, 2)
-            )
-        )
+        self._submit(lambda: Panel(
+            truncate_text(response or "", self.max_text_chars),
+            title="[bold green]Assistant Response[/bold green]",
+            border_style="green",
+            padding=(1, 2)
+        ))
     
     def log_tool_call(self, tool_name: str, args: Dict[str, Any]) -> None:
         """Log a tool call with arguments"""
-        args_str = json.dumps(args, indent=2)
-        
-        self.console.print(
-            Panel(
+        def build() -> Panel:
+            args_str = json.dumps(shorten_values(args, self.max_arg_chars), indent=2, ensure_ascii=False)
+            return Panel(
                 f"[yellow]Tool:[/yellow] {tool_name}\n"
-                f"[yellow]Arguments:[/yellow]\n{args_str}",
+                f"[yellow]Arguments:[/yellow]\n{truncate_text(args_str, self.max_text_chars)}",
                 title="[bold yellow]Tool Call[/bold yellow]",
                 border_style="yellow"
             )
-        )
+        self._submit(build)
     
     def log_tool_result(self, result: str, duration: float) -> None:
         """Log tool execution result"""
-        self.console.print(
+        self._submit(lambda: (
             f"[dim]Result ({duration:.2f}s):[/dim] {result[:100]}..."
             if len(result) > 100 else f"[dim]Result ({duration:.2f}s):[/dim] {result}"
-        )
+        ))
     
     def log_error(self, error: str) -> None:
         """Log an error message"""
-        self.console.print(
-            Panel(
-                f"[bold red]Error:[/bold red] {error}",
-                border_style="red",
-                padding=(1, 2)
-            )
-        )
+        self._submit(lambda: Panel(
+            f"[bold red]Error:[/bold red] {truncate_text(error, self.max_text_chars)}",
+            border_style="red",
+            padding=(1, 2)
+        ))
     
     def show_metrics_table(self, metrics: Dict[str, Any]) -> None:
         """Display metrics in a table format"""
-        table = Table(title="Tool Metrics")
+        items = list(metrics.items())
         
-        table.add_column("Tool", style="cyan")
-        table.add_column("Calls", justify="right")
-        table.add_column("Success Rate", justify="right", style="green")
-        table.add_column("Avg Duration", justify="right")
-        table.add_column("P95 Duration", justify="right")
-        
-        for tool_name, summary in metrics.items():
-            success_rate = (summary.success_count / summary.count * 100) if summary.count > 0 else 0
-            table.add_row(
-                tool_name,
-                str(summary.count),
-                f"{success_rate:.1f}%",
-                f"{summary.avg_duration:.3f}s",
-                f"{summary.p95_duration:.3f}s"
-            )
+        def build() -> Table:
+            table = Table(title="Tool Metrics")
+            
+            table.add_column("Tool", style="cyan")
+            table.add_column("Calls", justify="right")
+            table.add_column("Success Rate", justify="right", style="green")
+            table.add_column("Avg Duration", justify="right")
+            table.add_column("P95 Duration", justify="right")
+            
+            for tool_name, summary in items:
+                success_rate = (summary.success_count / summary.count * 100) if summary.count > 0 else 0
+                table.add_row(
+                    tool_name,
+                    str(summary.count),
+                    f"{success_rate:.1f}%",
+                    f"{summary.avg_duration:.3f}s",
+                    f"{summary.p95_duration:.3f}s"
+                )
+            return table
         
-        self.console.print(table)
+        self._submit(build)
     
     def update_agent_tree(self, agent_id: str, status: str, parent_id: Optional[str] = None) -> None:
         """Update the agent tree display"""
@@ -2,22 +2,63 @@
 
 import asyncio
 import json
-from typing import TYPE_CHECKING, Optional, List
+import time
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Optional, List, Tuple
 from datetime import datetime
 from textual.app import App, ComposeResult
 from textual.containers import Horizontal, Vertical, ScrollableContainer
 from textual.widgets import Header, Footer, Static, DataTable, Tree, Log, Label
+from textual.widgets.tree import TreeNode
 from textual.reactive import reactive
 from textual.screen import Screen
 from textual.binding import Binding
-from ..logging import log_router, get_logger, LogMessage
+from ..logging import log_router, get_logger, LogMessage, LogSubscription
+from ..events import (
+    ACTIVITY_FINISHED, ACTIVITY_LOGGED, ACTIVITY_STARTED, BEHAVIOR_CHANGED, MESSAGE_APPENDED, METRIC_RECORDED,
+    CoalescedRenderer, Event, EventSubscription, event_bus
+)
 
 if TYPE_CHECKING:
     from ..agent.core import A1
     from ..behaviors.base import Activity, ActivityStatus
 
 
-class AgentInfoWidget(Static):
+class EventDrivenMixin:
+    """Re-render a widget when the agent publishes relevant events
+
+    Renders are coalesced to at most max_rate per second and nothing runs
+    while the agent is idle.
+    """
+    
+    _event_subscription: Optional[EventSubscription] = None
+    _renderer: Optional[CoalescedRenderer] = None
+    
+    def watch_events(
+        self,
+        render: Callable[[], None],
+        kinds: Iterable[str],
+        relevant: Optional[Callable[[Event], bool]] = None,
+        max_rate: float = 4.0
+    ) -> None:
+        renderer = CoalescedRenderer(render, max_rate)
+        
+        def on_event(event: Event) -> None:
+            if relevant is None or relevant(event):
+                renderer.mark_dirty()
+        
+        self._renderer = renderer
+        self._event_subscription = event_bus.subscribe(on_event, kinds, session=self.agent.session_id)
+    
+    def stop_watching_events(self) -> None:
+        if self._event_subscription:
+            event_bus.unsubscribe(self._event_subscription)
+            self._event_subscription = None
+        if self._renderer:
+            self._renderer.cancel()
+            self._renderer = None
+
+
+class AgentInfoWidget(EventDrivenMixin, Static):
     """Widget for displaying agent information and LLM prompts"""
     
     def __init__(self, agent: "A1", **kwargs):
@@ -27,8 +68,12 @@ class AgentInfoWidget(Static):
         self.last_messages = []
     
     def on_mount(self) -> None:
-        """Set up periodic updates"""
-        self.set_interval(0.5, self.update_info)
+        """Render now and whenever the conversation changes"""
+        self.update_info()
+        self.watch_events(self.update_info, [MESSAGE_APPENDED])
+    
+    def on_unmount(self) -> None:
+        self.stop_watching_events()
     
     def update_info(self) -> None:
         """Update agent info display"""
@@ -61,25 +106,75 @@ class AgentInfoWidget(Static):
         self.update("\n".join(output))
 
 
-class MetricsWidget(Static):
+_SPARK_BLOCKS = "▁▂▃▄▅▆▇█"
+
+
+def sparkline(values: List[float]) -> str:
+    """Render values as a one-line bar chart"""
+    if not values:
+        return ""
+    low, high = min(values), max(values)
+    span = (high - low) or 1.0
+    return "".join(_SPARK_BLOCKS[int((v - low) / span * (len(_SPARK_BLOCKS) - 1))] for v in values)
+
+
+class MetricsWidget(EventDrivenMixin, Static):
     """Widget for displaying metrics"""
     
+    # Persisted history shown under the live metrics: last day, hourly
+    HISTORY_SERIES = "turn.duration"
+    HISTORY_WINDOW = 24 * 3600
+    HISTORY_RESOLUTION = 3600
+    
     def __init__(self, agent: "A1", **kwargs):
         super().__init__(**kwargs)
         self.agent = agent
         self.border_title = "📊 Metrics"
+        self._history = ""
     
     def on_mount(self) -> None:
-        """Set up periodic updates"""
-        self.set_interval(1.0, self.update_metrics)
+        """Render now and whenever a metric is recorded; reload history every minute"""
+        self.update_metrics()
+        self.watch_events(self.update_metrics, [METRIC_RECORDED], max_rate=1.0)
+        if self.agent.metrics.timeseries is not None:
+            self._load_history_soon()
+            self.set_interval(60, self._load_history_soon)
+    
+    def on_unmount(self) -> None:
+        self.stop_watching_events()
+    
+    def _load_history_soon(self) -> None:
+        self.run_worker(self.load_history(), exclusive=True)
+    
+    async def load_history(self) -> None:
+        """Query this session's persisted turn durations (SQLite, off the event loop)"""
+        store = self.agent.metrics.timeseries
+        if store is None:
+            return
+        points = await asyncio.to_thread(
+            store.query,
+            self.HISTORY_SERIES,
+            time.time() - self.HISTORY_WINDOW,
+            None,
+            self.HISTORY_RESOLUTION,
+            self.agent.session_id
+        )
+        if points:
+            self._history = (
+                f"{sparkline([p['avg'] for p in points])}  "
+                f"avg {sum(p['sum'] for p in points) / sum(p['count'] for p in points):.2f}s, "
+                f"max {max(p['max'] for p in points):.2f}s"
+            )
+            self.update_metrics()
     
     def update_metrics(self) -> None:
         """Update metrics display"""
         # Tool metrics
         tool_metrics = self.agent.metrics.get_tool_summary()
+        history = f"\n[bold]Turn time, last 24h:[/bold] {self._history}" if self._history else ""
         
         if not tool_metrics:
-            self.update("No metrics available")
+            self.update("No metrics available" + history)
             return
         
         output = []
@@ -102,10 +197,10 @@ class MetricsWidget(Static):
             output.append(f"\n[bold]Conversation:[/bold] {conv_summary.get('turns', 0)} turns, "
                          f"{conv_summary.get('total_tokens', 0)} tokens")
         
-        self.update("\n".join(output))
+        self.update("\n".join(output) + history)
 
 
-class SidebarWidget(Tree):
+class SidebarWidget(EventDrivenMixin, Tree):
     """Widget for sidebar navigation"""
     
     selected_view = reactive("agent_info")
@@ -117,33 +212,46 @@ class SidebarWidget(Tree):
         self.agent = agent
         self.show_root = False  # Hide root node
         self.guide_depth = 2
+        self._behaviors_node: Optional[TreeNode] = None
+        # Behavior, group and activity nodes by key, so updates only touch what changed
+        self._node_map: Dict[Tuple, TreeNode] = {}
     
     def on_mount(self) -> None:
-        """Set up periodic updates"""
-        self.set_interval(0.5, self.update_tree)
+        """Build the tree and update it when activities or behaviors change"""
+        self._add_sections()
+        self.update_tree()
+        self.watch_events(self.update_tree, [ACTIVITY_STARTED, ACTIVITY_FINISHED, BEHAVIOR_CHANGED])
     
-    def update_tree(self) -> None:
-        """Update the sidebar tree"""
-        self.clear()
+    def on_unmount(self) -> None:
+        self.stop_watching_events()
+    
+    def _add_sections(self) -> None:
+        """Add the fixed top-level sections"""
         root = self.root
+        root.add("🤖 Agent Info", data={"type": "view", "view": "agent_info"})
+        self._behaviors_node = root.add(
+            "📊 Behaviors & Activities", data={"type": "view", "view": "behaviors"}, expand=True
+        )
+        root.add("📜 System Logs", data={"type": "view", "view": "logs"})
+        root.add("📈 Metrics", data={"type": "view", "view": "metrics"})
+    
+    def _sync_node(self, key: Tuple, parent: TreeNode, label: str, data: dict, seen: set, **add_kwargs) -> TreeNode:
+        """Add the node for key under parent, or relabel it if its label changed"""
+        seen.add(key)
+        node = self._node_map.get(key)
+        if node is None:
+            node = parent.add(label, data=data, expand=True, **add_kwargs)
+            self._node_map[key] = node
+        elif str(node.label) != label:
+            node.set_label(label)
+        return node
+    
+    def update_tree(self) -> None:
+        """Apply additions, removals and label changes to the sidebar tree"""
+        seen: set = set()
+        any_running = False
         
-        # Add main sections
-        agent_node = root.add("🤖 Agent Info")
-        agent_node.data = {"type": "view", "view": "agent_info"}
-        
-        behaviors_node = root.add("📊 Behaviors & Activities")
-        behaviors_node.allow_expand = True
-        behaviors_node.data = {"type": "view", "view": "behaviors"}
-        
-        logs_node = root.add("📜 System Logs")
-        logs_node.data = {"type": "view", "view": "logs"}
-        
-        metrics_node = root.add("📈 Metrics")
-        metrics_node.data = {"type": "view", "view": "metrics"}
-        
-        # Populate behaviors
         for behavior in self.agent.behavior_manager.behaviors.values():
-            # Add behavior node
             behavior_text = f"{behavior.name} v{behavior.version}"
             if behavior.enabled:
                 behavior_text += " ✅"
@@ -153,40 +261,57 @@ class SidebarWidget(Tree):
             if behavior.interval:
                 behavior_text += f" ⏱️ {behavior.interval}s"
             
-            behavior_node = behaviors_node.add(behavior_text)
-            behavior_node.allow_expand = True
-            behavior_node.data = {"type": "behavior", "name": behavior.name}
-            
-            # Add activities
-            running_activities = [a for a in behavior.activities.values() 
-                                if a.status.value == "running"]
-            completed_activities = [a for a in behavior.activities.values() 
-                                  if a.status.value == "completed"][-5:]  # Last 5
-            
-            # Running activities
-            if running_activities:
-                running_node = behavior_node.add("🏃 Running")
-                running_node.allow_expand = True
-                for activity in running_activities:
-                    activity_text = f"{activity.name} ({self._format_duration(activity)})"
-                    activity_node = running_node.add(activity_text)
-                    activity_node.data = {"type": "activity", "id": activity.id, "behavior": behavior.name}
-                running_node.expand()
+            behavior_node = self._sync_node(
+                ("behavior", behavior.name), self._behaviors_node, behavior_text,
+                {"type": "behavior", "name": behavior.name}, seen
+            )
             
-            # Recent completed
-            if completed_activities:
-                completed_node = behavior_node.add("✅ Recent")
-                completed_node.allow_expand = True
-                for activity in completed_activities:
-                    duration = activity.duration.total_seconds() if activity.duration else 0
-                    activity_text = f"{activity.name} ({duration:.1f}s)"
-                    activity_node = completed_node.add(activity_text)
-                    activity_node.data = {"type": "activity", "id": activity.id, "behavior": behavior.name}
-                completed_node.expand()
+            running_activities = []
+            completed_activities = []
+            for activity in behavior.activities.values():
+                if activity.status.value == "running":
+                    running_activities.append(activity)
+                elif activity.status.value == "completed":
+                    completed_activities.append(activity)
+            completed_activities = completed_activities[-5:]  # Last 5
+            any_running = any_running or bool(running_activities)
             
-            behavior_node.expand()
-        
-        behaviors_node.expand()
+            groups = (
+                ("running", "🏃 Running", running_activities),
+                ("recent", "✅ Recent", completed_activities),
+            )
+            for group, group_text, activities in groups:
+                if not activities:
+                    continue
+                # Keep Running above Recent whichever appears first
+                placement = {}
+                if group == "running" and ("group", behavior.name, "recent") in self._node_map:
+                    placement["before"] = self._node_map[("group", behavior.name, "recent")]
+                group_node = self._sync_node(
+                    ("group", behavior.name, group), behavior_node, group_text, None, seen, **placement
+                )
+                for activity in activities:
+                    if group == "running":
+                        activity_text = f"{activity.name} ({self._format_duration(activity)})"
+                    else:
+                        duration = activity.duration.total_seconds() if activity.duration else 0
+                        activity_text = f"{activity.name} ({duration:.1f}s)"
+                    self._sync_node(
+                        ("activity", behavior.name, group, activity.id), group_node, activity_text,
+                        {"type": "activity", "id": activity.id, "behavior": behavior.name}, seen
+                    )
+        
+        # Running activities show their elapsed time; advance it while any run
+        if any_running and self._renderer:
+            self._renderer.mark_dirty_later(1.0)
+        
+        # Drop nodes for activities that moved on and behaviors that went away
+        stale = [self._node_map.pop(key) for key in [key for key in self._node_map if key not in seen]]
+        stale_ids = {node.id for node in stale}
+        for node in stale:
+            # Children go with their parent
+            if node.parent is None or node.parent.id not in stale_ids:
+                node.remove()
     
     def _format_duration(self, activity: "Activity") -> str:
         """Format activity duration"""
@@ -224,7 +349,7 @@ class SidebarWidget(Tree):
                 self.selected_behavior_name = None
 
 
-class MainContentWidget(ScrollableContainer):
+class MainContentWidget(EventDrivenMixin, ScrollableContainer):
     """Widget for displaying main content based on sidebar selection"""
     
     def __init__(self, agent: "A1", **kwargs):
@@ -240,6 +365,7 @@ class MainContentWidget(ScrollableContainer):
         
         self.current_view = "agent_info"
         self.current_filter = {"behavior": None, "activity": None, "context": None}
+        self._log_subscription: Optional[LogSubscription] = None
     
     def compose(self) -> ComposeResult:
         yield self.agent_info_widget
@@ -248,15 +374,23 @@ class MainContentWidget(ScrollableContainer):
         yield self.metrics_widget
     
     def on_mount(self) -> None:
-        """Set up periodic updates"""
-        self.set_interval(0.5, self.update_display)
-        self.set_interval(0.5, self.update_content)
+        """Follow the sidebar selection and re-render the current view when it changes"""
+        sidebar = self.app.query_one(SidebarWidget)
+        for attribute in ("selected_view", "selected_activity_id", "selected_behavior_name"):
+            # Selecting sets several attributes; show the view once they are all set
+            self.watch(sidebar, attribute, lambda _: self.call_after_refresh(self.update_display), init=False)
+        self.watch_events(
+            self.update_content,
+            [MESSAGE_APPENDED, BEHAVIOR_CHANGED, METRIC_RECORDED, ACTIVITY_STARTED, ACTIVITY_FINISHED, ACTIVITY_LOGGED],
+            relevant=self._affects_current_view
+        )
         
         # Initially show only agent info
         self.agent_info_widget.display = True
         self.log_widget.display = False
         self.activity_detail_widget.display = False
         self.metrics_widget.display = False
+        self._update_agent_info()
     
     def show_view(self, view: str, activity_id: Optional[str] = None, behavior_name: Optional[str] = None) -> None:
         """Show a specific view based on sidebar selection"""
@@ -267,6 +401,7 @@ class MainContentWidget(ScrollableContainer):
         self.metrics_widget.display = False
         
         self.current_view = view
+        self._unsubscribe_logs()
         
         if view == "agent_info":
             self.border_title = "🤖 Agent Info"
@@ -407,7 +542,7 @@ class MainContentWidget(ScrollableContainer):
         # Logs
         if activity.logs:
             detail_parts.append("\n[bold]Activity Logs:[/bold]")
-            for log in activity.logs[-20:]:  # Last 20 logs
+            for log in list(activity.logs)[-20:]:  # Last 20 logs
                 detail_parts.append(f"  {log}")
         
         self.activity_detail_widget.update("\n".join(detail_parts))
@@ -438,23 +573,39 @@ class MainContentWidget(ScrollableContainer):
             self.show_view("activity", self._last_activity_id, self._last_behavior_name)
     
     def add_log(self, log_msg: LogMessage) -> None:
-        """Add a log message if it matches current filter"""
-        if self.current_view in ["logs", "behavior", "activity"] and self.log_widget.display:
-            # Check if message matches current filter
-            if self.current_filter["behavior"] and log_msg.behavior != self.current_filter["behavior"]:
-                return
-            if self.current_filter["activity"] and log_msg.activity != self.current_filter["activity"]:
-                return
-            if self.current_filter["context"] and log_msg.context != self.current_filter["context"]:
-                return
-            
-            # Write formatted message
+        """Add a log message delivered by the current view's subscription"""
+        if self.log_widget.display:
             self.log_widget.write_line(log_msg.formatted())
     
+    def _unsubscribe_logs(self) -> None:
+        if self._log_subscription:
+            log_router.unsubscribe(self._log_subscription)
+            self._log_subscription = None
+    
+    def on_unmount(self) -> None:
+        self._unsubscribe_logs()
+        self.stop_watching_events()
+    
+    def _affects_current_view(self, event: Event) -> bool:
+        if self.current_view == "agent_info":
+            return event.kind in (MESSAGE_APPENDED, BEHAVIOR_CHANGED)
+        if self.current_view == "metrics":
+            return event.kind == METRIC_RECORDED
+        if self.current_view == "activity":
+            return event.data.get("activity") == getattr(self, "_last_activity_id", None)
+        return False
+    
     def _refresh_logs(self) -> None:
-        """Refresh logs based on current filter"""
+        """Show buffered logs for the current filter and stream new ones"""
         self.log_widget.clear()
         
+        # The router only delivers matching messages, from its logging thread
+        self._unsubscribe_logs()
+        self._log_subscription = log_router.subscribe(
+            lambda log_msg: self.app.call_from_thread(self.add_log, log_msg),
+            **self.current_filter
+        )
+        
         # Get filtered logs from buffer
         logs = log_router.get_filtered_logs(
             behavior=self.current_filter["behavior"],
@@ -522,23 +673,12 @@ class ARAMonitorApp(App):
     
     def on_mount(self) -> None:
         """Set up the app when mounted"""
-        self._setup_log_handler()
-    
-    def _setup_log_handler(self) -> None:
-        """Set up log router handler to capture logs"""
-        main_content = self.query_one("#main_content", MainContentWidget)
-        
-        def tui_handler(log_msg: LogMessage):
-            """Handle log messages from the router"""
-            # Post message to main thread
-            self.call_from_thread(main_content.add_log, log_msg)
-        
-        # Set the TUI handler in the log router
-        log_router.set_tui_handler(tui_handler)
+        # Log views subscribe to the router themselves; keep the console quiet meanwhile
+        log_router.mute_console()
     
     def on_unmount(self) -> None:
         """Clean up when app is unmounted"""
-        log_router.remove_tui_handler()
+        log_router.unmute_console()
     
     def action_refresh(self) -> None:
         """Refresh the display"""
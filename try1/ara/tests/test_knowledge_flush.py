@@ -0,0 +1,75 @@
+"""Dossier flushes keep work added while they are writing"""
+
+import asyncio
+
+from ara.behaviors.knowledge_management import KnowledgeManagementBehavior
+from ara.storage.markdown import MarkdownStorage
+
+
+class SlowStorage(MarkdownStorage):
+    """Yields to other tasks in the middle of every write"""
+
+    async def extend_log(self, log_name, entries):
+        await asyncio.sleep(0.01)
+        await super().extend_log(log_name, entries)
+
+    async def save_yaml(self, category, name, data):
+        await asyncio.sleep(0.01)
+        await super().save_yaml(category, name, data)
+
+
+def test_flush_keeps_mentions_and_dirty_dossiers_added_meanwhile(tmp_path):
+    async def run():
+        storage = SlowStorage(tmp_path)
+        behavior = KnowledgeManagementBehavior(max_cached_dossiers=1)
+        alice = behavior.registry.register("person", "Alice Adams")
+        bob = behavior.registry.register("person", "Bob Brown")
+        alice_key = (alice.entity_type, alice.slug)
+        bob_key = (bob.entity_type, bob.slug)
+
+        await behavior._get_dossier(alice, storage)
+        behavior._unlogged_mentions[alice_key] = [{"context": "first"}]
+        behavior._dirty.add(alice_key)
+
+        async def concurrent_hook():
+            await asyncio.sleep(0.005)
+            dossier = await behavior._get_dossier(bob, storage)
+            dossier["mention_count"] += 1
+            behavior._unlogged_mentions.setdefault(bob_key, []).append({"context": "during flush"})
+            behavior._dirty.add(bob_key)
+
+        await asyncio.gather(behavior._flush_dossiers(storage), concurrent_hook())
+
+        # The concurrent change is still pending and its dossier was not evicted unsaved
+        assert behavior._unlogged_mentions == {bob_key: [{"context": "during flush"}]}
+        assert behavior._dirty == {bob_key}
+        assert bob_key in behavior._dossiers
+
+        await behavior._flush_dossiers(storage)
+        assert await storage.read_log(behavior._history_log(alice)) == [{"context": "first"}]
+        assert await storage.read_log(behavior._history_log(bob)) == [{"context": "during flush"}]
+        assert (await storage.load_yaml(bob.category, bob.slug))["mention_count"] == 1
+        assert not behavior._dirty and not behavior._unlogged_mentions
+
+    asyncio.run(run())
+
+
+def test_failed_flush_keeps_work_pending(tmp_path):
+    class FailingStorage(MarkdownStorage):
+        async def save_yaml(self, category, name, data):
+            raise OSError("disk full")
+
+    async def run():
+        storage = FailingStorage(tmp_path)
+        behavior = KnowledgeManagementBehavior()
+        alice = behavior.registry.register("person", "Alice Adams")
+        key = (alice.entity_type, alice.slug)
+        await behavior._get_dossier(alice, storage)
+        behavior._dirty.add(key)
+        try:
+            await behavior._flush_dossiers(storage)
+        except OSError:
+            pass
+        assert behavior._dirty == {key}
+
+    asyncio.run(run())
@@ -0,0 +1,82 @@
+"""Hot reload keeps behavior configuration, state and periodic execution"""
+
+import asyncio
+import importlib
+from pathlib import Path
+
+from ara.agent.core import A1
+from ara.behaviors import episodic_memory, user_modeling
+from ara.behaviors.reloader import BehaviorReloader
+
+
+def _agent(tmp_path: Path, *behaviors) -> A1:
+    return A1(
+        path=tmp_path / "agent",
+        api_key="test",
+        behaviors=list(behaviors),
+        enable_live_ui=False,
+        headless=True,
+        metrics_history=False,
+    )
+
+
+def test_reload_keeps_config_and_periodic_task(tmp_path):
+    async def run():
+        modeling = user_modeling.UserModelingBehavior(persist_debounce=0.5)
+        modeling.set_interval(30)
+        modeling.set_hook_timeout(2.0)
+        modeling.set_hook_timeout(0.5, hook="on_user_message")
+        modeling.update_threshold = 3
+        memory = episodic_memory.EpisodicMemoryBehavior(summary_interval=2, retrieval_top_k=5)
+        agent = _agent(tmp_path, modeling, memory)
+        await agent.start()
+        modeling.user_interactions_count = 2
+
+        reloader = BehaviorReloader()
+        reloader._agents.add(agent)
+        try:
+            assert await reloader.reload_path(Path(user_modeling.__file__).resolve()) == ["user-modeling"]
+            assert await reloader.reload_path(Path(episodic_memory.__file__).resolve()) == ["episodic-memory"]
+
+            new_modeling = agent.get_behavior("user-modeling")
+            assert new_modeling is not modeling
+            assert new_modeling.interval == 30
+            assert new_modeling._periodic_task is not None
+            assert new_modeling.hook_timeout == 2.0
+            assert new_modeling.get_hook_timeout("on_user_message") == 0.5
+            assert new_modeling.update_threshold == 3
+            assert new_modeling.persist_debounce == 0.5
+            assert new_modeling.user_interactions_count == 2
+
+            new_memory = agent.get_behavior("episodic-memory")
+            assert new_memory is not memory
+            assert new_memory.summary_interval == 2
+            assert new_memory.retrieval_top_k == 5
+        finally:
+            reloader.stop()
+            await agent.stop()
+
+    asyncio.run(run())
+
+
+def test_reload_skips_framework_modules(tmp_path):
+    async def run():
+        agent = _agent(tmp_path, user_modeling.UserModelingBehavior())
+        reloader = BehaviorReloader()
+        reloader._agents.add(agent)
+        base = importlib.import_module("ara.behaviors.base")
+        assert await reloader.reload_path(Path(base.__file__).resolve()) == []
+        assert await reloader.reload_path(Path(importlib.import_module("ara.behaviors.reloader").__file__).resolve()) == []
+
+    asyncio.run(run())
+
+
+def test_migrate_state_keeps_new_defaults():
+    old = user_modeling.UserModelingBehavior()
+    old.user_interactions_count = 4
+    old.analysis_turns = 99
+    new = user_modeling.UserModelingBehavior()
+    assert new.migrate_state(old)
+    assert new.user_interactions_count == 4
+    # Config is not state; it only moves over through apply_config
+    assert new.analysis_turns == 20
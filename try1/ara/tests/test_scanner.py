@@ -0,0 +1,51 @@
+"""Shared keyword scanner: substring semantics, dedupe and fan-out"""
+
+from ara.behaviors.scanner import PatternScanner
+
+
+def _scanner() -> PatternScanner:
+    scanner = PatternScanner()
+    scanner.register("anxiety", "trigger", keywords=["worry", "stress", "panic"])
+    scanner.register("anxiety", "emergency", keywords=["panic", "help"])
+    scanner.register("support", "offer", keywords=["helpful", "Help"])
+    return scanner
+
+
+def test_keywords_match_as_substrings_case_insensitively():
+    scanner = _scanner()
+    assert scanner.count("I'm WORRYING and stressed", "anxiety", "trigger") == 2
+    assert scanner.count("nothing to see", "anxiety") == 0
+
+
+def test_each_keyword_counts_once_per_message():
+    scanner = _scanner()
+    assert scanner.count("stress, stress and more stress", "anxiety", "trigger") == 1
+    [match] = scanner.scan("stress, stress")["anxiety"]
+    assert (match.text, match.start, match.end) == ("stress", 0, 6)
+
+
+def test_overlapping_keywords_do_not_hide_each_other():
+    scanner = _scanner()
+    matches = scanner.scan("That was helpful")
+    assert [(m.group, m.text) for m in matches["anxiety"]] == [("emergency", "help")]
+    assert sorted(m.text for m in matches["support"]) == ["help", "helpful"]
+
+    scanner.register("other", "words", keywords=["elpful"])
+    assert [m.text for m in scanner.scan("helpful")["other"]] == ["elpful"]
+
+
+def test_shared_keyword_fans_out_to_every_group():
+    scanner = _scanner()
+    matches = scanner.scan("panic!")["anxiety"]
+    assert sorted(m.group for m in matches) == ["emergency", "trigger"]
+
+
+def test_patterns_and_unregister():
+    scanner = _scanner()
+    scanner.register("dates", "iso", patterns=[r"\d{4}-\d{2}-\d{2}"])
+    matches = scanner.scan("help on 2024-01-02 or 2024-02-03")
+    assert [m.text for m in matches["dates"]] == ["2024-01-02", "2024-02-03"]
+
+    scanner.unregister("support")
+    assert scanner.subscribers == ["anxiety", "dates"]
+    assert "support" not in scanner.scan("helpful")
@@ -0,0 +1,115 @@
+"""Metric history: bucketing, rollups, tier selection and session labels"""
+
+import asyncio
+import sqlite3
+import time
+
+from ara.monitoring.timeseries import TimeSeriesStore
+
+DAY = 24 * 3600
+
+
+def _store(tmp_path, **kwargs) -> TimeSeriesStore:
+    return TimeSeriesStore(tmp_path / "timeseries.sqlite", flush_interval=1, **kwargs)
+
+
+def _write(store: TimeSeriesStore) -> None:
+    asyncio.run(store.flush())
+
+
+def test_store_opens_lazily(tmp_path):
+    store = _store(tmp_path / "metrics")
+    assert not (tmp_path / "metrics").exists()
+    store.open()
+    assert store.path.exists()
+    store.close()
+
+
+def test_observations_are_bucketed_and_aggregated(tmp_path):
+    store = _store(tmp_path)
+    now = time.time() // 60 * 60
+    for value in (1.0, 3.0, 2.0):
+        store.observe("turn.duration", value, now + 5)
+    _write(store)
+    [point] = store.query("turn.duration", now - 60)
+    assert point == {"bucket": now, "count": 3, "sum": 6.0, "min": 1.0, "max": 3.0, "avg": 2.0}
+
+
+def test_default_query_uses_the_tier_that_covers_start(tmp_path):
+    store = _store(tmp_path)
+    now = time.time()
+    old = now - 30 * DAY
+    store.observe("turn.duration", 4.0, old)
+    _write(store)
+    store.downsample(now)
+
+    # Base points past their 7-day retention are gone; the hourly rollup is not
+    points = store.query("turn.duration", old - 3600)
+    assert [p["sum"] for p in points] == [4.0]
+    assert points[0]["bucket"] % 3600 == 0
+    assert store.query("turn.duration", old - 3600, resolution=3600) == points
+
+
+def test_coarse_query_includes_points_not_rolled_up_yet(tmp_path):
+    store = _store(tmp_path)
+    now = time.time()
+    store.observe("turn.duration", 1.0, now - 30 * DAY)
+    _write(store)
+    store.downsample(now)
+    store.observe("turn.duration", 2.0, now - 10)
+    _write(store)
+
+    points = store.query("turn.duration", now - 31 * DAY)
+    assert sum(p["count"] for p in points) == 2
+    assert points[-1]["sum"] == 2.0
+
+
+def test_rollup_preserves_totals(tmp_path):
+    store = _store(tmp_path)
+    now = time.time()
+    start = (now - 2 * DAY) // DAY * DAY
+    for minute in range(0, 180, 7):
+        store.observe("llm.agent.tokens", 10.0, start + minute * 60)
+    _write(store)
+    store.downsample(now)
+
+    fine = store.query("llm.agent.tokens", start, resolution=60)
+    hourly = store.query("llm.agent.tokens", start, resolution=3600)
+    assert sum(p["sum"] for p in fine) == sum(p["sum"] for p in hourly) == 260.0
+    assert [p["count"] for p in hourly] == [9, 9, 8]
+
+
+def test_points_are_labeled_by_session(tmp_path):
+    store = _store(tmp_path)
+    now = time.time()
+    store.observe("turn.duration", 1.0, now, session="a")
+    store.observe("turn.duration", 3.0, now, session="b")
+    _write(store)
+
+    assert store.sessions() == ["a", "b"]
+    assert store.query("turn.duration", now - 60)[0]["count"] == 2
+    assert store.query("turn.duration", now - 60, session="b")[0]["sum"] == 3.0
+    assert store.series("turn.", session="a") == ["turn.duration"]
+    assert store.series("turn_") == []
+
+
+def test_unlabeled_files_are_migrated(tmp_path):
+    path = tmp_path / "timeseries.sqlite"
+    bucket = int(time.time()) // 60 * 60
+    db = sqlite3.connect(path)
+    db.executescript(
+        """
+        CREATE TABLE points (
+            series TEXT NOT NULL, resolution INTEGER NOT NULL, bucket INTEGER NOT NULL,
+            count INTEGER NOT NULL, sum REAL NOT NULL, min REAL NOT NULL, max REAL NOT NULL,
+            PRIMARY KEY (series, resolution, bucket)
+        ) WITHOUT ROWID;
+        """
+    )
+    db.execute("INSERT INTO points VALUES ('turn.duration', 60, ?, 1, 2.0, 2.0, 2.0)", (bucket,))
+    db.commit()
+    db.close()
+
+    store = TimeSeriesStore(path)
+    assert store.query("turn.duration", bucket)[0]["sum"] == 2.0
+    assert store.sessions() == []